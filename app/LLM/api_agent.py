@@ -1,24 +1,156 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable, Tuple
+import asyncio
 import json
-from functools import lru_cache
-from datetime import datetime, timedelta
+from contextlib import aclosing
+from functools import lru_cache, partial
 
 from app.core.claudeAI import ClaudeAI
 from app.services.news_service import NewsService
+from app.services.sentiment_service import sentiment_scorer
+from app.services.story_summarizer import story_summarizer
 from app.core.config import settings
+from app.core.claudeAI import AgentRunResult
+from app.core.deadline import Deadline
+from app.core.llm_governor import llm_governor, LLMOverloaded
+from app.core.cache import TTLCache
+from app.core.singleflight import SingleFlight
+from app.core.semantic_cache import SemanticCache, HashingVectorizer
+from app.services.ticker_tagger import ticker_tagger
+from app.utils.json_stream import JSONArrayItemParser
+from app.LLM.providers import build_default_router
+from app.LLM.tool_results import ToolResultBudget, dumps_compact, encode_stories, exhausted_result
 
 news_service = NewsService()
 claude_ai = ClaudeAI()
 
-_cache = {}
-_cache_ttl = {}
+# Bounded LRU/TTL cache for analyses and market-impact results
+ai_cache = TTLCache(
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AI_CACHE_MAX_BYTES,
+    default_ttl=settings.ANALYSIS_CACHE_TTL_SECONDS,
+)
+# Identical analyses that are already running are awaited instead of started again
+ai_flight = SingleFlight()
+
+
+def query_tickers(query: str) -> List[str]:
+    # Tagged as typed: title-casing would turn common words ("target", "johnson") into companies
+    return ticker_tagger.tag(query)
+
+
+# Reuses a fresh analysis for differently worded queries about the same tickers
+semantic_cache = SemanticCache(
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    entity_fn=query_tickers,
+)
+
+
+# Tool results (stories before budget trimming) shared by all agent runs
+tool_cache = TTLCache(
+    max_entries=settings.TOOL_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AI_CACHE_MAX_BYTES // 4,
+    default_ttl=settings.TOOL_CACHE_TTL_SEARCH_SECONDS,
+)
+tool_flight = SingleFlight()
+TOOL_CACHE_TTLS = {
+    "fetch_top_financial_headlines": settings.TOOL_CACHE_TTL_HEADLINES_SECONDS,
+    "search_financial_news": settings.TOOL_CACHE_TTL_SEARCH_SECONDS,
+    "fetch_stock_news": settings.TOOL_CACHE_TTL_STOCK_SECONDS,
+}
+# Per tool: calls, cache hits and calls that joined an identical in-flight fetch
+_tool_call_stats: Dict[str, Dict[str, int]] = {}
+
+
+def tool_cache_stats() -> Dict[str, Any]:
+    per_tool = {
+        name: {**counts, "hit_ratio": round((counts["hits"] + counts["shared"]) / counts["calls"], 4) if counts["calls"] else 0.0}
+        for name, counts in _tool_call_stats.items()
+    }
+    return {"cache": tool_cache.stats(), "in_flight": tool_flight.stats(), "tools": per_tool}
+
+
+def canonical_tool_input(tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    # Defaults filled in and case/whitespace normalized so equivalent calls share a key
+    page_size = int(tool_input.get("page_size", 20))
+    if tool_name == "fetch_top_financial_headlines":
+        return {"category": str(tool_input.get("category", "business")).lower(), "page_size": page_size}
+    if tool_name == "search_financial_news":
+        return {"query": " ".join(str(tool_input.get("query", "")).lower().split()), "page_size": page_size}
+    if tool_name == "fetch_stock_news":
+        return {"symbol": str(tool_input.get("symbol", "")).strip().upper(), "page_size": page_size}
+    return dict(tool_input)
+
+
+def tool_cache_key(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    return f"tool_{tool_name}_{dumps_compact(dict(sorted(tool_input.items())))}"
+
+
+def analysis_cache_key(query: str) -> str:
+    # Case and whitespace insensitive key for a free-text query
+    return f"analyze_{' '.join(query.lower().split())}"
+
+# Failed analyses are returned as text starting with this
+ANALYSIS_ERROR_PREFIX = "Error during agent analysis"
+
+ANALYZE_SYSTEM_PROMPT = """You are an expert financial analyst AI agent. Your role is to:
+1. Use available tools to fetch relevant financial news based on user queries
+2. Analyze the fetched news to identify market-moving events
+3. Provide comprehensive insights in a structured format
+
+IMPORTANT: Format your response using markdown-style structure:
+- Use section headers: "### 1. Most Impactful News Items"
+- Use numbered items with bold titles: "1. **News Title**"
+- Use bullet points for details: "* Why it matters: ..."
+
+Structure your response with these sections:
+1. Most Impactful News Items and Why They Matter
+2. Which Companies or Sectors Are Affected
+3. Potential Market Impact (high/medium/low) and Direction (positive/negative)
+4. Actionable Insights for Traders
+
+Be concise and efficient. Complete your analysis quickly.
+
+The user's message may already include prefetched news. Analyze it directly and only call tools for information it does not cover."""
+
+
+IMPACT_LEVELS = ("high", "medium", "low")
+IMPACT_DIRECTIONS = ("positive", "negative", "neutral")
+
+# Structured output for market impact rankings (forced tool use)
+MARKET_IMPACT_TOOL = {
+    "name": "report_market_impact",
+    "description": "Report the most market-moving news stories, ranked by expected impact.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "news_items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "story": {"type": "integer", "description": "Number of the story in the provided list"},
+                        "impact_level": {"type": "string", "enum": list(IMPACT_LEVELS)},
+                        "impact_direction": {"type": "string", "enum": list(IMPACT_DIRECTIONS)},
+                        "why_it_matters": {"type": "string", "description": "Brief explanation"},
+                        "affected_sectors": {"type": "array", "items": {"type": "string"}},
+                        "affected_companies": {"type": "array", "items": {"type": "string"}},
+                        "trading_insight": {"type": "string", "description": "Actionable insight"}
+                    },
+                    "required": ["story", "impact_level", "impact_direction", "why_it_matters"]
+                }
+            }
+        },
+        "required": ["news_items"]
+    }
+}
 
 
 def get_claude_tools() -> List[Dict[str, Any]]:
     return [
         {
             "name": "fetch_top_financial_headlines",
-            "description": "Fetch top financial/business headlines that could affect the stock market.",
+            "description": "Fetch top financial/business headlines that could affect the stock market. Returns one digest per story (related articles are merged).",
             "input_schema": {
                 "type": "object",
                 "properties": {
@@ -29,7 +161,7 @@ def get_claude_tools() -> List[Dict[str, Any]]:
         },
         {
             "name": "search_financial_news",
-            "description": "Search for financial news articles based on keywords or topics.",
+            "description": "Search for financial news articles based on keywords or topics. Returns one digest per story.",
             "input_schema": {
                 "type": "object",
                 "properties": {
@@ -41,7 +173,7 @@ def get_claude_tools() -> List[Dict[str, Any]]:
         },
         {
             "name": "fetch_stock_news",
-            "description": "Fetch news articles specific to a stock ticker symbol.",
+            "description": "Fetch news articles specific to a stock ticker symbol. Returns one digest per story.",
             "input_schema": {
                 "type": "object",
                 "properties": {
@@ -54,42 +186,170 @@ def get_claude_tools() -> List[Dict[str, Any]]:
     ]
 
 
-def execute_tool(tool_name: str, tool_input: Dict[str, Any]) -> str:
+async def _fetch_tool_data(tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    # Runs the upstream fetch for a canonical tool input, returns meta + stories or an error
+    if tool_name == "fetch_top_financial_headlines":
+        result = await news_service.fetch_top_headlines_async(category=tool_input["category"], country="us", page_size=tool_input["page_size"])
+        meta = {"status": "success", "total_results": result.get("totalResults", 0)}
+    elif tool_name == "search_financial_news":
+        result = await news_service.fetch_financial_news_async(query=tool_input["query"], page_size=tool_input["page_size"])
+        meta = {"status": "success", "total_results": result.get("totalResults", 0), "query": tool_input["query"]}
+    else:
+        result = await news_service.fetch_stock_specific_news_async(symbol=tool_input["symbol"], page_size=tool_input["page_size"])
+        meta = {"status": "success", "symbol": tool_input["symbol"], "total_results": result.get("totalResults", 0)}
+
+    if "error" in result:
+        return {"error": result["error"]}
+    # Inline: clustering a page of headlines takes a few ms, less than shipping the articles to a worker
+    stories = story_summarizer.build_stories(result.get("articles", []))
+    data = {"meta": meta, "stories": stories}
+    tool_cache.set(tool_cache_key(tool_name, tool_input), data, ttl=TOOL_CACHE_TTLS[tool_name])
+    return data
+
+
+async def _cached_tool_data(tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    canonical = canonical_tool_input(tool_name, tool_input)
+    cache_key = tool_cache_key(tool_name, canonical)
+    counts = _tool_call_stats.setdefault(tool_name, {"calls": 0, "hits": 0, "shared": 0})
+    counts["calls"] += 1
+    data = tool_cache.get(cache_key)
+    if data is not None:
+        counts["hits"] += 1
+        return data
+    if tool_flight.in_flight(cache_key):
+        counts["shared"] += 1
+    return await tool_flight.do(cache_key, lambda: _fetch_tool_data(tool_name, canonical))
+
+
+async def execute_tool(tool_name: str, tool_input: Dict[str, Any], budget: Optional[ToolResultBudget] = None) -> str:
+    # Results are compact JSON trimmed to the run's token budget
+    if tool_name not in TOOL_CACHE_TTLS:
+        return dumps_compact({"error": f"Unknown tool: {tool_name}"})
+    if budget is None:
+        return await _encoded_tool_result(tool_name, tool_input, settings.TOOL_RESULT_MAX_TOKENS)
+    if budget.exhausted:
+        return exhausted_result()
+    # Reserved before awaiting, so the other tool calls of this turn see the reduced budget
+    reserved = budget.reserve()
+    return budget.release(reserved, await _encoded_tool_result(tool_name, tool_input, reserved))
+
+
+async def _encoded_tool_result(tool_name: str, tool_input: Dict[str, Any], max_tokens: int) -> str:
     try:
-        if tool_name == "fetch_top_financial_headlines":
-            category = tool_input.get("category", "business")
-            page_size = tool_input.get("page_size", 20)
-            result = news_service.fetch_top_headlines(category=category, country="us", page_size=page_size)
-            if "error" in result:
-                return json.dumps({"error": result["error"]})
-            articles = result.get("articles", [])
-            key_info = news_service.extract_key_info(articles)
-            return json.dumps({"status": "success", "total_results": result.get("totalResults", 0), "articles": key_info}, indent=2)
-        
-        elif tool_name == "search_financial_news":
-            query = tool_input.get("query", "")
-            page_size = tool_input.get("page_size", 20)
-            result = news_service.fetch_financial_news(query=query, page_size=page_size)
-            if "error" in result:
-                return json.dumps({"error": result["error"]})
-            articles = result.get("articles", [])
-            key_info = news_service.extract_key_info(articles)
-            return json.dumps({"status": "success", "total_results": result.get("totalResults", 0), "query": query, "articles": key_info}, indent=2)
-        
-        elif tool_name == "fetch_stock_news":
-            symbol = tool_input.get("symbol", "").upper()
-            page_size = tool_input.get("page_size", 20)
-            result = news_service.fetch_stock_specific_news(symbol=symbol, page_size=page_size)
-            if "error" in result:
-                return json.dumps({"error": result["error"]})
-            articles = result.get("articles", [])
-            key_info = news_service.extract_key_info(articles)
-            return json.dumps({"status": "success", "symbol": symbol, "total_results": result.get("totalResults", 0), "articles": key_info}, indent=2)
-        
-        else:
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
+        data = await _cached_tool_data(tool_name, tool_input)
+        if "error" in data:
+            return dumps_compact({"error": data["error"]})
+        return encode_stories(data["meta"], data["stories"], max_tokens)
     except Exception as e:
-        return json.dumps({"error": f"Tool execution failed: {str(e)}"})
+        return dumps_compact({"error": f"Tool execution failed: {str(e)}"})
+
+
+def tool_executor_for_run() -> Callable[[str, Dict[str, Any]], Awaitable[str]]:
+    """execute_tool bound to a fresh per-conversation tool-result budget"""
+    budget = ToolResultBudget(settings.TOOL_RESULT_MAX_TOKENS, settings.AGENT_TOOL_RESULTS_MAX_TOKENS)
+    return partial(execute_tool, budget=budget)
+
+
+# Headline categories detected from query keywords
+PREFETCH_TOPICS = {
+    "technology": ("tech", "technology", "ai", "software", "semiconductor", "semiconductors", "chip", "chips", "cloud"),
+    "health": ("health", "healthcare", "pharma", "pharmaceutical", "biotech", "drug", "drugs", "fda"),
+    "science": ("science", "space", "climate", "energy"),
+}
+# Words that ask for general market news rather than a specific subject
+GENERIC_MARKET_WORDS = {
+    "market", "markets", "stock", "stocks", "news", "latest", "today", "todays", "headlines", "financial",
+    "finance", "business", "trading", "traders", "impact", "impactful", "moving", "top", "recent", "analysis",
+    "analyze", "happening", "now", "week", "day",
+}
+_query_vectorizer = HashingVectorizer()
+
+
+def plan_prefetch(query: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Guess the tool calls an analysis of this query will start with
+
+    Args:
+        query: User query
+
+    Returns:
+        (tool_name, tool_input) pairs to run before the first model call
+    """
+    calls = []
+    tickers = query_tickers(query)[: settings.AGENT_PREFETCH_MAX_TICKERS]
+    for symbol in tickers:
+        calls.append(("fetch_stock_news", {"symbol": symbol, "page_size": 20}))
+
+    words = _query_vectorizer.tokens(query)
+    category = next(
+        (topic for topic, keywords in PREFETCH_TOPICS.items() if any(word in keywords for word in words)),
+        None,
+    )
+    if category:
+        calls.append(("fetch_top_financial_headlines", {"category": category, "page_size": 20}))
+
+    if not tickers:
+        # Specific subjects go to search, general market questions to business headlines
+        subject = [word for word in words if word not in GENERIC_MARKET_WORDS]
+        if subject:
+            calls.append(("search_financial_news", {"query": " ".join(subject), "page_size": 20}))
+        elif not category:
+            calls.append(("fetch_top_financial_headlines", {"category": "business", "page_size": 20}))
+    return calls
+
+
+async def prefetch_context(
+    query: str,
+    tool_executor: Callable[[str, Dict[str, Any]], Awaitable[str]],
+    deadline: Optional[Deadline] = None
+) -> str:
+    """
+    Run the planned tool calls in parallel and render them for the opening message
+
+    Args:
+        query: User query
+        tool_executor: Executor of the run (shares its tool-result budget)
+        deadline: Deadline of the run, prefetching leaves the final-answer reserve untouched
+
+    Returns:
+        Opening user message (the query alone when nothing was prefetched)
+    """
+    calls = plan_prefetch(query) if settings.AGENT_PREFETCH else []
+    if not calls:
+        return query
+
+    timeout = settings.AGENT_TOOL_TIMEOUT_SECONDS
+    if deadline is not None:
+        timeout = deadline.timeout(cap=timeout, reserve=settings.AGENT_FINAL_ANSWER_RESERVE_SECONDS)
+
+    async def run(tool_name: str, tool_input: Dict[str, Any]) -> Optional[str]:
+        try:
+            result = await asyncio.wait_for(tool_executor(tool_name, tool_input), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        # Failed prefetches are left for the model to retry through the tools
+        return None if "error" in json.loads(result) else result
+
+    results = await asyncio.gather(*(run(name, tool_input) for name, tool_input in calls))
+    sections = [
+        f"{name} {dumps_compact(tool_input)}:\n{result}"
+        for (name, tool_input), result in zip(calls, results)
+        if result is not None
+    ]
+    if not sections:
+        return query
+    return f"{query}\n\nPrefetched news:\n\n" + "\n\n".join(sections)
+
+
+def describe_tool_call(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    # Human readable progress message for a tool call
+    if tool_name == "fetch_top_financial_headlines":
+        return f"Fetching top {tool_input.get('category', 'business')} headlines…"
+    if tool_name == "search_financial_news":
+        return f"Searching news for \"{tool_input.get('query', '')}\"…"
+    if tool_name == "fetch_stock_news":
+        return f"Fetching news for {str(tool_input.get('symbol', '')).upper()}…"
+    return f"Running {tool_name}…"
 
 
 class APIAgent:
@@ -97,184 +357,271 @@ class APIAgent:
         self.claude_ai = ClaudeAI()
         self.news_service = NewsService()
         self.tools = get_claude_tools()
+        # Single-prompt tasks (headline ranking) are routed across Claude/Gemini with hedging
+        self.provider_router = build_default_router(self.claude_ai)
     
-    def analyze_market_news(self, query: str) -> str:
-        # Analyze market news with caching
-        cache_key = f"analyze_{query.lower().strip()}"
-        if cache_key in _cache:
-            if datetime.now() < _cache_ttl.get(cache_key, datetime.now()):
-                return _cache[cache_key]
-        
-        system_prompt = """You are an expert financial analyst AI agent. Your role is to:
-1. Use available tools to fetch relevant financial news based on user queries
-2. Analyze the fetched news to identify market-moving events
-3. Provide comprehensive insights in a structured format
-
-IMPORTANT: Format your response using markdown-style structure:
-- Use section headers: "### 1. Most Impactful News Items"
-- Use numbered items with bold titles: "1. **News Title**"
-- Use bullet points for details: "* Why it matters: ..."
+    def _cached_analysis(self, query: str, cache_key: str) -> Optional[str]:
+        # Exact (normalized) match first, then a semantically similar earlier query
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        similar_key = semantic_cache.lookup(query, is_fresh=lambda key: key in ai_cache)
+        return ai_cache.get(similar_key) if similar_key else None
+    
+    def _store_analysis(self, query: str, cache_key: str, response: str) -> None:
+        if ai_cache.set(cache_key, response, ttl=settings.ANALYSIS_CACHE_TTL_SECONDS):
+            semantic_cache.add(query, cache_key)
+    
+    @staticmethod
+    def run_deadline(max_seconds: Optional[float] = None) -> Deadline:
+        # Callers may ask for a tighter deadline, never a longer one than configured
+        seconds = settings.AGENT_RUN_DEADLINE_SECONDS
+        return Deadline(min(max_seconds, seconds) if max_seconds else seconds)
+    
+    async def analyze(self, query: str, max_seconds: Optional[float] = None) -> AgentRunResult:
+        """
+        Analyze market news with caching; concurrent identical queries share one agent run
 
-Structure your response with these sections:
-1. Most Impactful News Items and Why They Matter
-2. Which Companies or Sectors Are Affected
-3. Potential Market Impact (high/medium/low) and Direction (positive/negative)
-4. Actionable Insights for Traders
+        Args:
+            query: User query
+            max_seconds: Optional deadline for the whole run (capped at AGENT_RUN_DEADLINE_SECONDS)
 
-Be concise and efficient. Complete your analysis quickly."""
+        Returns:
+            Analysis text with partial=True when the deadline cut tool use short
+        """
+        cache_key = analysis_cache_key(query)
+        cached = self._cached_analysis(query, cache_key)
+        if cached is not None:
+            return AgentRunResult(text=cached)
+        
+        return await ai_flight.do(cache_key, lambda: self._run_analysis(query, cache_key, self.run_deadline(max_seconds)))
+    
+    def admit(self, query: str, max_seconds: Optional[float] = None) -> None:
+        # Fast 429 before a streaming response starts, unless the answer is cached or already being computed
+        cache_key = analysis_cache_key(query)
+        if ai_flight.in_flight(cache_key) or self._cached_analysis(query, cache_key) is not None:
+            return
+        llm_governor.admit(self.run_deadline(max_seconds))
+    
+    async def analyze_market_news(self, query: str) -> str:
+        # Analysis text only
+        return (await self.analyze(query)).text
+    
+    async def _run_analysis(self, query: str, cache_key: str, deadline: Deadline) -> AgentRunResult:
+        system_prompt = ANALYZE_SYSTEM_PROMPT
         
         try:
-            response = self.claude_ai.run_agent(
-                user_message=query,
+            tool_executor = tool_executor_for_run()
+            result = await self.claude_ai.run_agent_async(
+                user_message=await prefetch_context(query, tool_executor, deadline),
                 tools=self.tools,
-                tool_executor=execute_tool,
+                tool_executor=tool_executor,
                 system=system_prompt,
                 max_iterations=5,
                 temperature=0.7,
-                max_tokens=2048
+                max_tokens=2048,
+                deadline=deadline
             )
             
-            if not response or len(response.strip()) == 0:
-                return "No analysis could be generated. Please try a different query."
+            if not result.text.strip():
+                return AgentRunResult(text="No analysis could be generated. Please try a different query.", iterations=result.iterations, usage=result.usage)
             
-            _cache[cache_key] = response
-            _cache_ttl[cache_key] = datetime.now() + timedelta(minutes=5)
-            return response
+            # Partial answers are returned but not cached, the next request gets a full run
+            if not result.partial:
+                self._store_analysis(query, cache_key, result.text)
+            return result
+        except LLMOverloaded:
+            raise
         except Exception as e:
-            return f"Error during agent analysis: {str(e)[:200]}"
+            return AgentRunResult(text=f"{ANALYSIS_ERROR_PREFIX}: {str(e)[:200]}")
     
-    def find_market_impact_news(self, limit: int = 10) -> dict:
-        # Find market impact news with caching
+    async def stream_market_news(self, query: str, max_seconds: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        # Streaming analyze: yields status/tool/text events, then "done" with the full analysis and partial flag.
+        # "reset" means the text received since the last tool_result (or the start) is discarded:
+        # that turn ran out of time and a shorter, final answer is streamed next
+        cache_key = analysis_cache_key(query)
+        cached = self._cached_analysis(query, cache_key)
+        if cached is not None:
+            yield {"event": "text", "data": {"text": cached}}
+            yield {"event": "done", "data": {"text": cached, "partial": False, "cached": True}}
+            return
+        
+        in_flight = ai_flight.join(cache_key)
+        if in_flight is not None:
+            # Same analysis already running for another caller, wait for it instead of starting another
+            yield {"event": "status", "data": {"message": "Waiting for an identical analysis in progress…"}}
+            result = await in_flight
+            yield {"event": "text", "data": {"text": result.text}}
+            yield {"event": "done", "data": {"text": result.text, "partial": result.partial, "shared": True}}
+            return
+        
+        yield {"event": "status", "data": {"message": "Gathering relevant news…"}}
+        try:
+            deadline = self.run_deadline(max_seconds)
+            tool_executor = tool_executor_for_run()
+            opening_message = await prefetch_context(query, tool_executor, deadline)
+            yield {"event": "status", "data": {"message": "Analyzing your request…"}}
+            async for event in self.claude_ai.stream_agent_async(
+                user_message=opening_message,
+                tools=self.tools,
+                tool_executor=tool_executor,
+                system=ANALYZE_SYSTEM_PROMPT,
+                max_iterations=5,
+                temperature=0.7,
+                max_tokens=2048,
+                deadline=deadline
+            ):
+                if event["event"] == "tool_call":
+                    event["data"]["message"] = describe_tool_call(event["data"]["name"], event["data"]["input"])
+                elif event["event"] == "done":
+                    response = event["data"]["text"]
+                    if not response or len(response.strip()) == 0:
+                        event["data"]["text"] = "No analysis could be generated. Please try a different query."
+                    elif not event["data"]["partial"]:
+                        self._store_analysis(query, cache_key, response)
+                yield event
+        except LLMOverloaded as e:
+            yield {"event": "error", "data": {"message": e.detail, "retry_after": e.retry_after}}
+        except Exception as e:
+            yield {"event": "error", "data": {"message": f"{ANALYSIS_ERROR_PREFIX}: {str(e)[:200]}"}}
+    
+    async def find_market_impact_news(self, limit: int = 10) -> dict:
+        # Find market impact news with caching; concurrent calls with the same limit share one run
         cache_key = f"market_impact_{limit}"
-        if cache_key in _cache:
-            if datetime.now() < _cache_ttl.get(cache_key, datetime.now()):
-                return _cache[cache_key]
-       
-        system_prompt = f"""You are a financial news analysis agent. Your task is to:
-1. Fetch top financial headlines using the fetch_top_financial_headlines tool
-2. Analyze the news to identify the top {limit} most impactful items
-3. Return your analysis as a JSON object with this EXACT structure:
-
-{{"news_items": [{{"rank": 1, "title": "News headline", "impact_level": "high|medium|low", "impact_direction": "positive|negative|neutral", "why_it_matters": "Brief explanation", "affected_sectors": ["sector1"], "affected_companies": ["company1"], "trading_insight": "Actionable insight", "source": "source name"}}]}}
-
-CRITICAL: Return ONLY valid JSON. No markdown, no explanations. Return exactly {limit} news items."""
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        user_query = f"Find and analyze the top {limit} most impactful financial news items."
+        return await ai_flight.do(cache_key, lambda: self._find_market_impact_uncached(limit, cache_key))
+    
+    async def refresh_market_impact_news(self, limit: int = 10) -> dict:
+        # Recompute market impact news ignoring the cache (used by the snapshot scheduler)
+        cache_key = f"market_impact_{limit}"
+        return await ai_flight.do(cache_key, lambda: self._find_market_impact_uncached(limit, cache_key))
+    
+    @staticmethod
+    def _market_impact_item(raw: Any, stories: List[Dict[str, Any]], used: set) -> Optional[Dict[str, Any]]:
+        # Validate one reported item against the tool schema and the stories it refers to
+        if not isinstance(raw, dict):
+            return None
+        try:
+            story_number = int(raw.get("story"))
+        except (TypeError, ValueError):
+            return None
+        if not 1 <= story_number <= len(stories) or story_number in used:
+            return None
+        used.add(story_number)
+        story = stories[story_number - 1]
+        impact_level = str(raw.get("impact_level", "")).lower()
+        impact_direction = str(raw.get("impact_direction", "")).lower()
+        sectors = raw.get("affected_sectors")
+        companies = raw.get("affected_companies")
+        return {
+            "rank": len(used),
+            "title": story["headline"][:200],
+            "impact_level": impact_level if impact_level in IMPACT_LEVELS else "medium",
+            "impact_direction": impact_direction if impact_direction in IMPACT_DIRECTIONS else "neutral",
+            "why_it_matters": str(raw.get("why_it_matters", ""))[:500],
+            "affected_sectors": [str(sector)[:100] for sector in sectors][:10] if isinstance(sectors, list) else ticker_tagger.sectors_for(story["tickers"]),
+            "affected_companies": [str(company)[:100] for company in companies][:10] if isinstance(companies, list) else story["tickers"],
+            "trading_insight": str(raw.get("trading_insight", ""))[:500],
+            "source": (story["sources"][0] if story["sources"] else "Unknown")[:100],
+        }
+    
+    @staticmethod
+    def _placeholder_item(story: Dict[str, Any], rank: int) -> Dict[str, Any]:
+        # Sentiment-based item for a story the model did not rank
+        score = story["sentiment"] or 0.0
+        strength = abs(score)
+        return {
+            "rank": rank,
+            "title": story["headline"][:200],
+            "impact_level": "high" if strength >= 0.5 else "medium" if strength >= 0.2 else "low",
+            "impact_direction": sentiment_scorer.label(score),
+            "why_it_matters": (story["summary"] or "Market-moving financial news")[:500],
+            "affected_sectors": ticker_tagger.sectors_for(story["tickers"]) or ["General"],
+            "affected_companies": story["tickers"],
+            "trading_insight": "Monitor market reaction to this news",
+            "source": (story["sources"][0] if story["sources"] else "Unknown")[:100],
+        }
+    
+    async def _stream_market_impact_items(
+        self, stories: List[Dict[str, Any]], limit: int, used: set, deadline: Deadline
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Forced report_market_impact call; items are validated and yielded as soon as each one is complete
+        news_summary = "\n\n".join([
+            f"Story {i+1}:\nHeadline: {story['headline']}\nSummary: {story['summary'] or 'N/A'}\nSources: {', '.join(story['sources']) or 'N/A'}\nSentiment: {sentiment_scorer.label(story['sentiment'] or 0.0)}"
+            for i, story in enumerate(stories)
+        ])
+        analysis_prompt = f"""Select the {limit} most market-moving stories below and report them with the report_market_impact tool, most impactful first. Refer to stories by their number.
+
+News Stories:
+{news_summary}"""
         
+        parser = JSONArrayItemParser("news_items")
+        chunks = self.provider_router.stream(
+            "rank_headlines",
+            analysis_prompt,
+            system="You are a financial analyst ranking news by expected stock market impact.",
+            tool=MARKET_IMPACT_TOOL,
+            max_tokens=2048,
+            temperature=0.3,
+            deadline=deadline
+        )
+        async with aclosing(chunks):
+            while True:
+                # The deadline also bounds a stream that stalls after its first chunk
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline.timeout())
+                except StopAsyncIteration:
+                    return
+                for raw in parser.feed(chunk):
+                    item = self._market_impact_item(raw, stories, used)
+                    if item:
+                        yield item
+                        if len(used) >= limit:
+                            # Enough items, stop generating
+                            return
+    
+    async def _find_market_impact_uncached(self, limit: int, cache_key: str) -> dict:
+        # Single pipeline: one headline fetch, one forced tool-use call, placeholders from the same stories
+        deadline = Deadline(settings.MARKET_IMPACT_DEADLINE_SECONDS)
         try:
-            news_result = self.news_service.fetch_top_headlines(category="business", country="us", page_size=limit * 2)
-            articles = news_result.get("articles", [])[:limit * 2]
-            
-            if not articles:
-                news_result = self.news_service.fetch_top_headlines(country="us", page_size=limit * 2)
-                articles = news_result.get("articles", [])[:limit * 2]
-            
+            # Over-fetch candidates and let the local sentiment scorer pre-rank them
+            candidate_count = min(limit * 4, 100)
+            news_result = await self.news_service.fetch_top_headlines_async(category="business", country="us", page_size=candidate_count)
+            articles = news_result.get("articles", [])
             if not articles:
-                return {"success": False, "message": "No news articles found.", "news_items": []}
+                return {"success": False, "message": news_result.get("error") or "No news articles found.", "news_items": []}
             
-            news_summary = "\n\n".join([
-                f"Article {i+1}:\nTitle: {art.get('title', 'N/A')}\nDescription: {art.get('description', 'N/A')}\nSource: {art.get('source', {}).get('name', 'N/A')}"
-                for i, art in enumerate(articles)
-            ])
-            
-            analysis_prompt = f"""Analyze the following financial news and return ONLY a JSON object:
-
-{{"news_items": [{{"rank": 1, "title": "News headline", "impact_level": "high|medium|low", "impact_direction": "positive|negative|neutral", "why_it_matters": "Brief explanation", "affected_sectors": ["sector1"], "affected_companies": ["company1"], "trading_insight": "Actionable insight", "source": "source name"}}]}}
-
-News Articles:
-{news_summary}
-
-Return ONLY valid JSON. Select the top {limit} most impactful items."""
+            # Strongest candidates first, duplicate coverage collapsed into one digest per story
+            articles = sentiment_scorer.rank_by_impact(articles, top_k=len(articles))
+            stories = story_summarizer.build_stories(articles, max_stories=limit * 2)
             
+            news_items, used = [], set()
             try:
-                from anthropic import Anthropic
-                client = Anthropic(api_key=settings.CLAUDE_API_KEY)
-                response = client.messages.create(
-                    model=settings.CLAUDE_MODEL,
-                    max_tokens=2048,
-                    temperature=0.3,
-                    messages=[{"role": "user", "content": analysis_prompt}],
-                    system="You are a financial analyst. Return only valid JSON."
-                )
-                agent_response = response.content[0].text if response.content else ""
-            except Exception:
-                agent_response = self.claude_ai.run_agent(
-                    user_message=user_query,
-                    tools=self.tools,
-                    tool_executor=execute_tool,
-                    system=system_prompt,
-                    max_iterations=3,
-                    temperature=0.3,
-                    max_tokens=2048
-                )
+                async for item in self._stream_market_impact_items(stories, limit, used, deadline):
+                    news_items.append(item)
+            except Exception as e:
+                print(f"⚠️ Market impact analysis failed, using sentiment ranking: {str(e)[:200]}")
+            analyzed = len(news_items)
             
-            import re
-            cleaned_response = re.sub(r'```json\s*|\s*```', '', agent_response).strip()
+            # Top up with the strongest remaining stories
+            for number, story in enumerate(stories, 1):
+                if len(news_items) >= limit:
+                    break
+                if number not in used:
+                    news_items.append(self._placeholder_item(story, len(news_items) + 1))
             
-            json_match = re.search(r'\{[^{}]*"news_items"[^{}]*\[[^\]]*\][^{}]*\}', cleaned_response, re.DOTALL)
-            if json_match:
-                try:
-                    parsed_data = json.loads(json_match.group(0))
-                    news_items = parsed_data.get("news_items", [])
-                    
-                    validated_items = []
-                    for item in news_items[:limit]:
-                        if isinstance(item, dict):
-                            validated_items.append({
-                                "rank": item.get("rank", len(validated_items) + 1),
-                                "title": str(item.get("title", "Unknown"))[:200],
-                                "impact_level": item.get("impact_level", "medium").lower(),
-                                "impact_direction": item.get("impact_direction", "neutral").lower(),
-                                "why_it_matters": str(item.get("why_it_matters", ""))[:500],
-                                "affected_sectors": item.get("affected_sectors", []) if isinstance(item.get("affected_sectors"), list) else [],
-                                "affected_companies": item.get("affected_companies", []) if isinstance(item.get("affected_companies"), list) else [],
-                                "trading_insight": str(item.get("trading_insight", ""))[:500],
-                                "source": str(item.get("source", "Unknown"))[:100]
-                            })
-                    
-                    if validated_items:
-                        result = {"success": True, "news_items": validated_items}
-                        _cache[cache_key] = result
-                        _cache_ttl[cache_key] = datetime.now() + timedelta(minutes=2)
-                        return result
-                except json.JSONDecodeError:
-                    pass
-            
-            try:
-                parsed_data = json.loads(cleaned_response)
-                if "news_items" in parsed_data:
-                    return {"success": True, "news_items": parsed_data.get("news_items", [])[:limit]}
-            except json.JSONDecodeError:
-                pass
-            
-            try:
-                news_result = self.news_service.fetch_top_headlines(category="business", country="us", page_size=limit)
-                articles = news_result.get("articles", [])[:limit]
-                news_items = []
-                
-                for idx, article in enumerate(articles, 1):
-                    news_items.append({
-                        "rank": idx,
-                        "title": article.get("title", "No title")[:200],
-                        "impact_level": "medium",
-                        "impact_direction": "neutral",
-                        "why_it_matters": article.get("description", "Financial news update")[:500] if article.get("description") else "Market-moving financial news",
-                        "affected_sectors": ["General"],
-                        "affected_companies": [],
-                        "trading_insight": "Monitor market reaction to this news",
-                        "source": article.get("source", {}).get("name", "Unknown")[:100]
-                    })
-                
-                result = {"success": True, "news_items": news_items}
-                _cache[cache_key] = result
-                _cache_ttl[cache_key] = datetime.now() + timedelta(minutes=2)
+            result = {"success": True, "news_items": news_items}
+            if not analyzed:
+                # Sentiment ranking only, not cached so the next request retries the model
+                result["degraded"] = True
                 return result
-            except Exception:
-                pass
-            
-            return {"success": False, "message": "Unable to parse agent response or fetch news", "news_items": []}
+            ai_cache.set(cache_key, result, ttl=settings.MARKET_IMPACT_CACHE_TTL_SECONDS)
+            return result
         except Exception as e:
-            return {"success": False, "message": f"Error during agent analysis: {str(e)[:200]}", "news_items": []}
-
+            print(f"❌ Market impact analysis failed: {str(e)[:200]}")
+            return {"success": False, "message": f"{ANALYSIS_ERROR_PREFIX}: {str(e)[:200]}", "news_items": []}
 
 agent = APIAgent()
@@ -7,52 +7,54 @@ This demonstrates how to use the agent to:
 3. Find the most impactful news items
 """
 
+import asyncio
+
 from app.LLM.api_agent import agent
 
 
-def example_analyze_market_news():
+async def example_analyze_market_news():
     """Example: Analyze general market news"""
     print("=" * 60)
     print("Example 1: Analyzing General Market News")
     print("=" * 60)
     
     query = "Find the latest financial news that could affect stock markets"
-    result = agent.analyze_market_news(query)
+    result = await agent.analyze_market_news(query)
     print(result)
     print("\n")
 
 
-def example_find_top_impact_news():
+async def example_find_top_impact_news():
     """Example: Find top impactful news"""
     print("=" * 60)
     print("Example 2: Finding Top Market-Impact News")
     print("=" * 60)
     
-    result = agent.find_market_impact_news(limit=5)
+    result = await agent.find_market_impact_news(limit=5)
     print(result)
     print("\n")
 
 
-def example_analyze_specific_stock():
+async def example_analyze_specific_stock():
     """Example: Analyze news for a specific stock"""
     print("=" * 60)
     print("Example 3: Analyzing News for Specific Stock (AAPL)")
     print("=" * 60)
     
     query = "What news is affecting Apple stock (AAPL)?"
-    result = agent.analyze_market_news(query)
+    result = await agent.analyze_market_news(query)
     print(result)
     print("\n")
 
 
-def example_analyze_sector():
+async def example_analyze_sector():
     """Example: Analyze news for a specific sector"""
     print("=" * 60)
     print("Example 4: Analyzing Tech Sector News")
     print("=" * 60)
     
     query = "Find news about technology stocks and their potential market impact"
-    result = agent.analyze_market_news(query)
+    result = await agent.analyze_market_news(query)
     print(result)
     print("\n")
 
@@ -60,12 +62,15 @@ def example_analyze_sector():
 if __name__ == "__main__":
     print("\n🚀 Financial News Analysis Agent - Examples\n")
     
+    async def run_examples():
+        await example_analyze_market_news()
+        await example_find_top_impact_news()
+        await example_analyze_specific_stock()
+        await example_analyze_sector()
+    
     # Run examples
     try:
-        example_analyze_market_news()
-        example_find_top_impact_news()
-        example_analyze_specific_stock()
-        example_analyze_sector()
+        asyncio.run(run_examples())
     except Exception as e:
         print(f"Error running examples: {e}")
         import traceback
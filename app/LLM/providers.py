@@ -0,0 +1,321 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.core.claudeAI import ClaudeAI
+from app.core.genAI import GenAI
+from app.core.config import settings
+from app.core.deadline import Deadline
+
+# Which model tier a task needs and how long its first token may take
+TASK_PROFILES = {
+    "rank_headlines": {"tier": "fast", "latency_budget": 8.0},
+    "analysis": {"tier": "strong", "latency_budget": 30.0},
+}
+
+
+class LatencyTracker:
+    """Recent time-to-first-chunk samples of one model"""
+
+    MIN_SAMPLES = 10
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+
+    def record(self, seconds: float) -> None:
+        self.requests += 1
+        self._samples.append(seconds)
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+
+    def p95(self) -> Optional[float]:
+        # None until there are enough samples to trust
+        if len(self._samples) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "samples": len(self._samples),
+            "p95_first_chunk_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class LLMProvider:
+    """One model of one provider, streaming a completion for a single prompt"""
+
+    provider = ""
+
+    def __init__(self, model: str, tier: str):
+        self.model = model
+        self.tier = tier
+        self.latency = LatencyTracker()
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def stream(
+        self,
+        prompt: str,
+        system: Optional[str],
+        tool: Optional[Dict[str, Any]],
+        max_tokens: int,
+        temperature: float,
+        timeout: Optional[float]
+    ) -> AsyncIterator[str]:
+        """Text chunks, or the JSON input for `tool` when one is given"""
+        raise NotImplementedError
+
+
+class ClaudeProvider(LLMProvider):
+    provider = "claude"
+
+    def __init__(self, claude_ai: ClaudeAI, model: str, tier: str):
+        super().__init__(model, tier)
+        self.claude_ai = claude_ai
+
+    def available(self) -> bool:
+        return bool(settings.CLAUDE_API_KEY)
+
+    def stream(self, prompt, system, tool, max_tokens, temperature, timeout):
+        messages = [{"role": "user", "content": prompt}]
+        if tool:
+            return self.claude_ai.stream_tool_input_async(
+                messages, tool, system=system, max_tokens=max_tokens, temperature=temperature, timeout=timeout, model=self.model
+            )
+        return self.claude_ai.stream_text_async(
+            messages, system=system, max_tokens=max_tokens, temperature=temperature, timeout=timeout, model=self.model
+        )
+
+
+class GeminiProvider(LLMProvider):
+    provider = "gemini"
+
+    def __init__(self, gen_ai: GenAI, model: str, tier: str):
+        super().__init__(model, tier)
+        self.gen_ai = gen_ai
+
+    def available(self) -> bool:
+        return bool(settings.GEMINI_API_KEY)
+
+    def stream(self, prompt, system, tool, max_tokens, temperature, timeout):
+        # Tool calls are emulated with JSON output constrained to the tool's input schema
+        return self.gen_ai.stream_content_async(
+            prompt,
+            system=system,
+            json_schema=tool["input_schema"] if tool else None,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout,
+            model=self.model
+        )
+
+
+class ProviderRouter:
+    """
+    Routes single-prompt LLM tasks to a model by tier, preference and latency
+
+    Candidates of the tier a task needs come first: those whose p95
+    time-to-first-chunk fits the task's latency budget in preference order
+    (provider_order, then the order they were given in), then the rest by
+    latency. With hedging on, a second request goes to the next candidate
+    (another provider when possible) once the first one has gone past its p95
+    without producing output; whichever streams first wins and the other is
+    cancelled. A failed attempt, or one with no output within the attempt
+    timeout, fails over to the next candidate.
+    """
+
+    def __init__(self, providers: List[LLMProvider], hedging: bool = True, provider_order: Optional[List[str]] = None):
+        self.providers = providers
+        self.hedging = hedging
+        self.provider_order = provider_order or []
+        self._stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0}
+
+    def _preference(self, provider: LLMProvider) -> Tuple[int, int]:
+        # Providers missing from provider_order come after the listed ones
+        order = self.provider_order.index(provider.provider) if provider.provider in self.provider_order else len(self.provider_order)
+        return order, self.providers.index(provider)
+
+    def candidates(self, task: str) -> List[LLMProvider]:
+        profile = TASK_PROFILES[task]
+        budget = profile["latency_budget"]
+
+        def rank(provider: LLMProvider) -> Tuple:
+            p95 = provider.latency.p95()
+            within_budget = p95 is None or p95 <= budget
+            return (not within_budget, self._preference(provider) if within_budget else (p95,))
+
+        usable = [provider for provider in self.providers if provider.available()]
+        preferred = sorted((provider for provider in usable if provider.tier == profile["tier"]), key=rank)
+        fallback = sorted((provider for provider in usable if provider.tier != profile["tier"]), key=rank)
+        return preferred + fallback
+
+    @staticmethod
+    def _hedge_delay(provider: LLMProvider) -> float:
+        p95 = provider.latency.p95()
+        delay = p95 if p95 is not None else settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(delay, settings.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    @staticmethod
+    async def _open(provider: LLMProvider, request: Dict[str, Any]) -> Tuple[LLMProvider, AsyncIterator[str], str]:
+        # Start a stream and wait for its first chunk (at most the attempt timeout)
+        started = time.monotonic()
+        chunks = provider.stream(**request)
+        try:
+            first = await asyncio.wait_for(chunks.__anext__(), timeout=request["timeout"])
+        except StopAsyncIteration:
+            first = ""
+        except asyncio.CancelledError:
+            # Lost a hedge race; the elapsed time is still a (lower bound) latency sample
+            provider.latency.record(time.monotonic() - started)
+            await chunks.aclose()
+            raise
+        except Exception:
+            provider.latency.record_failure()
+            await chunks.aclose()
+            raise
+        provider.latency.record(time.monotonic() - started)
+        return provider, chunks, first
+
+    @staticmethod
+    def _next_candidate(remaining: List[LLMProvider], avoid: Optional[LLMProvider]) -> LLMProvider:
+        # Prefer a different provider so a hedge or failover doesn't share the same outage
+        for index, provider in enumerate(remaining):
+            if avoid is None or provider.provider != avoid.provider:
+                return remaining.pop(index)
+        return remaining.pop(0)
+
+    async def stream(
+        self,
+        task: str,
+        prompt: str,
+        system: Optional[str] = None,
+        tool: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion for a task from the best available model
+
+        Args:
+            task: Key of TASK_PROFILES
+            prompt: User prompt
+            system: Optional system prompt
+            tool: Optional tool whose input JSON is the answer (structured output)
+            max_tokens: Maximum output tokens
+            temperature: Sampling temperature
+            deadline: Optional deadline for the whole request; without one each
+                attempt gets LLM_ATTEMPT_TIMEOUT_SECONDS, so a stalled model fails over
+
+        Yields:
+            Chunks from the winning model
+        """
+        remaining = self.candidates(task)
+        if not remaining:
+            raise Exception("No LLM provider is configured")
+        self._stats["requests"] += 1
+        request = {
+            "prompt": prompt,
+            "system": system,
+            "tool": tool,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "timeout": deadline.timeout() if deadline is not None else settings.LLM_ATTEMPT_TIMEOUT_SECONDS,
+        }
+
+        primary = remaining.pop(0)
+        attempts = {asyncio.ensure_future(self._open(primary, request)): primary}
+        hedged = False
+        errors: List[BaseException] = []
+        winner = None
+        try:
+            while winner is None:
+                can_hedge = self.hedging and not hedged and remaining
+                wait_for = self._hedge_delay(primary) if can_hedge else None
+                if deadline is not None:
+                    wait_for = min(wait_for, deadline.remaining()) if wait_for is not None else deadline.remaining()
+                done, _ = await asyncio.wait(attempts, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if can_hedge and (deadline is None or not deadline.expired):
+                        hedge = self._next_candidate(remaining, primary)
+                        attempts[asyncio.ensure_future(self._open(hedge, request))] = hedge
+                        hedged = True
+                        self._stats["hedged"] += 1
+                        continue
+                    raise asyncio.TimeoutError("LLM request deadline exceeded")
+
+                for attempt in done:
+                    provider = attempts.pop(attempt)
+                    if attempt.exception() is not None:
+                        error = attempt.exception()
+                        errors.append(error)
+                        print(f"⚠️ LLM {provider.name} failed: {(str(error) or type(error).__name__)[:200]}")
+                    elif winner is None:
+                        winner = attempt.result()
+                        if hedged and provider is not primary:
+                            self._stats["hedge_wins"] += 1
+                    else:
+                        # Both finished in the same tick, close the extra stream
+                        await attempt.result()[1].aclose()
+
+                if winner is None and not attempts:
+                    if not remaining:
+                        raise errors[-1]
+                    self._stats["failovers"] += 1
+                    fallback = self._next_candidate(remaining, primary)
+                    attempts[asyncio.ensure_future(self._open(fallback, request))] = fallback
+        finally:
+            # Cancel the losers (their streams close and free their LLM slots)
+            for attempt in attempts:
+                attempt.cancel()
+            if attempts:
+                await asyncio.gather(*attempts, return_exceptions=True)
+
+        _, chunks, first = winner
+        try:
+            if first:
+                yield first
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    async def complete(self, task: str, prompt: str, **kwargs) -> str:
+        """Whole completion text (see stream for the arguments)"""
+        return "".join([chunk async for chunk in self.stream(task, prompt, **kwargs)])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "providers": {
+                provider.name: {"tier": provider.tier, "available": provider.available(), **provider.latency.stats()}
+                for provider in self.providers
+            },
+        }
+
+
+def build_default_router(claude_ai: ClaudeAI) -> ProviderRouter:
+    gen_ai = GenAI()
+    return ProviderRouter(
+        [
+            ClaudeProvider(claude_ai, settings.CLAUDE_FAST_MODEL, tier="fast"),
+            GeminiProvider(gen_ai, settings.GEMINI_MODEL, tier="fast"),
+            ClaudeProvider(claude_ai, settings.CLAUDE_MODEL, tier="strong"),
+        ],
+        hedging=settings.LLM_HEDGING,
+        provider_order=settings.LLM_PROVIDER_ORDER,
+    )
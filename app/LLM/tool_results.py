@@ -0,0 +1,119 @@
+import json
+from typing import Any, Dict, List
+
+# Rough chars-per-token ratio for English text / JSON
+CHARS_PER_TOKEN = 4
+# Summary lengths tried (longest first) before stories are dropped
+SUMMARY_STEPS = (320, 160, 80, 0)
+MAX_SOURCES = 3
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def dumps_compact(payload: Dict[str, Any]) -> str:
+    """Minified JSON (no indentation or spaces after separators)"""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[: max(max_chars - 1, 0)].rsplit(" ", 1)[0] + "…"
+
+
+def _compact_story(story: Dict[str, Any], summary_chars: int) -> Dict[str, Any]:
+    # Only the fields the model needs, short keys omitted when empty
+    compact = {"headline": story.get("headline", "")}
+    summary = story.get("summary") or ""
+    if summary and summary_chars:
+        compact["summary"] = _truncate(summary, summary_chars)
+    if story.get("sources"):
+        compact["sources"] = story["sources"][:MAX_SOURCES]
+    if story.get("article_count", 1) > 1:
+        compact["articles"] = story["article_count"]
+    if story.get("tickers"):
+        compact["tickers"] = story["tickers"]
+    if story.get("sentiment") is not None:
+        compact["sentiment"] = story["sentiment"]
+    if story.get("published_at"):
+        compact["date"] = story["published_at"][:10]
+    return compact
+
+
+def encode_stories(meta: Dict[str, Any], stories: List[Dict[str, Any]], max_tokens: int) -> str:
+    """
+    Encode story digests as compact JSON that fits a token budget
+
+    Stories covered by more articles and with stronger sentiment are kept first.
+    Summaries are shortened step by step; when even headline-only stories don't
+    fit, the least important stories are dropped and counted in "omitted".
+
+    Args:
+        meta: Fields placed before the stories (status, query, ...)
+        stories: Story digests from the story summarizer
+        max_tokens: Token budget for the encoded result
+
+    Returns:
+        Minified JSON string
+    """
+    ranked = sorted(
+        stories,
+        key=lambda story: (-story.get("article_count", 1), -abs(story.get("sentiment") or 0.0)),
+    )
+    for summary_chars in SUMMARY_STEPS:
+        payload = {**meta, "stories": [_compact_story(story, summary_chars) for story in ranked]}
+        encoded = dumps_compact(payload)
+        if estimate_tokens(encoded) <= max_tokens:
+            return encoded
+
+    # Headlines only and still too large: binary search the number of stories kept
+    compact = [_compact_story(story, 0) for story in ranked]
+    low, high = 0, len(compact)
+    while low < high:
+        middle = (low + high + 1) // 2
+        candidate = dumps_compact({**meta, "stories": compact[:middle], "omitted": len(compact) - middle})
+        if estimate_tokens(candidate) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return dumps_compact({**meta, "stories": compact[:low], "omitted": len(compact) - low})
+
+
+class ToolResultBudget:
+    """
+    Token budget for tool results in one agent run (per result and for the whole conversation)
+
+    Tool calls of a turn run concurrently, so a call reserves its allowance
+    before fetching and encoding, and releases what its result didn't use:
+    parallel calls can never take more than the conversation total together.
+    """
+
+    def __init__(self, per_result_tokens: int, total_tokens: int):
+        self.per_result_tokens = per_result_tokens
+        self.remaining_tokens = total_tokens
+
+    def allowance(self) -> int:
+        """Tokens the next tool result may use"""
+        return max(min(self.per_result_tokens, self.remaining_tokens), 0)
+
+    def reserve(self) -> int:
+        """Take the next result's allowance out of the budget, returns its size"""
+        reserved = self.allowance()
+        self.remaining_tokens -= reserved
+        return reserved
+
+    def release(self, reserved: int, text: str) -> str:
+        """Settle a reservation with the result that was produced, refunding the unused tokens"""
+        self.remaining_tokens += reserved - estimate_tokens(text)
+        return text
+
+    @property
+    def exhausted(self) -> bool:
+        # Not even a handful of headlines would fit
+        return self.remaining_tokens < 100
+
+
+def exhausted_result() -> str:
+    return dumps_compact({"error": "Tool result budget for this analysis is used up. Answer with the news already retrieved."})
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
+from app.core.auth_user_cache import auth_user_cache
 from app.core.security import security_manager
 from app.services.api_key_service import ApiKeyService
 from app.repositories.users_repository import UsersRepository
@@ -37,8 +38,7 @@ async def authenticate_user_or_api_key(
             raise HTTPException(status_code=401, detail="Invalid API key")
         
         # Get user information
-        users_repo = get_users_repository()
-        user = await users_repo.find_by_id(api_key_doc.user_id)
+        user = await auth_user_cache.get(str(api_key_doc.user_id), get_users_repository())
         
         if not user:
             raise HTTPException(status_code=401, detail="User associated with API key not found")
@@ -64,8 +64,7 @@ async def authenticate_user_or_api_key(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
     
-    users_repo = get_users_repository()
-    user = await users_repo.find_by_id(user_id)
+    user = await auth_user_cache.get(user_id, get_users_repository())
     
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
@@ -5,6 +5,9 @@ This is for programmatic access - JWT tokens are NOT accepted here.
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Dict, Any
+from app.core.auth_user_cache import auth_user_cache
+from app.core.llm_governor import set_request_context
+from app.core.usage_meter import usage_meter
 from app.services.api_key_service import ApiKeyService
 from app.repositories.users_repository import UsersRepository
 
@@ -43,8 +46,7 @@ async def authenticate_api_key_only(
         raise HTTPException(status_code=401, detail="Invalid API key")
     
     # Get user information
-    users_repo = get_users_repository()
-    user = await users_repo.find_by_id(api_key_doc.user_id)
+    user = await auth_user_cache.get(str(api_key_doc.user_id), get_users_repository())
     
     if not user:
         raise HTTPException(status_code=401, detail="User associated with API key not found")
@@ -55,7 +57,9 @@ async def authenticate_api_key_only(
     return {
         "user_id": str(user.id),
         "user": user,
-        "auth_method": "api_key"
+        "auth_method": "api_key",
+        "api_key_id": str(api_key_doc.id),
+        "api_key": api_key_doc
     }
 
 
@@ -76,5 +80,10 @@ async def check_ai_access_api_key_only(
             detail="Your AI access has been blocked. Please contact an administrator."
         )
     
+    # Monthly token quota of the key, checked against in-memory usage
+    await usage_meter.enforce_quota(auth_result["api_key_id"], auth_result["api_key"].monthly_token_quota)
+    
+    # Queue priority and fairness key for LLM calls made by this request, usage is attributed to the key
+    set_request_context("api", auth_result["api_key_id"], user_id=auth_result["user_id"], api_key_id=auth_result["api_key_id"])
     return auth_result
 
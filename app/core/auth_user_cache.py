@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.repositories.users_repository import UsersRepository
+
+
+class AuthUser(BaseModel):
+    """The part of a user the auth dependencies check"""
+    id: str
+    is_active: bool = False
+    ai_access_blocked: bool = False
+    is_super_Admin: bool = False
+
+
+class AuthUserCache:
+    """
+    Short-lived, bounded cache of AuthUser by user ID for the auth dependencies
+
+    Authenticated requests would otherwise load and hydrate the full User
+    document every time. Entries expire after AUTH_USER_CACHE_TTL_SECONDS and
+    are invalidated in this process when a user is updated, blocked, verified
+    or deleted; other workers pick the change up when their entry expires.
+    Concurrent misses for the same user share one (projected) query.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries=max_entries, max_bytes=max_entries * 512, default_ttl=ttl_seconds)
+        self._flight = SingleFlight()
+        # Bumped on every invalidation; a load that raced with one doesn't cache its (possibly stale) result
+        self._version = 0
+
+    async def _load(self, user_id: str, users_repo: UsersRepository) -> Optional[AuthUser]:
+        version = self._version
+        fields = await users_repo.find_auth_fields(user_id)
+        if fields is None:
+            # Unknown users are not cached, so a new account is seen right away
+            return None
+        user = AuthUser(id=str(fields["_id"]), **{key: value for key, value in fields.items() if key != "_id" and value is not None})
+        if version == self._version:
+            self._cache.set(user_id, user)
+        return user
+
+    async def get(self, user_id: str, users_repo: Optional[UsersRepository] = None) -> Optional[AuthUser]:
+        """
+        Auth fields of a user, from memory when fresh
+
+        Args:
+            user_id: User ID from the JWT subject or the API key
+            users_repo: Repository used on a miss
+
+        Returns:
+            AuthUser, or None when the user doesn't exist
+        """
+        user = self._cache.get(user_id)
+        if user is not None:
+            return user
+        return await self._flight.do(user_id, lambda: self._load(user_id, users_repo or UsersRepository()))
+
+    def invalidate(self, user_id: Any) -> None:
+        self._version += 1
+        self._cache.delete(str(user_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "in_flight": self._flight.stats()}
+
+
+auth_user_cache = AuthUserCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
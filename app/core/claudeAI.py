@@ -1,20 +1,317 @@
-from typing import Optional, Dict, Any, List
-from anthropic import Anthropic
+import asyncio
+import threading
+import time
+import httpx
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable
+from anthropic import Anthropic, AsyncAnthropic, APITimeoutError, DefaultHttpxClient, DefaultAsyncHttpxClient
+from pydantic import BaseModel
 from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.llm_governor import llm_governor, LLMOverloaded, estimate_tokens
+from app.core.recording import recording_transport, async_recording_transport
+from app.core.usage_meter import usage_meter
+
+# Prompt cache breakpoint (5 minute ephemeral cache)
+CACHE_CONTROL = {"type": "ephemeral"}
+# Final agent turn: tools stay defined (history has tool_use blocks) but may not be called
+NO_TOOL_CHOICE = {"type": "none"}
+TOOL_TIMEOUT_PREFIX = "Error executing tool: timed out"
+TOOL_LIMIT_REACHED = "Not run: the tool call limit of this analysis is reached. Answer with the information already gathered."
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+# Same pool size as the SDK's default client
+HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+
+
+class AgentRunResult(BaseModel):
+    text: str
+    partial: bool = False  # Requested tools were refused (iteration limit) or a turn/tool call timed out; the answer uses what was gathered
+    iterations: int = 0
+    usage: Dict[str, int] = {}
 
 
 class ClaudeAI:
     def __init__(self):
         self.api_key = settings.CLAUDE_API_KEY
         self.model = settings.CLAUDE_MODEL
-        self.client = Anthropic(api_key=self.api_key)
-    
+        self.client = Anthropic(api_key=self.api_key, base_url=settings.CLAUDE_BASE_URL, http_client=self._http_client())
+        # Non-blocking client for the async agent loop (pooled connections, no threads)
+        self.async_client = AsyncAnthropic(
+            api_key=self.api_key, base_url=settings.CLAUDE_BASE_URL, http_client=self._async_http_client()
+        )
+        self.prompt_caching = settings.CLAUDE_PROMPT_CACHING
+        self._usage_lock = threading.Lock()
+        self._usage_totals = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+
+    @staticmethod
+    def _http_client() -> Optional[httpx.Client]:
+        # None keeps the SDK's default client; with HTTP_RECORD_PATH set, exchanges are recorded for replay
+        transport = recording_transport("anthropic", limits=HTTP_LIMITS)
+        return DefaultHttpxClient(transport=transport) if transport else None
+
+    @staticmethod
+    def _async_http_client() -> Optional[httpx.AsyncClient]:
+        transport = async_recording_transport("anthropic", limits=HTTP_LIMITS)
+        return DefaultAsyncHttpxClient(transport=transport) if transport else None
+
     def get_api_key(self) -> str:
         return self.api_key
-    
+
     def get_model(self) -> str:
         return self.model
-    
+
+    @staticmethod
+    def _with_cache_control(block: Dict[str, Any]) -> Dict[str, Any]:
+        return {**block, "cache_control": CACHE_CONTROL}
+
+    def _cached_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Rolling breakpoint on the newest turn: everything before it (earlier tool results) is read from cache
+        # on the next iteration. The stored history is not modified, so breakpoints never accumulate.
+        if not messages:
+            return messages
+        last = messages[-1]
+        content = last["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        if not content:
+            return messages
+        return messages[:-1] + [{**last, "content": content[:-1] + [self._with_cache_control(content[-1])]}]
+
+    def _request_params(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        # Messages API parameters with cache breakpoints on tools, system prompt and the latest turn
+        params = {"model": self.model, "max_tokens": max_tokens, "temperature": temperature}
+        if not self.prompt_caching:
+            params["messages"] = messages
+            if tools:
+                params["tools"] = tools
+            if system:
+                params["system"] = system
+            return params
+
+        params["messages"] = self._cached_messages(messages)
+        if tools:
+            # A breakpoint on the last tool caches the whole tool list
+            params["tools"] = tools[:-1] + [self._with_cache_control(tools[-1])]
+        if system:
+            params["system"] = [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+        return params
+
+    @staticmethod
+    def _usage_counts(response) -> Dict[str, int]:
+        usage = getattr(response, "usage", None)
+        return {name: getattr(usage, name, 0) or 0 for name in USAGE_FIELDS}
+
+    @classmethod
+    def _add_usage(cls, totals: Dict[str, int], response) -> None:
+        for name, value in cls._usage_counts(response).items():
+            totals[name] = totals.get(name, 0) + value
+
+    def _record_usage(self, response, started: float) -> Dict[str, int]:
+        # Token usage of one call, including prompt cache reads/writes; metered per user / API key
+        counts = self._usage_counts(response)
+        usage_meter.record_call(getattr(response, "model", None) or self.model, counts, time.monotonic() - started)
+        with self._usage_lock:
+            self._usage_totals["calls"] += 1
+            for name, value in counts.items():
+                self._usage_totals[name] += value
+        return counts
+
+    @staticmethod
+    def _estimated_tokens(params: Dict[str, Any]) -> int:
+        # Upper bound reserved with the governor before the call
+        return estimate_tokens(params["messages"], params.get("system"), params.get("tools")) + params["max_tokens"]
+
+    @staticmethod
+    def _rate_limited_tokens(counts: Dict[str, int]) -> int:
+        # Cache reads don't count towards the input token rate limit
+        return counts["input_tokens"] + counts["cache_creation_input_tokens"] + counts["output_tokens"]
+
+    def usage_stats(self) -> Dict[str, Any]:
+        with self._usage_lock:
+            totals = dict(self._usage_totals)
+        prompt_tokens = totals["input_tokens"] + totals["cache_creation_input_tokens"] + totals["cache_read_input_tokens"]
+        totals["cache_read_ratio"] = round(totals["cache_read_input_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+        return totals
+
+    async def create_message_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        **kwargs
+    ):
+        # Single Messages API call through the LLM governor, with prompt caching and usage reporting.
+        # Time spent queued for a slot is taken off `timeout`
+        params = self._request_params(messages, tools, system, max_tokens, temperature)
+        queued_at = time.monotonic()
+        async with llm_governor.limit(self._estimated_tokens(params), deadline) as permit:
+            if timeout is not None:
+                params["timeout"] = max(timeout - (time.monotonic() - queued_at), 0.01)
+            started = time.monotonic()
+            response = await self.async_client.messages.create(**params, **kwargs)
+            permit.used(self._rate_limited_tokens(self._record_usage(response, started)))
+        return response
+
+    async def stream_tool_input_async(
+        self,
+        messages: List[Dict[str, Any]],
+        tool: Dict[str, Any],
+        system: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.3,
+        timeout: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        # Force Claude to answer by calling `tool` and yield the tool input JSON as it streams in;
+        # the API validates nothing here, callers parse/validate the JSON against the tool schema
+        params = self._request_params(messages, [tool], system, max_tokens, temperature)
+        params["tool_choice"] = {"type": "tool", "name": tool["name"]}
+        if model:
+            params["model"] = model
+        queued_at = time.monotonic()
+        async with llm_governor.limit(self._estimated_tokens(params)) as permit:
+            if timeout is not None:
+                params["timeout"] = max(timeout - (time.monotonic() - queued_at), 0.01)
+            started = time.monotonic()
+            async with self.async_client.messages.stream(**params) as stream:
+                async for event in stream:
+                    if event.type == "input_json" and event.partial_json:
+                        yield event.partial_json
+                permit.used(self._rate_limited_tokens(self._record_usage(await stream.get_final_message(), started)))
+
+    async def stream_text_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        # Plain text completion, yielded as text deltas
+        params = self._request_params(messages, None, system, max_tokens, temperature)
+        if model:
+            params["model"] = model
+        queued_at = time.monotonic()
+        async with llm_governor.limit(self._estimated_tokens(params)) as permit:
+            if timeout is not None:
+                params["timeout"] = max(timeout - (time.monotonic() - queued_at), 0.01)
+            started = time.monotonic()
+            async with self.async_client.messages.stream(**params) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                permit.used(self._rate_limited_tokens(self._record_usage(await stream.get_final_message(), started)))
+
+    @staticmethod
+    def _assistant_message(response) -> Dict[str, Any]:
+        # Convert response content blocks into a replayable assistant message
+        assistant_message = {"role": "assistant", "content": []}
+        for content_block in response.content:
+            if content_block.type == "text":
+                assistant_message["content"].append({"type": "text", "text": content_block.text})
+            elif content_block.type == "tool_use":
+                assistant_message["content"].append({
+                    "type": "tool_use",
+                    "id": content_block.id,
+                    "name": content_block.name,
+                    "input": content_block.input
+                })
+        return assistant_message
+
+    @staticmethod
+    def _final_text(assistant_message: Dict[str, Any]) -> str:
+        final_text = ""
+        for content in assistant_message["content"]:
+            if content.get("type") == "text":
+                final_text += content.get("text", "")
+        return final_text if final_text else "Agent completed without response."
+
+    def _must_finish(self, deadline: Deadline) -> bool:
+        # Too little time left for another tool round
+        return deadline.near(settings.AGENT_FINAL_ANSWER_RESERVE_SECONDS)
+
+    def _turn_timeout(self, finishing: bool, deadline: Deadline) -> float:
+        # Tool turns keep the reserve back so a final answer can still be requested if they time out
+        return deadline.timeout() if finishing else deadline.timeout(reserve=settings.AGENT_FINAL_ANSWER_RESERVE_SECONDS)
+
+    def _tool_timeout(self, deadline: Deadline) -> float:
+        return deadline.timeout(cap=settings.AGENT_TOOL_TIMEOUT_SECONDS, reserve=settings.AGENT_FINAL_ANSWER_RESERVE_SECONDS)
+
+    @staticmethod
+    def _tool_uses(assistant_message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [block for block in assistant_message["content"] if block["type"] == "tool_use"]
+
+    @staticmethod
+    def _tool_result(block: Dict[str, Any], content: str) -> Dict[str, Any]:
+        return {"type": "tool_result", "tool_use_id": block["id"], "content": content}
+
+    @classmethod
+    def _refused_tools(cls, tool_uses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Tools requested on the last allowed turn are answered without running them
+        return [cls._tool_result(block, TOOL_LIMIT_REACHED) for block in tool_uses]
+
+    @staticmethod
+    def _any_timed_out(tool_results: List[Dict[str, Any]]) -> bool:
+        return any(str(result["content"]).startswith(TOOL_TIMEOUT_PREFIX) for result in tool_results)
+
+    def _execute_tools(self, tool_uses: List[Dict[str, Any]], tool_executor: callable, timeout: float) -> List[Dict[str, Any]]:
+        # Run all tool calls of one turn in parallel threads; results keep the tool_use order
+        pool = ThreadPoolExecutor(max_workers=min(len(tool_uses), settings.AGENT_MAX_PARALLEL_TOOLS))
+        try:
+            futures = [pool.submit(tool_executor, block["name"], block["input"]) for block in tool_uses]
+            # One shared end time, so waiting on several futures never exceeds the timeout
+            ends_at = time.monotonic() + timeout
+            tool_results = []
+            for block, future in zip(tool_uses, futures):
+                try:
+                    tool_results.append(self._tool_result(block, future.result(timeout=max(ends_at - time.monotonic(), 0))))
+                except FutureTimeoutError:
+                    tool_results.append(self._tool_result(block, f"{TOOL_TIMEOUT_PREFIX} after {timeout:.1f}s"))
+                except Exception as e:
+                    tool_results.append(self._tool_result(block, f"Error executing tool: {str(e)}"))
+            return tool_results
+        finally:
+            # Don't wait for timed out tools
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _execute_tools_async(
+        self,
+        tool_uses: List[Dict[str, Any]],
+        tool_executor: Callable[[str, Dict[str, Any]], Awaitable[str]],
+        timeout: float
+    ) -> List[Dict[str, Any]]:
+        # Run all tool calls of one turn concurrently (capped, each with its own timeout), in tool_use order
+        semaphore = asyncio.Semaphore(settings.AGENT_MAX_PARALLEL_TOOLS)
+
+        async def run(block: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    content = await asyncio.wait_for(tool_executor(block["name"], block["input"]), timeout=timeout)
+                    return self._tool_result(block, content)
+                except asyncio.TimeoutError:
+                    return self._tool_result(block, f"{TOOL_TIMEOUT_PREFIX} after {timeout:.1f}s")
+                except Exception as e:
+                    return self._tool_result(block, f"Error executing tool: {str(e)}")
+
+        return list(await asyncio.gather(*(run(block) for block in tool_uses)))
+
     def run_agent(
         self,
         user_message: str,
@@ -24,62 +321,196 @@ class ClaudeAI:
         max_iterations: int = 10,
         temperature: float = 0.7,
         max_tokens: int = 4096,
-        timeout: int = 60
-    ) -> str:
-        # Run agent loop with autonomous tool use
+        timeout: float = 60,
+        deadline: Optional[Deadline] = None
+    ) -> AgentRunResult:
+        # Run agent loop with autonomous tool use. Tools asked for on turn max_iterations are refused
+        # and one more, tool-free turn answers. `deadline` (default: `timeout` seconds from now) bounds
+        # the whole run: near it the last turn answers without tools. The result is partial when
+        # requested tools were refused or a turn or tool call timed out
+        deadline = deadline or Deadline(timeout)
         messages = [{"role": "user", "content": user_message}]
+        usage: Dict[str, int] = {}
         iteration = 0
-        
-        while iteration < max_iterations:
+        force_finish = False
+        cut_short = False
+
+        while True:
+            finishing = force_finish or self._must_finish(deadline)
+            params = self._request_params(messages, tools, system, max_tokens, temperature)
+            if finishing:
+                params["tool_choice"] = NO_TOOL_CHOICE
             try:
-                response = self.client.messages.create(
-                    model=self.model,
+                with llm_governor.limit_sync(self._estimated_tokens(params), deadline) as permit:
+                    started = time.monotonic()
+                    response = self.client.messages.create(**params, timeout=self._turn_timeout(finishing, deadline))
+                    permit.used(self._rate_limited_tokens(self._record_usage(response, started)))
+            except LLMOverloaded:
+                raise
+            except APITimeoutError:
+                if finishing:
+                    raise Exception("Agent iteration failed: deadline exceeded")
+                # The turn (and any tools it would have asked for) was cut off
+                cut_short = force_finish = True
+                continue
+            except Exception as e:
+                raise Exception(f"Agent iteration failed: {str(e)}")
+            self._add_usage(usage, response)
+            iteration += 1
+
+            assistant_message = self._assistant_message(response)
+            tool_uses = self._tool_uses(assistant_message)
+            if finishing or not tool_uses:
+                usage_meter.record_run(self.model, iteration)
+                return AgentRunResult(text=self._final_text(assistant_message), partial=cut_short, iterations=iteration, usage=usage)
+
+            messages.append(assistant_message)
+            if iteration >= max_iterations:
+                messages.append({"role": "user", "content": self._refused_tools(tool_uses)})
+                cut_short = force_finish = True
+                continue
+            tool_results = self._execute_tools(tool_uses, tool_executor, self._tool_timeout(deadline))
+            cut_short = cut_short or self._any_timed_out(tool_results)
+            messages.append({"role": "user", "content": tool_results})
+
+    async def run_agent_async(
+        self,
+        user_message: str,
+        tools: List[Dict[str, Any]],
+        tool_executor: Callable[[str, Dict[str, Any]], Awaitable[str]],
+        system: Optional[str] = None,
+        max_iterations: int = 10,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        timeout: float = 60,
+        deadline: Optional[Deadline] = None
+    ) -> AgentRunResult:
+        # Same loop as run_agent on AsyncAnthropic; tool_executor is a coroutine function
+        deadline = deadline or Deadline(timeout)
+        messages = [{"role": "user", "content": user_message}]
+        usage: Dict[str, int] = {}
+        iteration = 0
+        force_finish = False
+        cut_short = False
+
+        while True:
+            finishing = force_finish or self._must_finish(deadline)
+            try:
+                response = await self.create_message_async(
+                    messages,
+                    system=system,
+                    tools=tools,
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    messages=messages,
-                    tools=tools if tools else None,
-                    system=system
+                    timeout=self._turn_timeout(finishing, deadline),
+                    deadline=deadline,
+                    **({"tool_choice": NO_TOOL_CHOICE} if finishing else {})
                 )
-                
-                assistant_message = {"role": "assistant", "content": []}
-                tool_results = []
-                
-                for content_block in response.content:
-                    if content_block.type == "text":
-                        assistant_message["content"].append({"type": "text", "text": content_block.text})
-                    elif content_block.type == "tool_use":
-                        assistant_message["content"].append({
-                            "type": "tool_use",
-                            "id": content_block.id,
-                            "name": content_block.name,
-                            "input": content_block.input
-                        })
-                        try:
-                            tool_result = tool_executor(content_block.name, content_block.input)
-                            tool_results.append({"type": "tool_result", "tool_use_id": content_block.id, "content": tool_result})
-                        except Exception as e:
-                            tool_results.append({"type": "tool_result", "tool_use_id": content_block.id, "content": f"Error executing tool: {str(e)}"})
-                
-                messages.append(assistant_message)
-                
-                if not tool_results:
-                    final_text = ""
-                    for content in assistant_message["content"]:
-                        if content.get("type") == "text":
-                            final_text += content.get("text", "")
-                    return final_text if final_text else "Agent completed without response."
-                
-                messages.append({"role": "user", "content": tool_results})
-                iteration += 1
-                
+            except LLMOverloaded:
+                raise
+            except APITimeoutError:
+                if finishing:
+                    raise Exception("Agent iteration failed: deadline exceeded")
+                # The turn (and any tools it would have asked for) was cut off
+                cut_short = force_finish = True
+                continue
+            except Exception as e:
+                raise Exception(f"Agent iteration failed: {str(e)}")
+            self._add_usage(usage, response)
+            iteration += 1
+
+            assistant_message = self._assistant_message(response)
+            tool_uses = self._tool_uses(assistant_message)
+            if finishing or not tool_uses:
+                usage_meter.record_run(self.model, iteration)
+                return AgentRunResult(text=self._final_text(assistant_message), partial=cut_short, iterations=iteration, usage=usage)
+
+            messages.append(assistant_message)
+            if iteration >= max_iterations:
+                messages.append({"role": "user", "content": self._refused_tools(tool_uses)})
+                cut_short = force_finish = True
+                continue
+            tool_results = await self._execute_tools_async(tool_uses, tool_executor, self._tool_timeout(deadline))
+            cut_short = cut_short or self._any_timed_out(tool_results)
+            messages.append({"role": "user", "content": tool_results})
+
+    async def stream_agent_async(
+        self,
+        user_message: str,
+        tools: List[Dict[str, Any]],
+        tool_executor: Callable[[str, Dict[str, Any]], Awaitable[str]],
+        system: Optional[str] = None,
+        max_iterations: int = 10,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        timeout: float = 60,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Streaming variant of run_agent_async, yields {"event": ..., "data": {...}} dicts:
+        # "text" for each generated text delta, "tool_call"/"tool_result" around tool execution
+        # (status ok, error or refused when past max_iterations),
+        # "reset" when a turn that already streamed text timed out (its text is discarded and a
+        # forced, tool-free turn follows) and a final "done" carrying the complete answer,
+        # the partial flag, iterations and usage
+        deadline = deadline or Deadline(timeout)
+        messages = [{"role": "user", "content": user_message}]
+        usage: Dict[str, int] = {}
+        iteration = 0
+        force_finish = False
+        cut_short = False
+
+        while True:
+            turn_streamed_text = False
+            finishing = force_finish or self._must_finish(deadline)
+            params = self._request_params(messages, tools, system, max_tokens, temperature)
+            if finishing:
+                params["tool_choice"] = NO_TOOL_CHOICE
+            try:
+                async with llm_governor.limit(self._estimated_tokens(params), deadline) as permit:
+                    started = time.monotonic()
+                    async with self.async_client.messages.stream(**params, timeout=self._turn_timeout(finishing, deadline)) as stream:
+                        async for event in stream:
+                            if event.type == "text":
+                                turn_streamed_text = True
+                                yield {"event": "text", "data": {"text": event.text}}
+                            elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                                block = event.content_block
+                                yield {"event": "tool_call", "data": {"id": block.id, "name": block.name, "input": block.input}}
+                        response = await stream.get_final_message()
+                    permit.used(self._rate_limited_tokens(self._record_usage(response, started)))
+            except LLMOverloaded:
+                raise
+            except APITimeoutError:
+                if finishing:
+                    raise Exception("Agent iteration failed: deadline exceeded")
+                if turn_streamed_text:
+                    # The client already shows part of this turn; tell it to drop that before the forced answer
+                    yield {"event": "reset", "data": {"reason": "deadline"}}
+                cut_short = force_finish = True
+                continue
             except Exception as e:
                 raise Exception(f"Agent iteration failed: {str(e)}")
-        
-        if messages and len(messages) > 0:
-            last_message = messages[-1]
-            if isinstance(last_message.get("content"), list):
-                for content in last_message["content"]:
-                    if isinstance(content, dict) and content.get("type") == "text":
-                        return content.get("text", "Agent reached max iterations.")
-        
-        return "Agent reached maximum iterations without completing."
+            self._add_usage(usage, response)
+            iteration += 1
+
+            assistant_message = self._assistant_message(response)
+            tool_uses = self._tool_uses(assistant_message)
+            if finishing or not tool_uses:
+                usage_meter.record_run(self.model, iteration)
+                result = AgentRunResult(text=self._final_text(assistant_message), partial=cut_short, iterations=iteration, usage=usage)
+                yield {"event": "done", "data": result.model_dump()}
+                return
+
+            messages.append(assistant_message)
+            if iteration >= max_iterations:
+                messages.append({"role": "user", "content": self._refused_tools(tool_uses)})
+                for block in tool_uses:
+                    yield {"event": "tool_result", "data": {"id": block["id"], "name": block["name"], "status": "refused"}}
+                cut_short = force_finish = True
+                continue
+            tool_results = await self._execute_tools_async(tool_uses, tool_executor, self._tool_timeout(deadline))
+            cut_short = cut_short or self._any_timed_out(tool_results)
+            for block, result in zip(tool_uses, tool_results):
+                failed = str(result["content"]).startswith("Error executing tool")
+                yield {"event": "tool_result", "data": {"id": block["id"], "name": block["name"], "status": "error" if failed else "ok"}}
+            messages.append({"role": "user", "content": tool_results})
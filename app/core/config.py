@@ -30,6 +30,12 @@ class Config:
     REFRESH_TOKEN_EXPIRE_DAYS=int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
     TOKEN_EXPIRE_DAYS=int(os.getenv("TOKEN_EXPIRE_DAYS", 1))
     TOKEN_EXPIRE_MINUTES=int(os.getenv("TOKEN_EXPIRE_MINUTES", 15))
+    AUTH_USER_CACHE_TTL_SECONDS=float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", 30))  # Auth fields of a user kept in memory
+    AUTH_USER_CACHE_MAX_ENTRIES=int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", 10000))
+    PASSWORD_HASH_TARGET_MS=int(os.getenv("PASSWORD_HASH_TARGET_MS", 250))  # bcrypt cost is raised at startup while a hash stays under this
+    PASSWORD_BCRYPT_MIN_ROUNDS=int(os.getenv("PASSWORD_BCRYPT_MIN_ROUNDS", 12))  # Floor; values below 12 are ignored
+    PASSWORD_BCRYPT_MAX_ROUNDS=int(os.getenv("PASSWORD_BCRYPT_MAX_ROUNDS", 14))
+    PASSWORD_BCRYPT_ROUNDS=int(os.getenv("PASSWORD_BCRYPT_ROUNDS")) if os.getenv("PASSWORD_BCRYPT_ROUNDS") else None  # Fixed cost, skips tuning
 
 
     # Backend URL
@@ -39,6 +45,10 @@ class Config:
     # News API configuration
     NEWS_API_KEY=os.getenv("NEWS_API_KEY")
     NEWS_API_URL=os.getenv("NEWS_API_URL")
+    NEWS_INDEX_MAX_ARTICLES=int(os.getenv("NEWS_INDEX_MAX_ARTICLES", 5000))
+    NEWS_INDEX_MIN_HITS=int(os.getenv("NEWS_INDEX_MIN_HITS", 5))  # Local hits needed to skip the upstream search
+    NEWS_INGEST_INTERVAL_SECONDS=int(os.getenv("NEWS_INGEST_INTERVAL_SECONDS", 300))  # 0 disables background ingestion
+    FEED_MAX_ITEMS=int(os.getenv("FEED_MAX_ITEMS", 500))  # Per-user feed length
 
     # RapidAPI Yahoo Finance configuration
     RAPIDAPI_KEY=os.getenv("RAPIDAPI_KEY")
@@ -48,6 +58,59 @@ class Config:
     # AI API configuration - Claude (Anthropic)
     CLAUDE_API_KEY=os.getenv("CLAUDE_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
     CLAUDE_MODEL=os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022")
+    CLAUDE_FAST_MODEL=os.getenv("CLAUDE_FAST_MODEL", "claude-3-5-haiku-20241022")  # Cheap/fast tier (headline ranking)
+    CLAUDE_PROMPT_CACHING=os.getenv("CLAUDE_PROMPT_CACHING", "true").lower() == "true"  # Cache tools/system/history prefixes
+    CLAUDE_BASE_URL=os.getenv("CLAUDE_BASE_URL")  # e.g. the local stand-in (python -m app.scripts.llm_standin)
+    HTTP_RECORD_PATH=os.getenv("HTTP_RECORD_PATH")  # JSONL cassette; records Anthropic and News API exchanges for replay
+    AGENT_TOOL_TIMEOUT_SECONDS=float(os.getenv("AGENT_TOOL_TIMEOUT_SECONDS", 20))  # Per tool call
+    AGENT_RUN_DEADLINE_SECONDS=float(os.getenv("AGENT_RUN_DEADLINE_SECONDS", 45))  # Whole analysis (prefetch, model turns, tools)
+    MARKET_IMPACT_DEADLINE_SECONDS=float(os.getenv("MARKET_IMPACT_DEADLINE_SECONDS", 25))  # Headline ranking call; then sentiment fills in
+    AGENT_FINAL_ANSWER_RESERVE_SECONDS=float(os.getenv("AGENT_FINAL_ANSWER_RESERVE_SECONDS", 12))  # Kept back for the final, tool-free turn
+    LLM_MAX_CONCURRENCY=int(os.getenv("LLM_MAX_CONCURRENCY", 8))  # Claude + Gemini calls in flight per process
+    LLM_TOKENS_PER_MINUTE=int(os.getenv("LLM_TOKENS_PER_MINUTE", 80000))  # Keep below the provider's rate limit
+    LLM_QUEUE_MAX_WAIT_SECONDS=float(os.getenv("LLM_QUEUE_MAX_WAIT_SECONDS", 30))  # For calls without a request deadline
+    LLM_USAGE_FLUSH_SECONDS=int(os.getenv("LLM_USAGE_FLUSH_SECONDS", 30))  # Bulk-write interval of per-user token usage
+    LLM_QUOTA_REFRESH_SECONDS=int(os.getenv("LLM_QUOTA_REFRESH_SECONDS", 15))  # Re-read of month-to-date key usage; other workers' usage lags flush + refresh
+    LLM_HEDGING=os.getenv("LLM_HEDGING", "true").lower() == "true"  # Second provider when the first is past its p95
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS=float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_SECONDS", 4))  # Until enough latency samples exist
+    LLM_HEDGE_MIN_DELAY_SECONDS=float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", 0.5))
+    LLM_ATTEMPT_TIMEOUT_SECONDS=float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS", 30))  # Per provider attempt when the caller has no deadline
+    LLM_PROVIDER_ORDER=[name.strip() for name in os.getenv("LLM_PROVIDER_ORDER", "claude,gemini").split(",") if name.strip()]  # Preference within a tier
+    AGENT_MAX_PARALLEL_TOOLS=int(os.getenv("AGENT_MAX_PARALLEL_TOOLS", 4))  # Concurrent tool calls per agent turn
+    TOOL_RESULT_MAX_TOKENS=int(os.getenv("TOOL_RESULT_MAX_TOKENS", 1500))  # Per tool result, stories trimmed to fit
+    AGENT_TOOL_RESULTS_MAX_TOKENS=int(os.getenv("AGENT_TOOL_RESULTS_MAX_TOKENS", 6000))  # All tool results in one conversation
+    AGENT_PREFETCH=os.getenv("AGENT_PREFETCH", "true").lower() == "true"  # Fetch likely tool results before the first model call
+    AGENT_PREFETCH_MAX_TICKERS=int(os.getenv("AGENT_PREFETCH_MAX_TICKERS", 3))
+
+    # AI result cache
+    AI_CACHE_MAX_ENTRIES=int(os.getenv("AI_CACHE_MAX_ENTRIES", 1000))
+    AI_CACHE_MAX_BYTES=int(os.getenv("AI_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    ANALYSIS_CACHE_TTL_SECONDS=int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", 300))
+    MARKET_IMPACT_CACHE_TTL_SECONDS=int(os.getenv("MARKET_IMPACT_CACHE_TTL_SECONDS", 120))
+    SEMANTIC_CACHE_THRESHOLD=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.85))  # Cosine similarity for reusing an analysis
+    SEMANTIC_CACHE_MAX_ENTRIES=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 2000))
+    TOOL_CACHE_MAX_ENTRIES=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", 500))  # Agent tool results shared across runs
+    TOOL_CACHE_TTL_HEADLINES_SECONDS=int(os.getenv("TOOL_CACHE_TTL_HEADLINES_SECONDS", 120))  # fetch_top_financial_headlines
+    TOOL_CACHE_TTL_SEARCH_SECONDS=int(os.getenv("TOOL_CACHE_TTL_SEARCH_SECONDS", 300))  # search_financial_news
+    TOOL_CACHE_TTL_STOCK_SECONDS=int(os.getenv("TOOL_CACHE_TTL_STOCK_SECONDS", 300))  # fetch_stock_news
+
+    # AI job queue
+    AI_JOB_WORKERS=int(os.getenv("AI_JOB_WORKERS", 4))  # Concurrent jobs per process, 0 disables the workers
+    AI_JOB_POLL_SECONDS=float(os.getenv("AI_JOB_POLL_SECONDS", 2))
+    AI_JOB_LEASE_SECONDS=int(os.getenv("AI_JOB_LEASE_SECONDS", 300))  # Running jobs older than this are retried
+    AI_JOB_MAX_ATTEMPTS=int(os.getenv("AI_JOB_MAX_ATTEMPTS", 2))
+    AI_JOB_RESULT_TTL_SECONDS=int(os.getenv("AI_JOB_RESULT_TTL_SECONDS", 3600))  # Readable by job ID; reused for new submits only within the cache TTL
+
+    # Precomputed market-impact snapshots
+    MARKET_IMPACT_REFRESH_SECONDS=int(os.getenv("MARKET_IMPACT_REFRESH_SECONDS", 300))  # 0 disables the scheduler
+    MARKET_IMPACT_SNAPSHOT_LIMIT=int(os.getenv("MARKET_IMPACT_SNAPSHOT_LIMIT", 20))  # One ranking this long, sliced for smaller limits
+    MARKET_IMPACT_SNAPSHOT_MAX_AGE_SECONDS=int(os.getenv("MARKET_IMPACT_SNAPSHOT_MAX_AGE_SECONDS", 3600))  # Older snapshots are ignored
+    
+    # Named executors for blocking work (app/core/executors.py)
+    EXECUTOR_LLM_WORKERS=int(os.getenv("EXECUTOR_LLM_WORKERS", 8))  # Synchronous LLM SDK calls
+    EXECUTOR_HTTP_WORKERS=int(os.getenv("EXECUTOR_HTTP_WORKERS", 32))  # Blocking upstream HTTP (Yahoo Finance, News API)
+    EXECUTOR_CRYPTO_WORKERS=int(os.getenv("EXECUTOR_CRYPTO_WORKERS", os.cpu_count() or 2))  # Password hashing processes
+    EXECUTOR_CRYPTO_MAX_QUEUE=int(os.getenv("EXECUTOR_CRYPTO_MAX_QUEUE", 64))  # Queued hashes before logins get 503 + Retry-After
     
     # Legacy Gemini support (deprecated)
     GEMINI_API_KEY=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
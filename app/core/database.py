@@ -7,6 +7,11 @@ import certifi
 from app.models.users import User
 from app.models.auth import AuthToken
 from app.models.api_key import ApiKey
+from app.models.news_article import NewsArticle
+from app.models.feed import FeedEntry
+from app.models.ai_job import AIJob
+from app.models.market_impact_snapshot import MarketImpactSnapshot
+from app.models.llm_usage import LLMUsage
 
 MONGO_URI = settings.MONGO_URI
 MONGO_DATABASE = settings.MONGO_DATABASE
@@ -94,7 +99,7 @@ async def init_database():
                 raise e
     
     try:
-        await init_beanie(database=database, document_models=[User , AuthToken, ApiKey], allow_index_dropping=False, recreate_views=False)
+        await init_beanie(database=database, document_models=[User , AuthToken, ApiKey, NewsArticle, FeedEntry, AIJob, MarketImpactSnapshot, LLMUsage], allow_index_dropping=False, recreate_views=False)
         print("Beanie initialized successfully 🍃")
     except Exception as e:
         print("Error initializing Beanie: ", e)
@@ -0,0 +1,41 @@
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Absolute point in time a whole operation must finish by
+
+    Created once per request and passed down, so every model call and tool
+    call gets a timeout derived from the time that is actually left instead
+    of a fixed per-call value.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def near(self, reserve: float) -> bool:
+        """True when less than `reserve` seconds are left"""
+        return self.remaining() <= reserve
+
+    def timeout(self, cap: Optional[float] = None, reserve: float = 0.0) -> float:
+        """
+        Timeout for one step: the time left minus what later steps need, never above `cap`
+
+        Args:
+            cap: Upper bound for the step (e.g. a per-tool timeout)
+            reserve: Seconds kept back for work after this step
+
+        Returns:
+            Timeout in seconds (small but positive, so an expired deadline fails fast)
+        """
+        available = max(self.remaining() - reserve, 0.01)
+        return min(available, cap) if cap is not None else available
@@ -0,0 +1,200 @@
+import asyncio
+import functools
+import math
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException
+from app.core.config import settings
+
+
+def _timed_call(fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    # Runs in the worker (thread or process); returns when it started (wall clock, comparable across processes)
+    started = time.time()
+    return started, fn(*args, **kwargs)
+
+
+class ExecutorBusy(HTTPException):
+    """The executor's queue is full; the caller should retry later"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = max(int(math.ceil(retry_after)), 1)
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy ({name}), please retry shortly.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+class NamedExecutor:
+    """
+    Thread or process pool for one class of blocking work, with metrics
+
+    Tracks queue depth (submitted, not started), active workers, and how long
+    tasks waited for a worker and ran. Pools are created on first use, so
+    unused ones (e.g. the process pool) cost nothing. With max_queue set,
+    submissions beyond that many queued tasks are rejected with ExecutorBusy.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: Optional[int] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max_queue
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._max_queued = 0
+        self._recent_waits = deque(maxlen=500)
+        self._stats = {
+            "submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+            "wait_seconds": 0.0, "max_wait_seconds": 0.0, "run_seconds": 0.0,
+        }
+
+    def _executor(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    # spawn, not fork: the server process has threads (event loop, pools) that fork would copy mid-flight
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-pool")
+            return self._pool
+
+    def _discard(self, broken: Executor) -> None:
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _queued_locked(self) -> int:
+        return max(self._pending - self.max_workers, 0)
+
+    def _expected_wait_locked(self) -> float:
+        # Queued tasks drain max_workers at a time at the average run time
+        completed = self._stats["completed"]
+        avg_run = self._stats["run_seconds"] / completed if completed else 1.0
+        return (self._queued_locked() + 1) / self.max_workers * avg_run
+
+    def _done(self, submitted_at: float, future: Future) -> None:
+        finished = time.time()
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+                return
+            started, _ = future.result()
+            wait = max(started - submitted_at, 0.0)
+            self._stats["completed"] += 1
+            self._stats["wait_seconds"] += wait
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait)
+            self._stats["run_seconds"] += finished - started
+            self._recent_waits.append(wait)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submit fn(*args, **kwargs); the future's result is (started_at, value)"""
+        executor = self._executor()
+        submitted_at = time.time()
+        with self._lock:
+            if self.max_queue is not None and self._queued_locked() >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise ExecutorBusy(self.name, self._expected_wait_locked())
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._max_queued = max(self._max_queued, self._queued_locked())
+        try:
+            try:
+                future = executor.submit(_timed_call, fn, args, kwargs)
+            except BrokenExecutor:
+                # A worker process died (e.g. killed by the OS); replace the pool once
+                self._discard(executor)
+                future = self._executor().submit(_timed_call, fn, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(functools.partial(self._done, submitted_at))
+        return future
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking function on this pool without blocking the event loop
+
+        Args:
+            fn: Function to call (picklable, for the process pool)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The function's return value
+
+        Raises:
+            ExecutorBusy: The queue is full (max_queue)
+        """
+        _, value = await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._stats["completed"]
+            waits = sorted(self._recent_waits)
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "started": self._pool is not None,
+                "active": min(self._pending, self.max_workers),
+                "queued": self._queued_locked(),
+                "max_queued": self._max_queued,
+                "submitted": self._stats["submitted"],
+                "completed": completed,
+                "failed": self._stats["failed"],
+                "rejected": self._stats["rejected"],
+                "avg_wait_ms": round(self._stats["wait_seconds"] / completed * 1000, 2) if completed else 0.0,
+                "p95_wait_ms": round(waits[min(int(len(waits) * 0.95), len(waits) - 1)] * 1000, 2) if waits else 0.0,
+                "max_wait_ms": round(self._stats["max_wait_seconds"] * 1000, 2),
+                "avg_run_ms": round(self._stats["run_seconds"] / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class Executors:
+    """
+    Named pools so one class of blocking work can't starve another
+
+    - llm: synchronous LLM SDK calls (the agent itself runs on the async SDKs)
+    - http: blocking upstream HTTP (requests-based Yahoo Finance / News API clients)
+    - crypto: process pool for password hashing (bcrypt), bounded queue for login storms
+
+    Story clustering stays inline: it takes a few ms per page of headlines,
+    less than a process pool's queueing and pickling overhead.
+    """
+
+    def __init__(self):
+        self.llm = NamedExecutor("llm", "thread", settings.EXECUTOR_LLM_WORKERS)
+        self.http = NamedExecutor("http", "thread", settings.EXECUTOR_HTTP_WORKERS)
+        self.crypto = NamedExecutor(
+            "crypto", "process", settings.EXECUTOR_CRYPTO_WORKERS, max_queue=settings.EXECUTOR_CRYPTO_MAX_QUEUE
+        )
+
+    def all(self) -> Dict[str, NamedExecutor]:
+        return {executor.name: executor for executor in (self.llm, self.http, self.crypto)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: executor.stats() for name, executor in self.all().items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        for executor in self.all().values():
+            executor.shutdown(wait=wait)
+
+
+executors = Executors()
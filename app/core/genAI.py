@@ -1,5 +1,25 @@
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 from app.core.config import settings
+from app.core.llm_governor import llm_governor, estimate_tokens
+from app.core.usage_meter import usage_meter
+
+@lru_cache(maxsize=None)
+def get_genai_client(api_key: str):
+    """
+    Long-lived google-genai client (one per API key), reused for every call
+    so connections are pooled instead of being set up per request
+    """
+    try:
+        import google.genai as genai
+    except ImportError:
+        raise ImportError(
+            "google-genai package not found. Install it with: pip install google-genai"
+        )
+    return genai.Client(api_key=api_key)
+
 
 class GenAI:
     def __init__(self):
@@ -12,6 +32,18 @@ class GenAI:
     def get_model(self):
         return self.model
         
+    @staticmethod
+    def _usage_counts(usage_metadata) -> Dict[str, int]:
+        # Gemini usage in the same shape as Claude's (cached prompt tokens count as cache reads)
+        prompt_tokens = getattr(usage_metadata, "prompt_token_count", 0) or 0
+        cached_tokens = getattr(usage_metadata, "cached_content_token_count", 0) or 0
+        return {
+            "input_tokens": prompt_tokens - cached_tokens,
+            "output_tokens": getattr(usage_metadata, "candidates_token_count", 0) or 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": cached_tokens,
+        }
+    
     def get_llm(self):
         """Get a basic LLM instance without tools"""
         return ChatGoogleGenerativeAI(
@@ -32,25 +64,25 @@ class GenAI:
         Returns:
             Generated text content
         """
-        try:
-            import google.genai as genai
-        except ImportError:
-            raise ImportError(
-                "google-genai package not found. Install it with: pip install google-genai"
-            )
+        # Shared client with pooled connections
+        client = get_genai_client(self.api_key)
         
-        # Create client with API key
-        client = genai.Client(api_key=self.api_key)
-        
-        # Generate content using the client
-        try:
-            response = client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config={"temperature": temperature}
-            )
-        except Exception as gen_error:
-            raise Exception(f"Failed to generate content with model '{self.model}': {str(gen_error)}")
+        # Generate content using the client (through the shared LLM governor)
+        with llm_governor.limit_sync(estimate_tokens(prompt) + 2048) as permit:
+            started = time.monotonic()
+            try:
+                response = client.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config={"temperature": temperature}
+                )
+            except Exception as gen_error:
+                raise Exception(f"Failed to generate content with model '{self.model}': {str(gen_error)}")
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                counts = self._usage_counts(usage)
+                usage_meter.record_call(self.model, counts, time.monotonic() - started)
+                permit.used(counts["input_tokens"] + counts["output_tokens"])
         
         # Extract text from response
         if hasattr(response, 'text') and response.text:
@@ -65,3 +97,55 @@ class GenAI:
         
         # Fallback to string representation
         return str(response)
+
+    async def stream_content_async(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text through the shared client and the LLM governor
+
+        Args:
+            prompt: User prompt
+            system: Optional system instruction
+            json_schema: When given, the output is JSON matching this schema
+            max_tokens: Maximum output tokens
+            temperature: Sampling temperature
+            timeout: Request timeout in seconds (time queued for a slot is deducted)
+            model: Model override (default: GEMINI_MODEL)
+
+        Yields:
+            Text chunks as they are generated
+        """
+        config: Dict[str, Any] = {"temperature": temperature, "max_output_tokens": max_tokens}
+        if system:
+            config["system_instruction"] = system
+        if json_schema:
+            config["response_mime_type"] = "application/json"
+            config["response_json_schema"] = json_schema
+
+        client = get_genai_client(self.api_key)
+        queued_at = time.monotonic()
+        async with llm_governor.limit(estimate_tokens(prompt, system, json_schema) + max_tokens) as permit:
+            if timeout is not None:
+                config["http_options"] = {"timeout": int(max(timeout - (time.monotonic() - queued_at), 0.01) * 1000)}
+            started = time.monotonic()
+            usage = None
+            async for chunk in await client.aio.models.generate_content_stream(
+                model=model or self.model,
+                contents=prompt,
+                config=config
+            ):
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if chunk.text:
+                    yield chunk.text
+            if usage is not None:
+                counts = self._usage_counts(usage)
+                usage_meter.record_call(model or self.model, counts, time.monotonic() - started)
+                permit.used(counts["input_tokens"] + counts["output_tokens"])
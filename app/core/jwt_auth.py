@@ -5,6 +5,8 @@ This is the native authentication method for the web application.
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Dict, Any
+from app.core.auth_user_cache import auth_user_cache
+from app.core.llm_governor import set_request_context
 from app.core.security import security_manager
 from app.repositories.users_repository import UsersRepository
 
@@ -39,8 +41,8 @@ async def authenticate_jwt_only(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
     
-    users_repo = get_users_repository()
-    user = await users_repo.find_by_id(user_id)
+    # Auth fields only, from the in-process cache when fresh
+    user = await auth_user_cache.get(user_id, get_users_repository())
     
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
@@ -72,5 +74,7 @@ async def check_ai_access_jwt_only(
             detail="Your AI access has been blocked. Please contact an administrator."
         )
     
+    # Queue priority and fairness key for LLM calls made by this request
+    set_request_context("interactive", auth_result["user_id"], user_id=auth_result["user_id"])
     return auth_result
 
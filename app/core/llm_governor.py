@@ -0,0 +1,311 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.deadline import Deadline
+
+# Who the current LLM work is for; set by the AI auth dependencies, inherited by tasks they start
+request_context: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "llm_request_context", default={"priority": "background", "key": "system"}
+)
+
+# Share of the queue each priority class gets relative to the others
+PRIORITY_WEIGHTS = {"interactive": 4.0, "api": 2.0, "background": 1.0}
+
+
+def set_request_context(priority: str, key: str, user_id: Optional[str] = None, api_key_id: Optional[str] = None) -> None:
+    # key is the fairness flow (user or API key); user_id/api_key_id attribute usage
+    request_context.set({"priority": priority, "key": key, "user_id": user_id, "api_key_id": api_key_id})
+
+
+def estimate_tokens(*parts: Any) -> int:
+    # Rough prompt size (~4 chars per token) for budgeting before the call
+    return sum(len(str(part)) for part in parts if part) // 4 + 1
+
+
+class LLMOverloaded(HTTPException):
+    """Expected wait for an LLM slot is longer than the request can wait"""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = max(int(math.ceil(retry_after)), 1)
+        super().__init__(
+            status_code=429,
+            detail="AI capacity is busy, please retry shortly.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+class _Waiter:
+    __slots__ = ("priority", "wake", "granted", "cancelled")
+
+    def __init__(self, priority: str, wake):
+        self.priority = priority
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+
+
+class Permit:
+    """One granted LLM call; report actual token usage so the budget is corrected"""
+
+    def __init__(self, governor: "LLMGovernor", estimated_tokens: int):
+        self.governor = governor
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def used(self, tokens: int) -> None:
+        self.actual_tokens = tokens
+
+
+class LLMGovernor:
+    """
+    Process-wide admission control for LLM calls (Claude and Gemini)
+
+    - A concurrency cap: at most max_concurrency calls in flight.
+    - A tokens-per-minute bucket: each call reserves its estimated tokens,
+      corrected with actual usage afterwards; calls wait while the bucket is in debt.
+    - A weighted fair queue: waiters are ordered by virtual finish time, so each
+      caller (user / API key) gets a fair share and interactive (JWT) traffic is
+      weighted above API-key and background traffic without starving them.
+    - Backpressure: when the expected wait exceeds the caller's deadline the call
+      is rejected immediately with LLMOverloaded (HTTP 429 + Retry-After).
+    """
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int, max_wait_seconds: float):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queue: List = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[tuple, float] = {}
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        # Moving average of how long a call holds its slot, for wait estimates
+        self._avg_call_seconds = 5.0
+        self._stats = {"granted": 0, "queued": 0, "rejected": 0, "wait_seconds": 0.0}
+        self._by_priority = {priority: {"granted": 0, "rejected": 0} for priority in PRIORITY_WEIGHTS}
+
+    # Token bucket
+
+    def _refill_locked(self) -> None:
+        now = time.monotonic()
+        rate = self.tokens_per_minute / 60.0
+        self._tokens = min(self._tokens + (now - self._refilled_at) * rate, float(self.tokens_per_minute))
+        self._refilled_at = now
+
+    def _token_delay_locked(self) -> float:
+        # Seconds until the bucket is out of debt
+        return -self._tokens / (self.tokens_per_minute / 60.0) if self._tokens < 0 else 0.0
+
+    # Queue
+
+    def expected_wait(self) -> float:
+        """Rough seconds a new call would wait for a slot and for the token budget"""
+        with self._lock:
+            self._refill_locked()
+            return self._expected_wait_locked()
+
+    def _expected_wait_locked(self) -> float:
+        waiting = len([entry for entry in self._queue if not entry[2].cancelled])
+        slot_wait = 0.0
+        if self._active >= self.max_concurrency:
+            slot_wait = (waiting + 1) / self.max_concurrency * self._avg_call_seconds
+        return slot_wait + self._token_delay_locked()
+
+    def _admit_locked(self, priority: str, deadline: Optional[Deadline]) -> None:
+        limit = deadline.remaining() if deadline is not None else self.max_wait_seconds
+        wait = self._expected_wait_locked()
+        if wait > limit:
+            self._stats["rejected"] += 1
+            self._by_priority[priority]["rejected"] += 1
+            raise LLMOverloaded(wait)
+
+    def admit(self, deadline: Optional[Deadline] = None) -> None:
+        """Fail fast (429) when the expected wait exceeds the deadline, e.g. before starting an SSE response"""
+        priority = self._context()["priority"]
+        with self._lock:
+            self._refill_locked()
+            self._admit_locked(priority, deadline)
+
+    def _context(self) -> Dict[str, str]:
+        context = request_context.get()
+        priority = context.get("priority", "background")
+        if priority not in PRIORITY_WEIGHTS:
+            priority = "background"
+        return {"priority": priority, "key": context.get("key", "system")}
+
+    def _enqueue_locked(self, context: Dict[str, str], waiter: _Waiter) -> None:
+        # Start-time fair queueing: a caller's next request is tagged after its previous one
+        flow = (context["priority"], context["key"])
+        start = max(self._virtual_time, self._finish_tags.get(flow, 0.0))
+        finish = start + 1.0 / PRIORITY_WEIGHTS[context["priority"]]
+        self._finish_tags[flow] = finish
+        heapq.heappush(self._queue, (finish, next(self._sequence), waiter))
+        self._stats["queued"] += 1
+
+    def _grant_locked(self, priority: str) -> None:
+        self._active += 1
+        self._stats["granted"] += 1
+        self._by_priority[priority]["granted"] += 1
+
+    def _dispatch_locked(self) -> None:
+        # Hand free slots to the waiters with the smallest virtual finish tags
+        while self._queue and self._active < self.max_concurrency:
+            tag, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self._virtual_time = max(self._virtual_time, tag)
+            waiter.granted = True
+            self._grant_locked(waiter.priority)
+            waiter.wake()
+        if not self._queue and self._active == 0:
+            # Idle: forget old tags so they don't grow without bound
+            self._finish_tags.clear()
+
+    def _try_acquire(self, context: Dict[str, str], deadline: Optional[Deadline], wake) -> Optional[_Waiter]:
+        # Returns None when a slot was granted right away, otherwise the queued waiter
+        with self._lock:
+            self._refill_locked()
+            self._admit_locked(context["priority"], deadline)
+            self._dispatch_locked()
+            if self._active < self.max_concurrency and not self._queue:
+                self._grant_locked(context["priority"])
+                return None
+            waiter = _Waiter(context["priority"], wake)
+            self._enqueue_locked(context, waiter)
+            return waiter
+
+    def _release(self, held_seconds: float, token_correction: int) -> None:
+        with self._lock:
+            self._active -= 1
+            self._tokens -= token_correction
+            if held_seconds:
+                self._avg_call_seconds = 0.8 * self._avg_call_seconds + 0.2 * held_seconds
+            self._dispatch_locked()
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        # Returns True when the waiter had already been granted a slot (caller must release it)
+        with self._lock:
+            waiter.cancelled = True
+            return waiter.granted
+
+    def _debit(self, tokens: int) -> float:
+        with self._lock:
+            self._refill_locked()
+            self._tokens -= tokens
+            return self._token_delay_locked()
+
+    @asynccontextmanager
+    async def limit(self, estimated_tokens: int, deadline: Optional[Deadline] = None):
+        """
+        Hold an LLM slot for the duration of an async call
+
+        Args:
+            estimated_tokens: Expected prompt + completion tokens
+            deadline: Deadline of the request; without one, LLM_QUEUE_MAX_WAIT_SECONDS applies
+
+        Raises:
+            LLMOverloaded: The expected or actual wait exceeds the deadline
+        """
+        context = self._context()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = self._try_acquire(
+            context, deadline,
+            lambda: loop.call_soon_threadsafe(lambda: future.done() or future.set_result(True)),
+        )
+        started = time.monotonic()
+        if waiter is not None:
+            timeout = deadline.remaining() if deadline is not None else self.max_wait_seconds
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+            except BaseException as e:
+                if self._abandon(waiter):
+                    self._release(0.0, 0)
+                if isinstance(e, asyncio.TimeoutError):
+                    with self._lock:
+                        self._stats["rejected"] += 1
+                    raise LLMOverloaded(self.expected_wait())
+                raise
+
+        permit = Permit(self, estimated_tokens)
+        granted_at = time.monotonic()
+        try:
+            with self._lock:
+                self._stats["wait_seconds"] += granted_at - started
+            delay = self._debit(estimated_tokens)
+            if delay:
+                if deadline is not None and delay > deadline.remaining():
+                    # Refund the reservation, the call is not made
+                    permit.used(0)
+                    raise LLMOverloaded(delay)
+                await asyncio.sleep(delay)
+            yield permit
+        finally:
+            correction = (permit.actual_tokens - estimated_tokens) if permit.actual_tokens is not None else 0
+            self._release(time.monotonic() - granted_at, correction)
+
+    @contextmanager
+    def limit_sync(self, estimated_tokens: int, deadline: Optional[Deadline] = None):
+        """Blocking variant of limit() for synchronous clients"""
+        context = self._context()
+        event = threading.Event()
+        waiter = self._try_acquire(context, deadline, event.set)
+        started = time.monotonic()
+        if waiter is not None:
+            timeout = deadline.remaining() if deadline is not None else self.max_wait_seconds
+            if not event.wait(timeout):
+                if not self._abandon(waiter):
+                    with self._lock:
+                        self._stats["rejected"] += 1
+                    raise LLMOverloaded(self.expected_wait())
+                # Granted just as the wait timed out, use the slot
+
+        permit = Permit(self, estimated_tokens)
+        granted_at = time.monotonic()
+        try:
+            with self._lock:
+                self._stats["wait_seconds"] += granted_at - started
+            delay = self._debit(estimated_tokens)
+            if delay:
+                if deadline is not None and delay > deadline.remaining():
+                    # Refund the reservation, the call is not made
+                    permit.used(0)
+                    raise LLMOverloaded(delay)
+                time.sleep(delay)
+            yield permit
+        finally:
+            correction = (permit.actual_tokens - estimated_tokens) if permit.actual_tokens is not None else 0
+            self._release(time.monotonic() - granted_at, correction)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill_locked()
+            return {
+                "active": self._active,
+                "waiting": len([entry for entry in self._queue if not entry[2].cancelled]),
+                "max_concurrency": self.max_concurrency,
+                "tokens_available": int(self._tokens),
+                "tokens_per_minute": self.tokens_per_minute,
+                "avg_call_seconds": round(self._avg_call_seconds, 2),
+                "expected_wait_seconds": round(self._expected_wait_locked(), 2),
+                **{name: round(value, 2) if isinstance(value, float) else value for name, value in self._stats.items()},
+                "by_priority": {priority: dict(counts) for priority, counts in self._by_priority.items()},
+            }
+
+
+llm_governor = LLMGovernor(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    max_wait_seconds=settings.LLM_QUEUE_MAX_WAIT_SECONDS,
+)
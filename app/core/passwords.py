@@ -0,0 +1,150 @@
+import math
+import statistics
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.executors import NamedExecutor, executors
+
+# passlib's default cost; also the floor: tuning can only raise the cost, never weaken new hashes
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+# Worker functions: run in the crypto process pool, so they take plain arguments and return plain values
+
+@lru_cache(maxsize=8)
+def _context(rounds: int) -> CryptContext:
+    # Hashes below the current cost are reported as needing an update (upgraded on the next login)
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def hash_password(plain_password: str, rounds: int) -> str:
+    return _context(rounds).hash(plain_password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _context(DEFAULT_BCRYPT_ROUNDS).verify(plain_password, hashed_password)
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost of a bcrypt hash ($2b$<rounds>$...), None when it isn't one"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def verify_and_update(plain_password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """(matches, new hash at `rounds` when the stored one is weaker, else None)"""
+    matches, new_hash = _context(rounds).verify_and_update(plain_password, hashed_password)
+    stored_rounds = hash_rounds(hashed_password)
+    if new_hash and stored_rounds is not None and stored_rounds >= rounds:
+        # Never "upgrade" to a cost at or below the stored one
+        new_hash = None
+    return matches, new_hash
+
+
+def time_hash(rounds: int, samples: int = 3) -> float:
+    """Median seconds for one bcrypt hash at `rounds`"""
+    context = _context(rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("cost-calibration")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification on the crypto process pool
+
+    Each hash takes ~100-300ms of CPU; running it in worker processes keeps
+    the event loop serving other requests and uses every core during a login
+    storm. The bcrypt cost is tuned once at startup: it starts at 12 (passlib's
+    default, never lower) and is raised while a hash stays under
+    PASSWORD_HASH_TARGET_MS on this hardware. Stored hashes with a lower cost
+    are transparently upgraded when their owner logs in; stronger ones are kept.
+    """
+
+    def __init__(self, executor: NamedExecutor, target_ms: int, min_rounds: int, max_rounds: int, fixed_rounds: Optional[int] = None):
+        self.executor = executor
+        self.target_ms = target_ms
+        if min(min_rounds, fixed_rounds or DEFAULT_BCRYPT_ROUNDS) < DEFAULT_BCRYPT_ROUNDS:
+            print(f"⚠️ bcrypt cost below {DEFAULT_BCRYPT_ROUNDS} requested, using {DEFAULT_BCRYPT_ROUNDS} as the floor")
+        self.min_rounds = max(min_rounds, DEFAULT_BCRYPT_ROUNDS)
+        self.max_rounds = max(max_rounds, self.min_rounds)
+        self.rounds = max(fixed_rounds or DEFAULT_BCRYPT_ROUNDS, DEFAULT_BCRYPT_ROUNDS)
+        self.fixed = fixed_rounds is not None
+        self.measured_ms: Optional[float] = None
+        self._stats = {"hashed": 0, "verified": 0, "rehashed": 0}
+
+    def rounds_for(self, seconds_at_min_rounds: float) -> int:
+        # Every extra round doubles the cost
+        budget = self.target_ms / 1000
+        if seconds_at_min_rounds <= 0:
+            return self.max_rounds
+        extra = math.floor(math.log2(budget / seconds_at_min_rounds)) if budget > seconds_at_min_rounds else 0
+        return min(max(self.min_rounds + extra, self.min_rounds), self.max_rounds)
+
+    async def autotune(self) -> int:
+        """
+        Pick the bcrypt cost for this hardware (also starts the worker processes)
+
+        Returns:
+            The bcrypt rounds used for new hashes
+        """
+        if self.fixed:
+            print(f"🔐 bcrypt cost fixed at {self.rounds}")
+            return self.rounds
+        try:
+            self.rounds = self.rounds_for(await self.executor.run(time_hash, self.min_rounds))
+            self.measured_ms = round(await self.executor.run(time_hash, self.rounds, 1) * 1000, 1)
+            print(f"🔐 bcrypt cost {self.rounds} (~{self.measured_ms}ms per hash, target {self.target_ms}ms)")
+        except Exception as e:
+            print(f"⚠️ bcrypt cost tuning failed, using {self.rounds}: {e}")
+        return self.rounds
+
+    async def hash(self, plain_password: str) -> str:
+        self._stats["hashed"] += 1
+        return await self.executor.run(hash_password, plain_password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        self._stats["verified"] += 1
+        return await self.executor.run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and rehash it when the stored hash uses a lower cost than the current one
+
+        Args:
+            plain_password: Password as entered
+            hashed_password: Stored hash
+
+        Returns:
+            (matches, new hash to store or None)
+        """
+        self._stats["verified"] += 1
+        matches, new_hash = await self.executor.run(verify_and_update, plain_password, hashed_password, self.rounds)
+        if new_hash:
+            self._stats["rehashed"] += 1
+        return matches, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rounds": self.rounds,
+            "fixed": self.fixed,
+            "target_ms": self.target_ms,
+            "measured_ms": self.measured_ms,
+            **self._stats,
+        }
+
+
+password_hasher = PasswordHasher(
+    executors.crypto,
+    target_ms=settings.PASSWORD_HASH_TARGET_MS,
+    min_rounds=settings.PASSWORD_BCRYPT_MIN_ROUNDS,
+    max_rounds=settings.PASSWORD_BCRYPT_MAX_ROUNDS,
+    fixed_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from app.core.config import settings
+
+# Query parameters / JSON fields never written to a cassette
+SECRET_PARAMS = {"apiKey", "api_key", "key"}
+# Request fields that change between otherwise identical runs (ignored when matching)
+VOLATILE_FIELDS = {"metadata", "stream", "cache_control", "id", "tool_use_id"}
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _strip_volatile(item) for key, item in value.items() if key not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def request_fingerprint(service: str, path: str, params: Dict[str, Any], body: Any) -> str:
+    """Stable key of a request: service, path, query and JSON body without secrets and volatile fields"""
+    canonical = json.dumps(
+        {
+            "service": service,
+            "path": path,
+            "params": {key: value for key, value in sorted(params.items()) if key not in SECRET_PARAMS},
+            "body": _strip_volatile(body),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+
+def _request_body(request: httpx.Request) -> Any:
+    content = request.content
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content.decode("utf-8", errors="replace")
+
+
+class Cassette:
+    """Append-only JSONL file of recorded request/response pairs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as cassette:
+                cassette.write(line + "\n")
+
+    @staticmethod
+    def load(path: str) -> List[Dict[str, Any]]:
+        entries = []
+        with open(path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    entries.append(json.loads(line))
+        return entries
+
+
+class _Recording:
+    """One exchange being recorded; written once the response body has been read or closed"""
+
+    def __init__(self, cassette: Cassette, service: str, request: httpx.Request, started: float):
+        self.cassette = cassette
+        self.started = started
+        self.first_byte_ms: Optional[int] = None
+        self.chunks: List[bytes] = []
+        self.written = False
+        self.path = request.url.path
+        self.params = dict(request.url.params)
+        self.body = _request_body(request)
+        self.entry = {
+            "service": service,
+            "method": request.method,
+            "path": self.path,
+            "params": {key: value for key, value in self.params.items() if key not in SECRET_PARAMS},
+            "request": self.body,
+            "fingerprint": request_fingerprint(service, self.path, self.params, self.body),
+        }
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.first_byte_ms is None:
+            self.first_byte_ms = int((time.monotonic() - self.started) * 1000)
+        self.chunks.append(data)
+        return data
+
+    def finish(self, response: httpx.Response) -> None:
+        if self.written:
+            return
+        self.written = True
+        self.cassette.append({
+            **self.entry,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", ""),
+            "body": b"".join(self.chunks).decode("utf-8", errors="replace"),
+            "first_byte_ms": self.first_byte_ms,
+            "elapsed_ms": int((time.monotonic() - self.started) * 1000),
+            "recorded_at": time.time(),
+        })
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, recording: _Recording, finish: Callable[[], None]):
+        self._stream = stream
+        self._recording = recording
+        self._finish = finish
+
+    def __iter__(self):
+        for data in self._stream:
+            yield self._recording.chunk(data)
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+
+class _AsyncRecordingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, recording: _Recording, finish: Callable[[], None]):
+        self._stream = stream
+        self._recording = recording
+        self._finish = finish
+
+    async def __aiter__(self):
+        async for data in self._stream:
+            yield self._recording.chunk(data)
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    httpx transport that passes requests through and records each exchange
+
+    Streamed bodies are teed chunk by chunk (the caller still sees tokens as
+    they arrive); the entry is written when the response is closed, together
+    with time-to-first-byte and total time so replays can reproduce latency.
+    """
+
+    def __init__(self, service: str, cassette: Cassette, wrapped: Optional[httpx.BaseTransport] = None):
+        self.service = service
+        self.cassette = cassette
+        self._wrapped = wrapped or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        recording = _Recording(self.cassette, self.service, request, time.monotonic())
+        response = self._wrapped.handle_request(request)
+        recorded = httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            extensions=response.extensions,
+            stream=_RecordingStream(response.stream, recording, lambda: recording.finish(recorded)),
+        )
+        return recorded
+
+    def close(self) -> None:
+        self._wrapped.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async variant of RecordingTransport"""
+
+    def __init__(self, service: str, cassette: Cassette, wrapped: Optional[httpx.AsyncBaseTransport] = None):
+        self.service = service
+        self.cassette = cassette
+        self._wrapped = wrapped or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recording = _Recording(self.cassette, self.service, request, time.monotonic())
+        response = await self._wrapped.handle_async_request(request)
+        recorded = httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            extensions=response.extensions,
+            stream=_AsyncRecordingStream(response.stream, recording, lambda: recording.finish(recorded)),
+        )
+        return recorded
+
+    async def aclose(self) -> None:
+        await self._wrapped.aclose()
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def active_cassette() -> Optional[Cassette]:
+    """Cassette shared by all recording transports, None unless HTTP_RECORD_PATH is set"""
+    global _cassette
+    if not settings.HTTP_RECORD_PATH:
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(settings.HTTP_RECORD_PATH)
+            print(f"🎙️ Recording upstream HTTP exchanges to {settings.HTTP_RECORD_PATH}")
+        return _cassette
+
+
+def recording_transport(service: str, **transport_options) -> Optional[RecordingTransport]:
+    # transport_options (verify, limits, ...) go to the wrapped transport; a client ignores its own once a transport is given
+    cassette = active_cassette()
+    return RecordingTransport(service, cassette, httpx.HTTPTransport(**transport_options)) if cassette else None
+
+
+def async_recording_transport(service: str, **transport_options) -> Optional[AsyncRecordingTransport]:
+    cassette = active_cassette()
+    return AsyncRecordingTransport(service, cassette, httpx.AsyncHTTPTransport(**transport_options)) if cassette else None
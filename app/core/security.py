@@ -1,9 +1,9 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt, ExpiredSignatureError, JWSError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.passwords import password_hasher, hash_password, verify_password
 import requests
 
 
@@ -14,7 +14,6 @@ class SecurityManager:
         self.algorithm = settings.ALGORITHM or "HS256"
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         self.refresh_token_expire_days = settings.REFRESH_TOKEN_EXPIRE_DAYS
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         
         if not self.secret_key:
             raise ValueError("SECRET_KEY is not set in environment variables")
@@ -22,10 +21,21 @@ class SecurityManager:
             raise ValueError("REFRESH_SECRET_KEY is not set in environment variables")
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
 
     def get_password_hash(self, plain_password: str) -> str:
-        return self.pwd_context.hash(plain_password)
+        return hash_password(plain_password, password_hasher.rounds)
+
+    # bcrypt takes ~100-300ms of CPU; async callers use these so it runs on the crypto process pool
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
+
+    async def verify_and_update_password_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        # Also returns a new hash when the stored one predates the current bcrypt cost
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+    async def get_password_hash_async(self, plain_password: str) -> str:
+        return await password_hasher.hash(plain_password)
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
@@ -0,0 +1,145 @@
+import re
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9$]+")
+
+# Filler words that don't change what a query asks for
+QUERY_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "at", "by", "from", "about",
+    "is", "are", "was", "be", "it", "its", "this", "that", "what", "whats", "what's", "which", "how",
+    "me", "my", "i", "we", "us", "you", "your", "please", "can", "could", "would", "tell", "show", "give",
+    "find", "get", "any", "some", "there", "s", "do", "does", "going", "regarding", "re",
+}
+
+
+class HashingVectorizer:
+    """Stateless bag-of-words embedding: hashed, signed token counts, L2-normalized"""
+
+    def __init__(self, dimensions: int = 1024, stopwords: Iterable[str] = QUERY_STOPWORDS):
+        self.dimensions = dimensions
+        self.stopwords = set(stopwords)
+
+    def tokens(self, text: str) -> List[str]:
+        return [token for token in _TOKEN_RE.findall(text.lower().replace("'", "")) if token not in self.stopwords]
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in self.tokens(text):
+            digest = zlib.crc32(token.encode("utf-8"))
+            # One hash bit picks the sign so collisions tend to cancel out
+            vector[digest % self.dimensions] += 1.0 if (digest >> 31) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Maps free-text queries to the cache key of a semantically equivalent earlier query
+
+    Values stay in the regular result cache; this index only finds which
+    existing key a new query can reuse. Queries are embedded locally with a
+    hashing vectorizer and compared by cosine similarity against an in-memory
+    matrix. An optional entity function (e.g. ticker tagging) must return the
+    same entities for both queries, so "Tesla news" never matches "Ford news".
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        max_entries: int = 2000,
+        vectorizer: Optional[HashingVectorizer] = None,
+        entity_fn: Optional[Callable[[str], Iterable[str]]] = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self.entity_fn = entity_fn
+        # Ring buffer of query vectors, the oldest slot is overwritten when full
+        self._vectors = np.zeros((max_entries, self.vectorizer.dimensions), dtype=np.float32)
+        self._keys: List[Optional[str]] = [None] * max_entries
+        self._entities: List[frozenset] = [frozenset()] * max_entries
+        self._slots: Dict[str, int] = {}
+        self._next_slot = 0
+        self._used = 0
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+
+    def _entities_for(self, text: str) -> frozenset:
+        return frozenset(self.entity_fn(text)) if self.entity_fn else frozenset()
+
+    def lookup(self, text: str, is_fresh: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Find the cache key of the most similar indexed query
+
+        Args:
+            text: Incoming query
+            is_fresh: Optional check that the matched key still has a cached value;
+                stale keys are dropped from the index and skipped
+
+        Returns:
+            Matching cache key, or None when nothing passes the threshold
+        """
+        vector = self.vectorizer.embed(text)
+        entities = self._entities_for(text)
+        with self._lock:
+            self._lookups += 1
+            if not self._slots or not vector.any():
+                return None
+            # Empty slots are zero vectors and never pass the threshold
+            similarities = self._vectors[: self._used] @ vector
+            candidates = np.flatnonzero(similarities >= self.threshold)
+            for slot in candidates[np.argsort(-similarities[candidates], kind="stable")]:
+                key = self._keys[slot]
+                if key is None or self._entities[slot] != entities:
+                    continue
+                if is_fresh is not None and not is_fresh(key):
+                    self._remove_locked(key)
+                    continue
+                self._hits += 1
+                return key
+        return None
+
+    def add(self, text: str, key: str) -> None:
+        """Index a query under the cache key its result was stored with"""
+        vector = self.vectorizer.embed(text)
+        if not vector.any():
+            return
+        entities = self._entities_for(text)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % self.max_entries
+                self._used = max(self._used, slot + 1)
+                evicted = self._keys[slot]
+                if evicted is not None:
+                    del self._slots[evicted]
+            self._vectors[slot] = vector
+            self._keys[slot] = key
+            self._entities[slot] = entities
+            self._slots[key] = slot
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key: str) -> None:
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._vectors[slot] = 0.0
+            self._keys[slot] = None
+            self._entities[slot] = frozenset()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._slots),
+                "threshold": self.threshold,
+                "lookups": self._lookups,
+                "hits": self._hits,
+                "hit_ratio": round(self._hits / self._lookups, 4) if self._lookups else 0.0,
+            }
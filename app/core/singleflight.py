@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution
+
+    The first caller starts the work as a task; callers arriving while it is
+    in flight await the same task and get the same result (or exception).
+    Callers are shielded from each other: a cancelled caller (e.g. a client
+    that disconnected) does not cancel the shared work.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._calls = 0
+        self._shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key at a time
+
+        Args:
+            key: Deduplication key (normalize it before calling)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of the single shared execution
+        """
+        self._calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self._shared += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._tasks
+
+    def join(self, key: str) -> Optional[Awaitable[Any]]:
+        """Awaitable for an in-flight call with this key, or None when nothing is running"""
+        task = self._tasks.get(key)
+        if task is None:
+            return None
+        self._calls += 1
+        self._shared += 1
+        return asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller has gone away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._tasks),
+            "calls": self._calls,
+            "shared": self._shared,
+        }
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.llm_governor import request_context
+from app.core.singleflight import SingleFlight
+from app.repositories.llm_usage_repository import LLMUsageRepository, USAGE_COUNTERS
+
+
+def _hour(now: datetime) -> datetime:
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+def _month_start(now: datetime) -> datetime:
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def metered_tokens(counts: Dict[str, int]) -> int:
+    # Tokens counted against quotas; cache reads are excluded (billed at a fraction of input)
+    return counts.get("input_tokens", 0) + counts.get("cache_creation_input_tokens", 0) + counts.get("output_tokens", 0)
+
+
+class UsageMeter:
+    """
+    In-memory LLM usage counters attributed to the current user / API key
+
+    Calls are recorded from ClaudeAI and GenAI (thread-safe, no I/O) and
+    flushed periodically to hourly LLMUsage buckets with one bulk write.
+    Month-to-date tokens per API key are kept in memory so quotas can be
+    enforced on every request without a query: the flushed total (all
+    processes) is re-read from Mongo every LLM_QUOTA_REFRESH_SECONDS and this
+    process's own calls are added as they happen. Usage of other processes
+    therefore counts once they flushed and this one refreshed, so a key can
+    overshoot its quota by what the other workers use in that window.
+    """
+
+    RELOAD_ATTEMPTS = 3  # The last attempt is kept even if a flush overlapped it
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple, Dict[str, int]] = {}
+        self._month_to_date: Dict[str, Dict[str, Any]] = {}
+        # (flushes started, flushes finished): a reload is consistent only if no flush overlapped its read
+        self._flush_generation = (0, 0)
+        self._reloads = SingleFlight()
+        self._repository: Optional[LLMUsageRepository] = None
+
+    @property
+    def repository(self) -> LLMUsageRepository:
+        if self._repository is None:
+            self._repository = LLMUsageRepository()
+        return self._repository
+
+    def _add(self, model: str, counters: Dict[str, int]) -> None:
+        context = request_context.get()
+        now = datetime.utcnow()
+        key = (_hour(now), context.get("user_id"), context.get("api_key_id"), model)
+        api_key_id = context.get("api_key_id")
+        with self._lock:
+            bucket = self._buckets.setdefault(key, dict.fromkeys(USAGE_COUNTERS, 0))
+            for name, value in counters.items():
+                bucket[name] += value
+            if api_key_id:
+                tracked = self._month_to_date.get(api_key_id)
+                if tracked is not None and tracked["month"] == _month_start(now):
+                    tracked["tokens"] += metered_tokens(counters)
+
+    def record_call(self, model: str, counts: Dict[str, int], latency_seconds: float) -> None:
+        """One LLM call: token counts (input/output/cache) and latency"""
+        self._add(model, {**counts, "calls": 1, "latency_ms": int(latency_seconds * 1000)})
+
+    def record_run(self, model: str, iterations: int) -> None:
+        """One agent run and the number of model turns it took"""
+        self._add(model, {"agent_runs": 1, "agent_iterations": iterations})
+
+    async def flush(self) -> int:
+        """Write buffered counters to Mongo, returns the number of buckets written"""
+        with self._lock:
+            buckets, self._buckets = self._buckets, {}
+            if not buckets:
+                return 0
+            started, finished = self._flush_generation
+            self._flush_generation = (started + 1, finished)
+        rows = [
+            {"period_start": period_start, "user_id": user_id, "api_key_id": api_key_id, "model": model, **counters}
+            for (period_start, user_id, api_key_id, model), counters in buckets.items()
+        ]
+        try:
+            await self.repository.bulk_increment(rows)
+        except Exception:
+            # Put the counters back so the next flush retries them
+            with self._lock:
+                for key, counters in buckets.items():
+                    bucket = self._buckets.setdefault(key, dict.fromkeys(USAGE_COUNTERS, 0))
+                    for name, value in counters.items():
+                        bucket[name] += value
+            raise
+        finally:
+            with self._lock:
+                started, finished = self._flush_generation
+                self._flush_generation = (started, finished + 1)
+        return len(rows)
+
+    def _pending_tokens_locked(self, api_key_id: str, month: datetime) -> int:
+        return sum(
+            metered_tokens(counters)
+            for (period_start, _, key_id, _), counters in self._buckets.items()
+            if key_id == api_key_id and period_start >= month
+        )
+
+    async def _reload(self, api_key_id: str, month: datetime) -> int:
+        for attempt in range(self.RELOAD_ATTEMPTS):
+            with self._lock:
+                generation = self._flush_generation
+            flushed = await self.repository.metered_tokens_since(api_key_id, month)
+            with self._lock:
+                started, finished = generation
+                # Counters taken by a flush during the read may be in neither Mongo's total nor the buffer
+                if (started != finished or self._flush_generation != generation) and attempt < self.RELOAD_ATTEMPTS - 1:
+                    continue
+                # Flushed by every process + what this one hasn't flushed yet
+                tracked = {"month": month, "tokens": flushed + self._pending_tokens_locked(api_key_id, month), "loaded_at": time.monotonic()}
+                self._month_to_date[api_key_id] = tracked
+                return tracked["tokens"]
+
+    async def month_to_date_tokens(self, api_key_id: str) -> int:
+        """Quota tokens used by an API key this month (flushed by all processes + not yet flushed here)"""
+        month = _month_start(datetime.utcnow())
+        with self._lock:
+            tracked = self._month_to_date.get(api_key_id)
+            if (
+                tracked is not None
+                and tracked["month"] == month
+                and time.monotonic() - tracked["loaded_at"] < self.refresh_seconds
+            ):
+                return tracked["tokens"]
+        return await self._reloads.do(api_key_id, lambda: self._reload(api_key_id, month))
+
+    async def enforce_quota(self, api_key_id: str, monthly_token_quota: Optional[int]) -> None:
+        """Reject the request (429) when the API key used up its monthly token quota"""
+        if not monthly_token_quota:
+            return
+        used = await self.month_to_date_tokens(api_key_id)
+        if used >= monthly_token_quota:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Monthly AI token quota of this API key is used up ({used}/{monthly_token_quota}).",
+            )
+
+
+async def run_usage_flusher(interval_seconds: int):
+    """Periodically bulk-write buffered LLM usage"""
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                written = await usage_meter.flush()
+                if written:
+                    print(f"📊 Flushed {written} LLM usage buckets")
+            except Exception as e:
+                print(f"⚠️ LLM usage flush failed: {e}")
+    except asyncio.CancelledError:
+        # Final flush on shutdown
+        try:
+            await usage_meter.flush()
+        except Exception as e:
+            print(f"⚠️ LLM usage flush failed: {e}")
+        raise
+
+
+usage_meter = UsageMeter(refresh_seconds=settings.LLM_QUOTA_REFRESH_SECONDS)
@@ -4,8 +4,15 @@ from starlette.middleware.sessions import SessionMiddleware
 from app.routers import test
 from app.core.database import init_database, close_db_connection
 from app.core.startup_checks import run_startup_checks
+from app.core.executors import executors
+from app.core.passwords import password_hasher
 from app.core.config import settings
+from app.services.feed_service import run_news_ingestion_loop
+from app.services.ai_job_service import run_ai_job_workers
+from app.services.market_impact_service import run_market_impact_scheduler
+from app.core.usage_meter import run_usage_flusher
 from contextlib import asynccontextmanager
+import asyncio
 
 
 #routers
@@ -15,6 +22,7 @@ from app.routers import ai
 from app.routers import stocks
 from app.routers import admin
 from app.routers import api_keys
+from app.routers import feed
 
 # External API routers (API key only)
 from app.routers.external import stocks as external_stocks
@@ -24,18 +32,51 @@ from app.routers.external import ai as external_ai
 async def lifespan(app: FastAPI):
     print("Starting lifespan...")
     
-    # Run startup checks for API keys and endpoint connectivity
-    run_startup_checks()
+    # Run startup checks for API keys and endpoint connectivity (blocking SDK / HTTP calls)
+    await executors.llm.run(run_startup_checks)
+    
+    # Start the password hashing processes and tune the bcrypt cost for this hardware
+    await password_hasher.autotune()
     
     # Initialize database
     await init_database()
     print("Beanie initialized successfully 🍃")
     
+    # Background news ingestion feeding the personalized feeds
+    ingestion_task = None
+    if settings.NEWS_INGEST_INTERVAL_SECONDS > 0:
+        ingestion_task = asyncio.create_task(run_news_ingestion_loop(settings.NEWS_INGEST_INTERVAL_SECONDS))
+    
+    # Worker pool for queued AI analysis jobs
+    ai_job_task = None
+    if settings.AI_JOB_WORKERS > 0:
+        ai_job_task = asyncio.create_task(run_ai_job_workers(settings.AI_JOB_WORKERS, settings.AI_JOB_POLL_SECONDS))
+    
+    # Precomputed market-impact snapshots served by /market-impact
+    market_impact_task = None
+    if settings.MARKET_IMPACT_REFRESH_SECONDS > 0 and settings.MARKET_IMPACT_SNAPSHOT_LIMIT > 0:
+        market_impact_task = asyncio.create_task(
+            run_market_impact_scheduler(settings.MARKET_IMPACT_SNAPSHOT_LIMIT, settings.MARKET_IMPACT_REFRESH_SECONDS)
+        )
+    
+    # Buffered per-user / API-key LLM usage, bulk-written to Mongo
+    usage_task = asyncio.create_task(run_usage_flusher(settings.LLM_USAGE_FLUSH_SECONDS))
+    
     yield
     
     print("Closing lifespan...")
+    if ingestion_task:
+        ingestion_task.cancel()
+    if ai_job_task:
+        ai_job_task.cancel()
+    if market_impact_task:
+        market_impact_task.cancel()
+    # Wait for the final usage flush before the connection closes
+    usage_task.cancel()
+    await asyncio.gather(usage_task, return_exceptions=True)
     await close_db_connection()
     print("MongoDB connection closed successfully 🍃")
+    executors.shutdown(wait=False)
 
 app = FastAPI(lifespan=lifespan)
 
@@ -65,6 +106,7 @@ app.include_router(ai.router , tags=["ai"] , prefix="/api/ai")
 app.include_router(stocks.router , tags=["stocks"] , prefix="/api/stocks")
 app.include_router(admin.router , tags=["admin"] , prefix="/api/admin")
 app.include_router(api_keys.router , tags=["api-keys"] , prefix="/api/api-keys")
+app.include_router(feed.router , tags=["feed"] , prefix="/api/feed")
 
 # External API routes (API key authentication only)
 app.include_router(external_stocks.router , tags=["external-stocks"] , prefix="/api/v1/external/stocks")
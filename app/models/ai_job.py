@@ -0,0 +1,36 @@
+from typing import Optional, List, Dict, Any
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+from datetime import datetime
+
+
+class AIJob(Document):
+    """
+    Queued AI analysis.
+    Jobs are deduplicated by dedupe_key (one live job per normalized query/limit; completed
+    ones only while their result is as fresh as the analysis caches) and removed by a TTL
+    index once expires_at (set when the job finishes) has passed.
+    """
+    job_type: str = Field(..., description="analyze_news or market_impact")
+    dedupe_key: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    status: str = "queued"  # queued, running, completed, failed
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    requested_by: List[str] = Field(default_factory=list, description="User IDs that submitted this job")
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None  # Running jobs past their lease are picked up again
+    created_at: datetime = Field(default_factory=datetime.utcnow)  # All job timestamps are UTC
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None  # Set on completion/failure
+
+    class Settings:
+        name = "ai_jobs"
+        indexes = [
+            IndexModel([("dedupe_key", ASCENDING)], name="ai_job_dedupe", unique=True),
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="ai_job_claim"),
+            IndexModel([("expires_at", ASCENDING)], name="ai_job_ttl", expireAfterSeconds=0),
+        ]
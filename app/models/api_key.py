@@ -15,6 +15,7 @@ class ApiKey(Document):
     created_at: datetime = Field(default_factory=datetime.now)
     last_used_at: Optional[datetime] = Field(default=None, description="Last time the key was used")
     expires_at: Optional[datetime] = Field(default=None, description="Optional expiration date")
+    monthly_token_quota: Optional[int] = Field(default=None, description="AI tokens allowed per calendar month (None = unlimited)")
     
     class Settings:
         name = "api_keys"
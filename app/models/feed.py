@@ -0,0 +1,31 @@
+from typing import Optional, List
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from datetime import datetime
+
+
+class FeedEntry(Document):
+    """
+    One article in a user's personalized feed.
+    Article fields are denormalized so a feed page is a single indexed read.
+    """
+    user_id: str
+    article_id: str
+    title: str
+    description: Optional[str] = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    published_at: Optional[str] = None
+    tickers: List[str] = Field(default_factory=list)
+    sectors: List[str] = Field(default_factory=list)
+    sentiment_label: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "feed_entries"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("_id", DESCENDING)], name="user_feed_page"),
+            IndexModel([("user_id", ASCENDING), ("article_id", ASCENDING)], name="user_feed_article", unique=True),
+        ]
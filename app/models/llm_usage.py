@@ -0,0 +1,36 @@
+from typing import Optional
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+from datetime import datetime
+
+
+class LLMUsage(Document):
+    """
+    Hourly LLM usage rollup for one (user, API key, model).
+    Counters are aggregated in memory by the usage meter and added with bulk $inc upserts.
+    """
+    period_start: datetime  # UTC, start of the hour
+    user_id: Optional[str] = None  # None for background work (scheduler, unattributed jobs)
+    api_key_id: Optional[str] = None  # Set for external API-key requests
+    model: str
+    calls: int = 0
+    agent_runs: int = 0
+    agent_iterations: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    latency_ms: int = Field(default=0, description="Total latency of all calls")
+
+    class Settings:
+        name = "llm_usage"
+        indexes = [
+            IndexModel(
+                [("period_start", ASCENDING), ("user_id", ASCENDING), ("api_key_id", ASCENDING), ("model", ASCENDING)],
+                name="llm_usage_bucket",
+                unique=True,
+            ),
+            IndexModel([("user_id", ASCENDING), ("period_start", ASCENDING)], name="llm_usage_user"),
+            IndexModel([("api_key_id", ASCENDING), ("period_start", ASCENDING)], name="llm_usage_api_key"),
+        ]
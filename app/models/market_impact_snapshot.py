@@ -0,0 +1,14 @@
+from typing import Dict, Any
+from beanie import Document, Indexed
+from pydantic import Field
+from datetime import datetime
+
+
+class MarketImpactSnapshot(Document):
+    """Latest precomputed market-impact ranking for one limit"""
+    limit: Indexed(int, unique=True)
+    result: Dict[str, Any] = Field(default_factory=dict)
+    generated_at: datetime = Field(default_factory=datetime.utcnow)  # UTC
+
+    class Settings:
+        name = "market_impact_snapshots"
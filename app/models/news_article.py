@@ -0,0 +1,24 @@
+from typing import Optional, List, Dict, Any
+from beanie import Document, Indexed
+from pydantic import Field
+from datetime import datetime
+
+
+class NewsArticle(Document):
+    """Ingested news article, tagged with tickers/sectors and scored for sentiment"""
+    article_id: Indexed(str, unique=True) = Field(..., description="Stable ID derived from the article URL")
+    title: str
+    description: Optional[str] = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    published_at: Optional[str] = None
+    tickers: List[str] = Field(default_factory=list, description="Ticker symbols mentioned in the article")
+    sectors: List[str] = Field(default_factory=list)
+    sentiment: Optional[Dict[str, Any]] = None
+    ingested_at: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "news_articles"
+        indexes = [
+            "tickers",
+        ]
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field
 from beanie import Document, Indexed 
 from datetime import datetime
@@ -20,6 +20,9 @@ class User(Document):
     google_id: Optional[str] = None  # Google user ID (sub claim)
     profile_picture: Optional[str] = None  # Google profile picture URL
     auth_provider: str = Field(default="email")  # "email" or "google"
+    # Personalized news feed subscriptions
+    followed_tickers: List[str] = Field(default_factory=list)
+    followed_sectors: List[str] = Field(default_factory=list)
     created_at: datetime = Field(default=datetime.now())
     updated_at: datetime = Field(default=datetime.now())
     
@@ -35,6 +38,10 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            "followed_tickers",
+            "followed_sectors",
+        ]
 
         class Config:
             schema_extra = {
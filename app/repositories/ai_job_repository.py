@@ -0,0 +1,127 @@
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from .base_repository import BaseRepository
+from app.models.ai_job import AIJob
+
+
+class AIJobRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(AIJob)
+
+    async def enqueue(
+        self, job_type: str, dedupe_key: str, params: Dict[str, Any], user_id: str, reuse_seconds: int
+    ) -> Tuple[AIJob, bool]:
+        """
+        Queue a job unless a live one with the same dedupe key exists
+
+        Args:
+            job_type: analyze_news or market_impact
+            dedupe_key: Normalized query/limit key
+            params: Job parameters
+            user_id: ID of the submitting user
+            reuse_seconds: How long a completed job's result may be handed to new submissions
+
+        Returns:
+            (job, created) - created is False when a queued/running job or a fresh completed one was reused
+        """
+        collection = self.model.get_motor_collection()
+        for _ in range(2):
+            existing = await self.model.find_one({"dedupe_key": dedupe_key})
+            if existing and self._reusable(existing, reuse_seconds):
+                await collection.update_one({"_id": existing.id}, {"$addToSet": {"requested_by": user_id}})
+                return existing, False
+            if existing and existing.status == "failed":
+                # Failed jobs are retried on the next submission
+                await collection.delete_one({"_id": existing.id, "status": "failed"})
+            elif existing:
+                # Stale result: still readable by ID until it expires, but no longer handed out
+                await collection.update_one(
+                    {"_id": existing.id, "status": "completed"}, {"$set": {"dedupe_key": f"{dedupe_key}:{existing.id}"}}
+                )
+            try:
+                job = AIJob(job_type=job_type, dedupe_key=dedupe_key, params=params, requested_by=[user_id])
+                await job.insert()
+                return job, True
+            except DuplicateKeyError:
+                # Another request queued the same job concurrently
+                continue
+        existing = await self.model.find_one({"dedupe_key": dedupe_key})
+        return existing, False
+
+    @staticmethod
+    def _reusable(job: AIJob, reuse_seconds: int) -> bool:
+        if job.status in ("queued", "running"):
+            return True
+        return (
+            job.status == "completed"
+            and job.finished_at is not None
+            and datetime.utcnow() - job.finished_at <= timedelta(seconds=reuse_seconds)
+        )
+
+    async def claim_next(self, worker_id: str, lease_seconds: int, max_attempts: int) -> Optional[AIJob]:
+        """Atomically take the oldest queued job (or a running job whose lease expired)"""
+        now = datetime.utcnow()
+        document = await self.model.get_motor_collection().find_one_and_update(
+            {
+                "attempts": {"$lt": max_attempts},
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return self.model.model_validate(document) if document else None
+
+    async def finish(self, job_id, status: str, ttl_seconds: int, result: Any = None, error: Optional[str] = None) -> None:
+        """Store the outcome of a job and start its TTL"""
+        now = datetime.utcnow()
+        await self.model.get_motor_collection().update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "status": status,
+                    "result": result,
+                    "error": error,
+                    "finished_at": now,
+                    "lease_expires_at": None,
+                    "expires_at": now + timedelta(seconds=ttl_seconds),
+                }
+            },
+        )
+
+    async def requeue(self, job_id) -> None:
+        """Put a claimed job back in the queue without using up an attempt"""
+        await self.model.get_motor_collection().update_one(
+            {"_id": job_id, "status": "running"},
+            {"$set": {"status": "queued", "worker_id": None, "lease_expires_at": None}, "$inc": {"attempts": -1}},
+        )
+
+    async def fail_exhausted(self, max_attempts: int, ttl_seconds: int) -> int:
+        """Mark running jobs that used up their attempts and whose lease expired as failed"""
+        now = datetime.utcnow()
+        result = await self.model.get_motor_collection().update_many(
+            {"status": "running", "attempts": {"$gte": max_attempts}, "lease_expires_at": {"$lt": now}},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": "Job did not finish within its lease",
+                    "finished_at": now,
+                    "lease_expires_at": None,
+                    "expires_at": now + timedelta(seconds=ttl_seconds),
+                }
+            },
+        )
+        return result.modified_count
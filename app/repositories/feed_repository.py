@@ -0,0 +1,36 @@
+from typing import List, Dict, Optional
+from pymongo.errors import BulkWriteError
+from .base_repository import BaseRepository
+from app.models.feed import FeedEntry
+
+
+class FeedRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(FeedEntry)
+
+    async def append_entries(self, entries: List[Dict]) -> int:
+        """Bulk insert feed entries, skipping articles already in a user's feed"""
+        if not entries:
+            return 0
+        try:
+            result = await self.model.get_motor_collection().insert_many(entries, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Duplicate (user_id, article_id) pairs are expected on re-ingestion
+            return e.details.get("nInserted", 0)
+
+    async def trim_feed(self, user_id: str, max_items: int) -> int:
+        """Keep only the newest max_items entries of a user's feed"""
+        collection = self.model.get_motor_collection()
+        cutoff = await collection.find({"user_id": user_id}, {"_id": 1}).sort("_id", -1).skip(max_items).limit(1).to_list(1)
+        if not cutoff:
+            return 0
+        result = await collection.delete_many({"user_id": user_id, "_id": {"$lte": cutoff[0]["_id"]}})
+        return result.deleted_count
+
+    async def get_page(self, user_id: str, cursor: Optional[str] = None, limit: int = 20) -> List[FeedEntry]:
+        """Newest-first page of a user's feed, starting after the cursor entry"""
+        query = {"user_id": user_id}
+        if cursor:
+            query["_id"] = {"$lt": self._convert_id(cursor)}
+        return await self.model.find(query).sort([("_id", -1)]).limit(limit).to_list()
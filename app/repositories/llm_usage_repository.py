@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pymongo import UpdateOne
+from .base_repository import BaseRepository
+from app.models.llm_usage import LLMUsage
+
+USAGE_COUNTERS = (
+    "calls", "agent_runs", "agent_iterations", "input_tokens", "output_tokens",
+    "cache_creation_input_tokens", "cache_read_input_tokens", "latency_ms",
+)
+# Counted against API key quotas (cache reads are excluded)
+METERED_COUNTERS = ("input_tokens", "cache_creation_input_tokens", "output_tokens")
+# Rollup dimension -> document field
+GROUP_FIELDS = {"user": "$user_id", "api_key": "$api_key_id", "model": "$model", "hour": "$period_start"}
+
+
+class LLMUsageRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(LLMUsage)
+
+    async def bulk_increment(self, buckets: List[Dict[str, Any]]) -> None:
+        """Add counters to their hourly buckets in one bulk write (buckets are created on first use)"""
+        if not buckets:
+            return
+        operations = [
+            UpdateOne(
+                {field: bucket[field] for field in ("period_start", "user_id", "api_key_id", "model")},
+                {"$inc": {name: bucket[name] for name in USAGE_COUNTERS if bucket.get(name)}},
+                upsert=True,
+            )
+            for bucket in buckets
+        ]
+        await self.model.get_motor_collection().bulk_write(operations, ordered=False)
+
+    async def rollup(
+        self,
+        group_by: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        api_key_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Usage totals grouped by user, api_key, model or hour, largest token users first"""
+        match: Dict[str, Any] = {}
+        if since or until:
+            match["period_start"] = {**({"$gte": since} if since else {}), **({"$lt": until} if until else {})}
+        if user_id:
+            match["user_id"] = user_id
+        if api_key_id:
+            match["api_key_id"] = api_key_id
+        sort_field = "_id" if group_by == "hour" else "total_tokens"
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": GROUP_FIELDS[group_by], **{name: {"$sum": f"${name}"} for name in USAGE_COUNTERS}}},
+            {"$addFields": {"total_tokens": {"$add": [
+                "$input_tokens", "$output_tokens", "$cache_creation_input_tokens", "$cache_read_input_tokens"
+            ]}}},
+            {"$sort": {sort_field: -1}},
+            {"$limit": limit},
+        ]
+        rows = await self.model.get_motor_collection().aggregate(pipeline).to_list(length=limit)
+        for row in rows:
+            row[group_by] = row.pop("_id")
+            row["avg_latency_ms"] = round(row["latency_ms"] / row["calls"]) if row["calls"] else 0
+        return rows
+
+    async def metered_tokens_since(self, api_key_id: str, since: datetime) -> int:
+        """Quota-relevant tokens (input, cache writes, output) used by an API key since a point in time"""
+        rows = await self.model.get_motor_collection().aggregate([
+            {"$match": {"api_key_id": api_key_id, "period_start": {"$gte": since}}},
+            # Summed per field: zero counters are never written, and $add of a missing field is null
+            {"$group": {"_id": None, **{name: {"$sum": f"${name}"} for name in METERED_COUNTERS}}},
+        ]).to_list(length=1)
+        return sum(rows[0][name] for name in METERED_COUNTERS) if rows else 0
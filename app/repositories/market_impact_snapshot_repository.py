@@ -0,0 +1,20 @@
+from typing import Any, Dict, List
+from datetime import datetime
+from .base_repository import BaseRepository
+from app.models.market_impact_snapshot import MarketImpactSnapshot
+
+
+class MarketImpactSnapshotRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(MarketImpactSnapshot)
+
+    async def save_snapshot(self, limit: int, result: Dict[str, Any], generated_at: datetime) -> None:
+        """Replace the stored snapshot for a limit"""
+        await self.model.get_motor_collection().update_one(
+            {"limit": limit},
+            {"$set": {"result": result, "generated_at": generated_at}},
+            upsert=True,
+        )
+
+    async def find_all_snapshots(self) -> List[MarketImpactSnapshot]:
+        return await self.model.find_all().to_list()
@@ -0,0 +1,42 @@
+from typing import List, Dict
+from datetime import datetime
+from pymongo import UpdateOne
+from .base_repository import BaseRepository
+from app.models.news_article import NewsArticle
+
+
+class NewsArticleRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(NewsArticle)
+
+    async def upsert_many(self, articles: List[Dict]) -> List[str]:
+        """Insert articles that are not stored yet, returns the article IDs that were new"""
+        if not articles:
+            return []
+        operations = [
+            UpdateOne(
+                {"article_id": article["id"]},
+                {"$setOnInsert": self._to_document(article)},
+                upsert=True,
+            )
+            for article in articles
+        ]
+        result = await self.model.get_motor_collection().bulk_write(operations, ordered=False)
+        upserted_indexes = (result.upserted_ids or {}).keys()
+        return [articles[index]["id"] for index in upserted_indexes]
+
+    @staticmethod
+    def _to_document(article: Dict) -> Dict:
+        source = article.get("source")
+        return {
+            "article_id": article["id"],
+            "title": article.get("title") or "",
+            "description": article.get("description"),
+            "source": source.get("name") if isinstance(source, dict) else source,
+            "url": article.get("url"),
+            "published_at": article.get("publishedAt"),
+            "tickers": article.get("tickers", []),
+            "sectors": article.get("sectors", []),
+            "sentiment": article.get("sentiment"),
+            "ingested_at": datetime.now(),
+        }
@@ -37,6 +37,16 @@ class UsersRepository(BaseRepository):
     async def find_by_id(self, user_id: str) -> User | None:
         """Find user by ID and return the document directly"""
         return await super().find_by_id(user_id)
+    async def find_auth_fields(self, user_id: str) -> Optional[dict]:
+        """Only the fields the auth dependencies check (no document hydration)"""
+        try:
+            return await self.model.get_motor_collection().find_one(
+                {"_id": self._convert_id(user_id)},
+                {"is_active": 1, "ai_access_blocked": 1, "is_super_Admin": 1}
+            )
+        except Exception as e:
+            print(f"Error in find_auth_fields: {e}")
+            return None
     async def get_all_users(self, skip: int = 0, limit: int = 100) -> list[UserRead]:
         users = await self.find_all(skip, limit)
         return [UserRead(**user.to_dict_with_id(), message="User found") for user in users]
@@ -53,5 +63,29 @@ class UsersRepository(BaseRepository):
         if user:
             return {"message":"User deleted successfully", "user_id":user_id}
         return None
-        
-    
+
+    async def find_followers(self, tickers: list[str], sectors: list[str]) -> list[dict]:
+        """Users following any of the tickers or sectors (only id and follow lists are loaded)"""
+        clauses = []
+        if tickers:
+            clauses.append({"followed_tickers": {"$in": tickers}})
+        if sectors:
+            clauses.append({"followed_sectors": {"$in": sectors}})
+        if not clauses:
+            return []
+        cursor = self.model.get_motor_collection().find(
+            {"$or": clauses},
+            {"_id": 1, "followed_tickers": 1, "followed_sectors": 1}
+        )
+        return await cursor.to_list(None)
+
+    async def update_follows(self, user_id: str, tickers: list[str], sectors: list[str]) -> User | None:
+        return await self.update(user_id, {"followed_tickers": tickers, "followed_sectors": sectors})
+
+    async def replace_password_hash(self, user_id: str, old_hash: str, new_hash: str) -> bool:
+        """Swap the stored hash unless the password was changed in the meantime"""
+        result = await self.model.get_motor_collection().update_one(
+            {"_id": self._convert_id(user_id), "hashed_password": old_hash},
+            {"$set": {"hashed_password": new_hash}}
+        )
+        return result.modified_count == 1
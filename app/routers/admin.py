@@ -1,9 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from typing import List, Literal, Optional
+from pydantic import BaseModel, EmailStr, Field
 from app.repositories.users_repository import UsersRepository
+from app.repositories.llm_usage_repository import LLMUsageRepository
+from app.repositories.api_key_repository import ApiKeyRepository
+from app.core.auth_user_cache import auth_user_cache
+from app.core.usage_meter import usage_meter
 from app.core.security import security_manager
+from app.LLM.api_agent import agent, ai_cache, ai_flight, semantic_cache, tool_cache_stats
+from app.core.llm_governor import llm_governor
+from app.core.executors import executors
 from app.schemas.user_schema import UserRead, UserUpdate
 from datetime import datetime
 
@@ -37,6 +44,10 @@ class AdminPasswordUpdate(BaseModel):
     new_password: str
 
 
+class ApiKeyQuotaUpdate(BaseModel):
+    monthly_token_quota: Optional[int] = Field(None, ge=0)  # None removes the quota
+
+
 class UserAdminResponse(BaseModel):
     id: str
     username: str
@@ -56,6 +67,14 @@ def get_users_repository() -> UsersRepository:
     return UsersRepository()
 
 
+def get_llm_usage_repository() -> LLMUsageRepository:
+    return LLMUsageRepository()
+
+
+def get_api_key_repository() -> ApiKeyRepository:
+    return ApiKeyRepository()
+
+
 async def get_current_admin_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     users_repo: UsersRepository = Depends(get_users_repository)
@@ -71,7 +90,7 @@ async def get_current_admin_user(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
     
-    user = await users_repo.find_by_id(user_id)
+    user = await auth_user_cache.get(user_id, users_repo)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
@@ -124,7 +143,7 @@ async def create_user(
     if existing_username:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
     
-    hashed_password = security_manager.get_password_hash(user_data.password)
+    hashed_password = await security_manager.get_password_hash_async(user_data.password)
     user_dict = {
         "username": user_data.username,
         "first_name": user_data.first_name,
@@ -202,6 +221,7 @@ async def update_user(
         for key, value in update_data.items():
             setattr(user, key, value)
         await user.save()
+        auth_user_cache.invalidate(user_id)
     
     return UserAdminResponse(
         id=str(user.id),
@@ -231,7 +251,7 @@ async def update_user_password(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    hashed_password = security_manager.get_password_hash(password_data.new_password)
+    hashed_password = await security_manager.get_password_hash_async(password_data.new_password)
     user.hashed_password = hashed_password
     user.updated_at = datetime.now()
     await user.save()
@@ -254,6 +274,7 @@ async def toggle_ai_access(
     user.ai_access_blocked = blocked
     user.updated_at = datetime.now()
     await user.save()
+    auth_user_cache.invalidate(user_id)
     
     action = "blocked" if blocked else "unblocked"
     return {"message": f"AI access {action} for user", "user_id": user_id, "ai_access_blocked": blocked}
@@ -274,6 +295,7 @@ async def delete_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot delete your own account")
     
     await user.delete()
+    auth_user_cache.invalidate(user_id)
     return {"message": "User deleted successfully", "user_id": user_id}
 
 
@@ -296,3 +318,62 @@ async def get_admin_stats(
         "admin_users": admin_users,
         "ai_blocked_users": ai_blocked_users
     }
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(admin: dict = Depends(get_current_admin_user)):
+    # AI result cache metrics (size, hit ratio, evictions), semantic query matching, in-flight deduplication,
+    # agent tool result cache (hit ratio per tool), Claude prompt cache token counters, LLM queue state and provider latency/hedging,
+    # authenticated-user cache
+    return {
+        "ai_cache": ai_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "ai_in_flight": ai_flight.stats(),
+        "agent_tools": tool_cache_stats(),
+        "claude_usage": agent.claude_ai.usage_stats(),
+        "llm_governor": llm_governor.stats(),
+        "llm_providers": agent.provider_router.stats(),
+        "auth_users": auth_user_cache.stats(),
+    }
+
+
+@router.get("/executors")
+async def get_executor_stats(admin: dict = Depends(get_current_admin_user)):
+    # Per pool (llm, http, crypto): workers, active, queue depth, wait and run times
+    return executors.stats()
+
+
+@router.get("/llm-usage")
+async def get_llm_usage(
+    group_by: Literal["user", "api_key", "model", "hour"] = "user",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    api_key_id: Optional[str] = None,
+    limit: int = 100,
+    admin: dict = Depends(get_current_admin_user),
+    usage_repo: LLMUsageRepository = Depends(get_llm_usage_repository)
+):
+    # LLM token usage, calls, agent iterations and latency rolled up by user, API key, model or hour (UTC)
+    await usage_meter.flush()
+    rows = await usage_repo.rollup(group_by, since=since, until=until, user_id=user_id, api_key_id=api_key_id, limit=min(limit, 1000))
+    return {"group_by": group_by, "rows": rows}
+
+
+@router.put("/api-keys/{api_key_id}/quota")
+async def set_api_key_quota(
+    api_key_id: str,
+    quota: ApiKeyQuotaUpdate,
+    admin: dict = Depends(get_current_admin_user),
+    api_key_repo: ApiKeyRepository = Depends(get_api_key_repository)
+):
+    # Set or remove the monthly AI token quota of an API key
+    api_key = await api_key_repo.find_by_id(api_key_id)
+    if not api_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="API key not found")
+    
+    api_key.monthly_token_quota = quota.monthly_token_quota
+    await api_key.save()
+    
+    used = await usage_meter.month_to_date_tokens(api_key_id)
+    return {"api_key_id": api_key_id, "monthly_token_quota": api_key.monthly_token_quota, "month_to_date_tokens": used}
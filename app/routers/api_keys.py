@@ -9,6 +9,7 @@ from app.schemas.api_key_schema import (
     ApiKeyListResponse,
     ApiKeyDeleteResponse
 )
+from app.core.auth_user_cache import auth_user_cache
 from app.core.security import security_manager
 from app.repositories.users_repository import UsersRepository
 
@@ -43,8 +44,7 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
     
-    users_repo = get_users_repository()
-    user = await users_repo.find_by_id(user_id)
+    user = await auth_user_cache.get(user_id, get_users_repository())
     
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
@@ -98,7 +98,8 @@ async def list_api_keys(
                 is_active=key.is_active,
                 created_at=key.created_at,
                 last_used_at=key.last_used_at,
-                expires_at=key.expires_at
+                expires_at=key.expires_at,
+                monthly_token_quota=key.monthly_token_quota
             )
             for key in api_keys
         ]
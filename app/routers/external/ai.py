@@ -2,33 +2,77 @@
 External API endpoints for AI - API Key authentication only.
 These endpoints are for programmatic access by external users.
 """
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
-import asyncio
+import json
 from app.LLM.api_agent import agent
+from app.schemas.ai_job_schema import AIJobCreate, AIJobRead
+from app.services.ai_job_service import AIJobService
+from app.services.market_impact_service import MarketImpactService
 from app.core.api_key_only_auth import check_ai_access_api_key_only
 
 router = APIRouter()
 
 
+def get_ai_job_service() -> AIJobService:
+    return AIJobService()
+
+
+def get_market_impact_service() -> MarketImpactService:
+    return MarketImpactService()
+
+
 class NewsAnalysisRequest(BaseModel):
     query: str
     limit: Optional[int] = 10
+    max_seconds: Optional[float] = Field(None, gt=0)  # Deadline for the whole analysis
 
 
 class NewsAnalysisResponse(BaseModel):
     analysis: str
     query: str
+    partial: bool = False  # Deadline reached, analysis is based on the news gathered so far
+
+
+async def _analysis_event_stream(query: str, max_seconds: Optional[float] = None):
+    # Frame agent events as server-sent events:
+    # status, tool_call, tool_result, text (answer deltas), reset (drop the text since the
+    # last tool_result, a forced final answer follows), done (complete answer + partial flag), error
+    async for event in agent.stream_market_news(query, max_seconds):
+        yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def _streaming_response(query: str, max_seconds: Optional[float] = None) -> StreamingResponse:
+    # Reject with 429 + Retry-After before streaming starts when the LLM queue is too long
+    agent.admit(query, max_seconds)
+    return StreamingResponse(
+        _analysis_event_stream(query, max_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Declared before /analyze-news/{query} so "stream" is not captured as a query
+@router.get("/analyze-news/stream")
+async def analyze_news_stream_get(query: str, max_seconds: Optional[float] = Query(None, gt=0), auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
+    """Stream news analysis as server-sent events. API Key required."""
+    return _streaming_response(query, max_seconds)
+
+
+@router.post("/analyze-news/stream")
+async def analyze_news_stream_post(request: NewsAnalysisRequest, auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
+    """Stream news analysis for a JSON body as server-sent events. API Key required."""
+    return _streaming_response(request.query, request.max_seconds)
 
 
 @router.get("/analyze-news/{query}", response_model=NewsAnalysisResponse)
-async def analyze_news_path(query: str, auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
+async def analyze_news_path(query: str, max_seconds: Optional[float] = Query(None, gt=0), auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
     """Analyze news for specific query. API Key required."""
     try:
-        loop = asyncio.get_event_loop()
-        analysis = await loop.run_in_executor(None, agent.analyze_market_news, query)
-        return NewsAnalysisResponse(analysis=analysis, query=query)
+        result = await agent.analyze(query, max_seconds)
+        return NewsAnalysisResponse(analysis=result.text, query=query, partial=result.partial)
     except HTTPException:
         raise
     except Exception as e:
@@ -36,12 +80,11 @@ async def analyze_news_path(query: str, auth: Dict[str, Any] = Depends(check_ai_
 
 
 @router.get("/analyze-news", response_model=NewsAnalysisResponse)
-async def analyze_news_get(query: str, auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
+async def analyze_news_get(query: str, max_seconds: Optional[float] = Query(None, gt=0), auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
     """Analyze news with query parameter. API Key required."""
     try:
-        loop = asyncio.get_event_loop()
-        analysis = await loop.run_in_executor(None, agent.analyze_market_news, query)
-        return NewsAnalysisResponse(analysis=analysis, query=query)
+        result = await agent.analyze(query, max_seconds)
+        return NewsAnalysisResponse(analysis=result.text, query=query, partial=result.partial)
     except HTTPException:
         raise
     except Exception as e:
@@ -52,9 +95,8 @@ async def analyze_news_get(query: str, auth: Dict[str, Any] = Depends(check_ai_a
 async def analyze_news_post(request: NewsAnalysisRequest, auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
     """Analyze news with JSON body. API Key required."""
     try:
-        loop = asyncio.get_event_loop()
-        analysis = await loop.run_in_executor(None, agent.analyze_market_news, request.query)
-        return NewsAnalysisResponse(analysis=analysis, query=request.query)
+        result = await agent.analyze(request.query, request.max_seconds)
+        return NewsAnalysisResponse(analysis=result.text, query=request.query, partial=result.partial)
     except HTTPException:
         raise
     except Exception as e:
@@ -62,14 +104,53 @@ async def analyze_news_post(request: NewsAnalysisRequest, auth: Dict[str, Any] =
 
 
 @router.get("/market-impact")
-async def get_market_impact_news(limit: int = 10, auth: Dict[str, Any] = Depends(check_ai_access_api_key_only)):
+async def get_market_impact_news(
+    limit: int = 10,
+    auth: Dict[str, Any] = Depends(check_ai_access_api_key_only),
+    market_impact_service: MarketImpactService = Depends(get_market_impact_service)
+):
     """Get top market-impacting news. API Key required."""
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, agent.find_market_impact_news, limit)
+        result = await market_impact_service.get_market_impact(limit)
         return result
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market impact news: {str(e)}")
 
+
+
+@router.post("/jobs", response_model=AIJobRead, status_code=202)
+async def create_ai_job(
+    request: AIJobCreate,
+    auth: Dict[str, Any] = Depends(check_ai_access_api_key_only),
+    job_service: AIJobService = Depends(get_ai_job_service)
+):
+    """Queue an analysis job and return its ID. API Key required."""
+    return await job_service.submit(request, auth["user_id"])
+
+
+@router.get("/jobs/{job_id}", response_model=AIJobRead)
+async def get_ai_job(
+    job_id: str,
+    auth: Dict[str, Any] = Depends(check_ai_access_api_key_only),
+    job_service: AIJobService = Depends(get_ai_job_service)
+):
+    """Poll an analysis job. API Key required."""
+    return AIJobService.to_read(await job_service.get_job(job_id))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ai_job(
+    job_id: str,
+    auth: Dict[str, Any] = Depends(check_ai_access_api_key_only),
+    job_service: AIJobService = Depends(get_ai_job_service)
+):
+    """Subscribe to an analysis job as server-sent events. API Key required."""
+    await job_service.get_job(job_id)
+
+    async def events():
+        async for job in job_service.watch_job(job_id):
+            yield f"event: {job.status}\ndata: {job.model_dump_json()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
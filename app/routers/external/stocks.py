@@ -5,6 +5,8 @@ These endpoints are for programmatic access by external users.
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Dict, Optional, Any
 from app.services.yahoo_finance_service import YahooFinanceService
+from app.services.news_service import NewsService
+from app.core.executors import executors
 from app.core.api_key_only_auth import authenticate_api_key_only
 
 router = APIRouter()
@@ -13,11 +15,14 @@ router = APIRouter()
 def get_stock_service():
     return YahooFinanceService()
 
+def get_news_service():
+    return NewsService()
+
 @router.get("/quote/{symbol}")
 async def get_quote(symbol: str, auth: Dict[str, Any] = Depends(authenticate_api_key_only)):
     """Get real-time quote for a stock symbol. API Key required."""
     stock_service = get_stock_service()
-    data = stock_service.get_quote(symbol.upper())
+    data = await executors.http.run(stock_service.get_quote, symbol.upper())
     
     return {
         "symbol": symbol.upper(),
@@ -58,7 +63,7 @@ async def get_candles(
 async def get_profile(symbol: str, auth: Dict[str, Any] = Depends(authenticate_api_key_only)):
     """Get company profile and information. API Key required."""
     stock_service = get_stock_service()
-    quote_data = stock_service.get_quote(symbol.upper())
+    quote_data = await executors.http.run(stock_service.get_quote, symbol.upper())
     
     if "error" in quote_data:
         return {
@@ -104,7 +109,7 @@ async def get_profile(symbol: str, auth: Dict[str, Any] = Depends(authenticate_a
 async def search_stocks(keywords: str = Query(..., min_length=1), auth: Dict[str, Any] = Depends(authenticate_api_key_only)):
     """Search for stocks by symbol or company name. API Key required."""
     stock_service = get_stock_service()
-    data = stock_service.search_symbol(keywords)
+    data = await executors.http.run(stock_service.search_symbol, keywords)
     
     if "error" in data:
         raise HTTPException(status_code=500, detail=f"Error searching stocks: {data['error']}")
@@ -127,7 +132,7 @@ async def search_stocks(keywords: str = Query(..., min_length=1), auth: Dict[str
 async def get_market_movers(auth: Dict[str, Any] = Depends(authenticate_api_key_only)):
     """Get top gainers, losers, and most active stocks. API Key required."""
     stock_service = get_stock_service()
-    data = stock_service.get_market_movers()
+    data = await executors.http.run(stock_service.get_market_movers)
     
     if "error" in data:
         raise HTTPException(status_code=500, detail=f"Error fetching market movers: {data['error']}")
@@ -147,3 +152,14 @@ async def get_market_movers(auth: Dict[str, Any] = Depends(authenticate_api_key_
         "most_actively_traded": [format_stock(s) for s in data.get("most_active", [])]
     }
 
+
+@router.get("/news-sentiment/{symbol}")
+async def get_news_sentiment(symbol: str, limit: int = Query(20, ge=1, le=100), auth: Dict[str, Any] = Depends(authenticate_api_key_only)):
+    """Get lexicon-based sentiment scores for recent news on a stock symbol. API Key required."""
+    news_service = get_news_service()
+    data = await executors.http.run(news_service.get_symbol_sentiment, symbol, limit)
+    
+    if "error" in data:
+        raise HTTPException(status_code=500, detail=f"Error fetching news sentiment: {data['error']}")
+    
+    return data
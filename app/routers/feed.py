@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Dict, Any, Optional
+from app.core.jwt_auth import authenticate_jwt_only
+from app.services.feed_service import FeedService
+from app.schemas.feed_schema import FeedPage, FollowsRead, FollowsUpdate
+
+router = APIRouter()
+
+
+def get_feed_service() -> FeedService:
+    return FeedService()
+
+
+@router.get("/", response_model=FeedPage)
+async def get_feed(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    auth: Dict[str, Any] = Depends(authenticate_jwt_only),
+    feed_service: FeedService = Depends(get_feed_service)
+):
+    """Get a page of the user's personalized news feed (pass next_cursor to continue)"""
+    return await feed_service.get_feed(auth["user_id"], cursor=cursor, limit=limit)
+
+
+@router.get("/follows", response_model=FollowsRead)
+async def get_follows(
+    auth: Dict[str, Any] = Depends(authenticate_jwt_only),
+    feed_service: FeedService = Depends(get_feed_service)
+):
+    """Get the tickers and sectors the user follows"""
+    return await feed_service.get_follows(auth["user_id"])
+
+
+@router.put("/follows", response_model=FollowsRead)
+async def update_follows(
+    follows: FollowsUpdate,
+    auth: Dict[str, Any] = Depends(authenticate_jwt_only),
+    feed_service: FeedService = Depends(get_feed_service)
+):
+    """Replace the tickers and sectors the user follows"""
+    return await feed_service.update_follows(auth["user_id"], follows)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Dict, Optional, Any
 from app.services.yahoo_finance_service import YahooFinanceService
+from app.services.news_service import NewsService
+from app.core.executors import executors
 
 router = APIRouter()
 
@@ -8,11 +10,14 @@ router = APIRouter()
 def get_stock_service():
     return YahooFinanceService()
 
+def get_news_service():
+    return NewsService()
+
 @router.get("/quote/{symbol}")
 async def get_quote(symbol: str):
     """Get real-time quote for a stock symbol."""
     stock_service = get_stock_service()
-    data = stock_service.get_quote(symbol.upper())
+    data = await executors.http.run(stock_service.get_quote, symbol.upper())
     
     # Service now returns mock data instead of errors when rate limited
     # Transform Yahoo Finance data to consistent format
@@ -58,7 +63,7 @@ async def get_profile(symbol: str):
     stock_service = get_stock_service()
     # Yahoo Finance RapidAPI doesn't have a separate profile endpoint
     # Get basic info from quote instead
-    quote_data = stock_service.get_quote(symbol.upper())
+    quote_data = await executors.http.run(stock_service.get_quote, symbol.upper())
     
     if "error" in quote_data:
         # Return minimal profile data
@@ -106,7 +111,7 @@ async def get_profile(symbol: str):
 async def search_stocks(keywords: str = Query(..., min_length=1)):
     """Search for stocks by symbol or company name."""
     stock_service = get_stock_service()
-    data = stock_service.search_symbol(keywords)
+    data = await executors.http.run(stock_service.search_symbol, keywords)
     
     if "error" in data:
         raise HTTPException(status_code=500, detail=f"Error searching stocks: {data['error']}")
@@ -130,7 +135,7 @@ async def search_stocks(keywords: str = Query(..., min_length=1)):
 async def get_market_movers():
     """Get top gainers, losers, and most active stocks."""
     stock_service = get_stock_service()
-    data = stock_service.get_market_movers()
+    data = await executors.http.run(stock_service.get_market_movers)
     
     if "error" in data:
         raise HTTPException(status_code=500, detail=f"Error fetching market movers: {data['error']}")
@@ -150,3 +155,15 @@ async def get_market_movers():
         "top_losers": [format_stock(s) for s in data.get("losers", [])],
         "most_actively_traded": [format_stock(s) for s in data.get("most_active", [])]
     }
+
+
+@router.get("/news-sentiment/{symbol}")
+async def get_news_sentiment(symbol: str, limit: int = Query(20, ge=1, le=100)):
+    """Get lexicon-based sentiment scores for recent news on a stock symbol."""
+    news_service = get_news_service()
+    data = await executors.http.run(news_service.get_symbol_sentiment, symbol, limit)
+    
+    if "error" in data:
+        raise HTTPException(status_code=500, detail=f"Error fetching news sentiment: {data['error']}")
+    
+    return data
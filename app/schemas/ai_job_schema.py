@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Any, Literal
+from datetime import datetime
+
+
+class AIJobCreate(BaseModel):
+    job_type: Literal["analyze_news", "market_impact"] = "analyze_news"
+    query: Optional[str] = None
+    limit: int = Field(10, ge=1, le=50)
+
+
+class AIJobRead(BaseModel):
+    job_id: str
+    job_type: str
+    status: str
+    deduplicated: bool = False
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -26,6 +26,7 @@ class ApiKeyRead(BaseModel):
     created_at: datetime
     last_used_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None
+    monthly_token_quota: Optional[int] = None
 
 
 class ApiKeyListResponse(BaseModel):
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class FeedItem(BaseModel):
+    id: str
+    article_id: str
+    title: str
+    description: Optional[str] = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    published_at: Optional[str] = None
+    tickers: List[str] = []
+    sectors: List[str] = []
+    sentiment_label: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    created_at: datetime
+
+
+class FeedPage(BaseModel):
+    items: List[FeedItem]
+    next_cursor: Optional[str] = None
+
+
+class FollowsUpdate(BaseModel):
+    tickers: List[str] = []
+    sectors: List[str] = []
+
+
+class FollowsRead(BaseModel):
+    tickers: List[str]
+    sectors: List[str]
+    available_sectors: List[str] = []
@@ -0,0 +1,169 @@
+"""
+Offline benchmark of APIAgent throughput, caching and concurrency
+
+Starts the upstream stand-in (app/scripts/llm_standin.py) in a background
+thread, points ClaudeAI and NewsService at it and runs analyses concurrently.
+No network access or API tokens are needed; with the same seed and cassette
+every run sends the same responses.
+
+Run:
+    python -m app.scripts.benchmark_agent --requests 200 --concurrency 20 --unique-queries 25
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+from typing import Any, Dict, List
+
+QUERIES = [
+    "How is Nvidia reacting to the latest chip export rules?",
+    "What is moving Tesla stock today?",
+    "Impact of the Fed rate decision on bank stocks",
+    "Apple earnings outlook",
+    "Why are oil prices rising and what does it mean for Exxon Mobil?",
+    "Microsoft cloud growth and AI spending",
+    "Amazon retail sales ahead of the holidays",
+    "Boeing production problems",
+    "Is the market pricing in a recession?",
+    "Big tech antitrust news this week",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_standin(args, port: int) -> None:
+    import uvicorn
+    from app.core.recording import Cassette
+    from app.scripts.llm_standin import StandinOptions, create_app
+
+    entries = Cassette.load(args.cassette) if args.cassette else []
+    options = StandinOptions(
+        first_byte_ms=args.first_byte_ms,
+        tokens_per_second=args.tokens_per_second,
+        jitter=args.jitter,
+        news_latency_ms=args.news_latency_ms,
+        seed=args.seed,
+    )
+    server = uvicorn.Server(uvicorn.Config(create_app(entries, options), host="127.0.0.1", port=port, log_level="warning"))
+    # Own thread and event loop, so serving doesn't compete with the agent's loop
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+def configure(base_url: str) -> None:
+    # Must run before app modules are imported (settings are read at import time)
+    os.environ["CLAUDE_BASE_URL"] = base_url
+    os.environ["NEWS_API_URL"] = f"{base_url}/v2"
+    os.environ.setdefault("CLAUDE_API_KEY", "standin")
+    os.environ.setdefault("NEWS_API_KEY", "standin")
+    # Only the stand-in is reachable: no Gemini, no recording
+    for name in ("GEMINI_API_KEY", "GOOGLE_API_KEY", "HTTP_RECORD_PATH"):
+        os.environ.pop(name, None)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+async def run(args) -> Dict[str, Any]:
+    from app.LLM.api_agent import APIAgent, ai_cache, tool_cache_stats
+    from app.core.llm_governor import llm_governor, set_request_context
+    from app.core.executors import executors
+
+    agent = APIAgent()
+    queries = [
+        QUERIES[position % len(QUERIES)] + (f" (variant {position // len(QUERIES)})" if position >= len(QUERIES) else "")
+        for position in range(args.unique_queries)
+    ]
+    latencies: List[float] = []
+    outcomes = {"ok": 0, "partial": 0, "errors": 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(position: int) -> None:
+        async with semaphore:
+            # Each simulated client is its own fairness flow
+            set_request_context("api", f"bench-{position % args.concurrency}")
+            started = time.monotonic()
+            try:
+                result = await agent.analyze(queries[position % len(queries)], max_seconds=args.max_seconds)
+                outcomes["partial" if result.partial else "ok"] += 1
+            except Exception as e:
+                outcomes["errors"] += 1
+                if outcomes["errors"] <= 3:
+                    print(f"❌ Request {position} failed: {str(e)[:200]}")
+            latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(one(position) for position in range(args.requests)))
+    wall = time.monotonic() - started
+
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "unique_queries": len(queries),
+        "wall_seconds": round(wall, 2),
+        "throughput_rps": round(args.requests / wall, 2) if wall else 0.0,
+        "latency_seconds": {
+            "p50": round(statistics.median(latencies), 3) if latencies else 0.0,
+            "p95": round(_percentile(latencies, 0.95), 3),
+            "max": round(max(latencies), 3) if latencies else 0.0,
+        },
+        **outcomes,
+        "analysis_cache": ai_cache.stats(),
+        "agent_tools": tool_cache_stats(),
+        "claude": agent.claude_ai.usage_stats(),
+        "llm_governor": llm_governor.stats(),
+        "executors": executors.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--unique-queries", type=int, default=10, help="Distinct queries cycled through (fewer = more cache hits)")
+    parser.add_argument("--max-seconds", type=float, help="Per-analysis deadline")
+    parser.add_argument("--standin-url", help="Use an already running stand-in instead of starting one")
+    parser.add_argument("--cassette", help="Recorded exchanges to replay")
+    parser.add_argument("--first-byte-ms", type=float)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--news-latency-ms", type=float, default=150.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = args.standin_url or f"http://127.0.0.1:{port}"
+    configure(base_url)
+    if not args.standin_url:
+        start_standin(args, port)
+    print(f"🏁 {args.requests} analyses, concurrency {args.concurrency}, {args.unique_queries} unique queries against {base_url}")
+    report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+    latency = report["latency_seconds"]
+    print(f"⏱️  {report['wall_seconds']}s wall, {report['throughput_rps']} analyses/s")
+    print(f"📈 Latency p50 {latency['p50']}s, p95 {latency['p95']}s, max {latency['max']}s")
+    print(f"✅ {report['ok']} ok, {report['partial']} partial, {report['errors']} errors")
+    print(f"🗄️  Analysis cache hit ratio {report['analysis_cache']['hit_ratio']}, tool cache hit ratio {report['agent_tools']['cache']['hit_ratio']}")
+    claude = report["claude"]
+    print(f"🤖 {claude.get('calls', 0)} Claude calls, {claude.get('input_tokens', 0)} input / {claude.get('output_tokens', 0)} output tokens")
+    governor = report["llm_governor"]
+    print(f"🚦 Governor: {governor['granted']} granted, {governor['queued']} queued, {governor['rejected']} rejected, {governor['wait_seconds']}s waited")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Login (bcrypt verify) throughput by number of hashing processes
+
+Verifies the same password concurrently, first inline on the event loop (how
+logins used to run), then on process pools of increasing size. Reports
+logins per second, latency and the longest event-loop stall: throughput
+should grow with the number of cores while the loop stays responsive.
+
+Run:
+    python -m app.scripts.benchmark_login --logins 64 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+from app.core.executors import NamedExecutor
+from app.core.passwords import PasswordHasher, hash_password, verify_password
+
+
+async def _watch_loop(stop: asyncio.Event) -> float:
+    # Longest gap between 10ms ticks = how long the loop was blocked
+    longest = 0.0
+    last = time.monotonic()
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        now = time.monotonic()
+        longest = max(longest, now - last - 0.01)
+        last = now
+    return longest
+
+
+async def measure(logins: int, hashed: str, hasher: Optional[PasswordHasher]) -> Dict[str, Any]:
+    latencies: List[float] = []
+
+    async def login() -> None:
+        started = time.monotonic()
+        if hasher is None:
+            verify_password("correct horse battery staple", hashed)
+        else:
+            await hasher.verify("correct horse battery staple", hashed)
+        latencies.append(time.monotonic() - started)
+
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(_watch_loop(stop))
+    await asyncio.sleep(0.02)
+    started = time.monotonic()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    wall = time.monotonic() - started
+    stop.set()
+    ordered = sorted(latencies)
+    return {
+        "logins_per_second": round(logins / wall, 2),
+        "p50_ms": round(statistics.median(ordered) * 1000, 1),
+        "p95_ms": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 1),
+        "max_loop_stall_ms": round(await watcher * 1000, 1),
+    }
+
+
+async def run(args) -> None:
+    hashed = hash_password("correct horse battery staple", args.rounds)
+    cores = os.cpu_count() or 1
+    sizes = args.workers or sorted({1, *[2 ** power for power in range(1, 8) if 2 ** power <= cores], cores})
+    print(f"🔐 {args.logins} concurrent logins, bcrypt cost {args.rounds}, {cores} cores")
+
+    inline = await measure(args.logins, hashed, None)
+    print(f"{'inline (event loop)':>22}: {inline['logins_per_second']:>7} logins/s  p95 {inline['p95_ms']:>8}ms  loop stall {inline['max_loop_stall_ms']:>8}ms")
+
+    for size in sizes:
+        executor = NamedExecutor(f"crypto-{size}", "process", size)
+        hasher = PasswordHasher(executor, target_ms=0, min_rounds=args.rounds, max_rounds=args.rounds, fixed_rounds=args.rounds)
+        # Start the worker processes before measuring
+        await asyncio.gather(*(executor.run(time.sleep, 0.05) for _ in range(size)))
+        result = await measure(args.logins, hashed, hasher)
+        speedup = result["logins_per_second"] / inline["logins_per_second"] if inline["logins_per_second"] else 0.0
+        print(f"{f'{size} process(es)':>22}: {result['logins_per_second']:>7} logins/s  p95 {result['p95_ms']:>8}ms  loop stall {result['max_loop_stall_ms']:>8}ms  x{speedup:.2f}")
+        executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost of the stored hash")
+    parser.add_argument("--workers", type=int, nargs="*", help="Pool sizes to try (default: 1, 2, 4, ... up to the core count)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
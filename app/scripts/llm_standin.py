@@ -0,0 +1,414 @@
+"""
+Local stand-in for the Anthropic Messages API and News API
+
+Replays exchanges recorded with HTTP_RECORD_PATH (see app/core/recording.py)
+and synthesizes deterministic responses for requests that were not recorded,
+with configurable time-to-first-byte and token streaming speed. Point the app
+at it with:
+
+    CLAUDE_BASE_URL=http://127.0.0.1:8765 NEWS_API_URL=http://127.0.0.1:8765/v2
+
+Run:
+    python -m app.scripts.llm_standin --cassette recordings.jsonl --port 8765
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.core.recording import Cassette, request_fingerprint
+
+CHARS_PER_TOKEN = 4
+# Tokens per streamed delta event
+TOKENS_PER_DELTA = 3
+
+COMPANIES = [
+    ("Apple", "AAPL"), ("Microsoft", "MSFT"), ("Nvidia", "NVDA"), ("Tesla", "TSLA"), ("Amazon", "AMZN"),
+    ("Alphabet", "GOOGL"), ("Meta", "META"), ("JPMorgan", "JPM"), ("Exxon Mobil", "XOM"), ("Boeing", "BA"),
+]
+EVENTS = [
+    "beats quarterly earnings estimates", "cuts full-year guidance", "announces $10 billion buyback",
+    "faces antitrust probe", "shares slide after downgrade", "unveils new AI chips", "raises dividend",
+    "misses revenue forecast", "wins major government contract", "recalls vehicles over safety issue",
+]
+MACRO = [
+    "Fed signals rates will stay higher for longer", "Oil prices jump as supply tightens",
+    "Treasury yields climb after strong jobs report", "Inflation cools more than expected in September",
+    "Dollar weakens as traders price in rate cuts",
+]
+SOURCES = ["Reuters", "Bloomberg", "CNBC", "Financial Times", "The Wall Street Journal", "MarketWatch"]
+
+
+@dataclass
+class StandinOptions:
+    first_byte_ms: Optional[float] = None  # None replays recorded time-to-first-byte (300ms when synthesized)
+    tokens_per_second: float = 80.0
+    jitter: float = 0.1  # +- fraction applied to every delay
+    news_latency_ms: float = 150.0
+    strict: bool = False  # Unrecorded requests fail instead of being synthesized
+    seed: int = 0
+
+
+def _rng(options: StandinOptions, fingerprint: str) -> random.Random:
+    # Same request -> same synthesized response
+    return random.Random(options.seed * 1_000_003 + zlib.crc32(fingerprint.encode("utf-8")))
+
+
+def _delay(options: StandinOptions, seconds: float, rng: random.Random) -> float:
+    if options.jitter:
+        seconds *= 1 + rng.uniform(-options.jitter, options.jitter)
+    return max(seconds, 0.0)
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class ReplayLibrary:
+    """Recorded responses by request fingerprint; repeated requests cycle through their recordings"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self._by_fingerprint: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_endpoint: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        self._next: Dict[Any, int] = defaultdict(int)
+        for entry in entries:
+            if entry.get("status") != 200:
+                continue
+            self._by_fingerprint[entry["fingerprint"]].append(entry)
+            self._by_endpoint[(entry["service"], entry["path"].rsplit("/", 1)[-1])].append(entry)
+        self.stats = {"recorded": sum(len(found) for found in self._by_fingerprint.values()), "replayed": 0, "synthesized": 0}
+
+    def _cycle(self, key: Any, found: List[Dict[str, Any]]) -> Dict[str, Any]:
+        entry = found[self._next[key] % len(found)]
+        self._next[key] += 1
+        self.stats["replayed"] += 1
+        return entry
+
+    def exact(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        found = self._by_fingerprint.get(fingerprint)
+        return self._cycle(fingerprint, found) if found else None
+
+    def any_for(self, service: str, endpoint: str) -> Optional[Dict[str, Any]]:
+        # News responses are interchangeable enough for benchmarks; LLM turns are not
+        found = self._by_endpoint.get((service, endpoint))
+        return self._cycle((service, endpoint), found) if found else None
+
+
+# Anthropic Messages API
+
+def _text_of(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or []:
+        if block.get("type") == "text":
+            parts.append(block.get("text", ""))
+        elif block.get("type") == "tool_result":
+            parts.append(_text_of(block.get("content")))
+    return "\n".join(parts)
+
+
+def _user_query(messages: List[Dict[str, Any]]) -> str:
+    for message in messages:
+        if message.get("role") == "user":
+            # First line only; prefetched context follows it
+            return _text_of(message.get("content")).strip().split("\n", 1)[0][:200]
+    return ""
+
+
+def _tool_results(messages: List[Dict[str, Any]]) -> List[str]:
+    return [
+        _text_of(block.get("content"))
+        for message in messages if isinstance(message.get("content"), list)
+        for block in message["content"] if block.get("type") == "tool_result"
+    ]
+
+
+def _sample(schema: Dict[str, Any], rng: random.Random, name: str, query: str, index: int = 0) -> Any:
+    """Value matching a JSON schema (enough of it for the app's tools)"""
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type", "string")
+    if kind == "object":
+        required = set(schema.get("required", []))
+        return {
+            key: _sample(sub, rng, key, query, index)
+            for key, sub in schema.get("properties", {}).items()
+            if key in required or rng.random() < 0.7
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", 1), min(schema.get("maxItems", 8), 8 if name.endswith("items") else 2))
+        return [_sample(schema.get("items", {}), rng, name, query, position) for position in range(count)]
+    if kind == "integer":
+        low = schema.get("minimum")
+        high = schema.get("maximum")
+        if low is None and high is None:
+            # Positions in a list the prompt numbered (e.g. "story")
+            return index + 1
+        return rng.randint(low or 0, high if high is not None else (low or 0) + 10)
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 1.0)), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if name in ("query", "q"):
+        return query or "stock market"
+    if "ticker" in name or "symbol" in name:
+        return rng.choice(COMPANIES)[1]
+    if "compan" in name:
+        return rng.choice(COMPANIES)[0]
+    if "sector" in name:
+        return rng.choice(["Technology", "Energy", "Financials", "Healthcare", "Industrials"])
+    company, _ = rng.choice(COMPANIES)
+    return f"{company} {rng.choice(EVENTS)}, which moves sentiment across its sector."
+
+
+def _analysis_text(query: str, tool_results: List[str], rng: random.Random) -> str:
+    headlines = []
+    for result in tool_results:
+        try:
+            headlines.extend(story.get("headline", "") for story in json.loads(result).get("stories", []))
+        except (ValueError, AttributeError):
+            continue
+    headlines = [headline for headline in headlines if headline][:5] or [f"{c} {rng.choice(EVENTS)}" for c, _ in rng.sample(COMPANIES, 3)]
+    lines = [f"## Market analysis: {query or 'today'}", "", "**Key stories**"]
+    lines += [f"- {headline} — {rng.choice(['bullish', 'bearish', 'mixed'])} near-term impact." for headline in headlines]
+    lines += [
+        "",
+        "**Outlook**",
+        "Volatility is likely to stay elevated around these stories. "
+        "Watch guidance revisions and rate expectations before adding exposure.",
+    ]
+    return "\n".join(lines)
+
+
+def synthesize_message(body: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Anthropic Message for a request: a tool call on the first turn, a written answer once tools have run"""
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+    choice = (body.get("tool_choice") or {}).get("type", "auto")
+    query = _user_query(messages)
+    results = _tool_results(messages)
+
+    tool = None
+    if choice == "tool":
+        tool = next((item for item in tools if item["name"] == body["tool_choice"]["name"]), None)
+    elif choice in ("auto", "any") and tools and not results:
+        tool = tools[rng.randrange(len(tools))] if choice == "any" else tools[min(1, len(tools) - 1)]
+
+    if tool is not None:
+        content = [{
+            "type": "tool_use",
+            "id": f"toolu_{uuid.uuid4().hex[:24]}",
+            "name": tool["name"],
+            "input": _sample(tool.get("input_schema", {}), rng, tool["name"], query),
+        }]
+        stop_reason = "tool_use"
+    else:
+        content = [{"type": "text", "text": _analysis_text(query, results, rng)}]
+        stop_reason = "end_turn"
+
+    output_text = json.dumps(content)
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "standin"),
+        "content": content,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": len(json.dumps(body)) // CHARS_PER_TOKEN,
+            "output_tokens": len(output_text) // CHARS_PER_TOKEN,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        },
+    }
+
+
+def _chunks(text: str) -> List[str]:
+    size = TOKENS_PER_DELTA * CHARS_PER_TOKEN
+    return [text[start:start + size] for start in range(0, len(text), size)] or [""]
+
+
+def message_events(message: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """SSE events of a Message with the output tokens each one carries"""
+    usage = message["usage"]
+    start = {**message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 1}}
+    events = [(_sse({"type": "message_start", "message": start}), 0)]
+    for index, block in enumerate(message["content"]):
+        if block["type"] == "tool_use":
+            opened = {**block, "input": {}}
+            deltas = [{"type": "input_json_delta", "partial_json": chunk} for chunk in _chunks(json.dumps(block["input"]))]
+        else:
+            opened = {"type": "text", "text": ""}
+            deltas = [{"type": "text_delta", "text": chunk} for chunk in _chunks(block["text"])]
+        events.append((_sse({"type": "content_block_start", "index": index, "content_block": opened}), 0))
+        events += [(_sse({"type": "content_block_delta", "index": index, "delta": delta}), TOKENS_PER_DELTA) for delta in deltas]
+        events.append((_sse({"type": "content_block_stop", "index": index}), 0))
+    events.append((_sse({
+        "type": "message_delta",
+        "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+        "usage": {"output_tokens": usage["output_tokens"]},
+    }), 0))
+    events.append((_sse({"type": "message_stop"}), 0))
+    return events
+
+
+def recorded_events(body: str) -> List[Tuple[str, int]]:
+    # Split a recorded SSE body back into events, weighting deltas by their size
+    events = []
+    for raw in body.split("\n\n"):
+        if not raw.strip():
+            continue
+        tokens = max(len(raw) // (CHARS_PER_TOKEN * 4), 1) if "content_block_delta" in raw else 0
+        events.append((raw + "\n\n", tokens))
+    return events
+
+
+# News API
+
+def synthesize_articles(params: Dict[str, str], rng: random.Random) -> Dict[str, Any]:
+    page_size = min(int(params.get("pageSize", 20) or 20), 100)
+    # Topic before the OR-ed keywords NewsService appends
+    query = re.split(r"\s+(?:OR|AND)\s+|\s+finance\b", params.get("q") or "")[0].strip()
+    now = datetime.utcnow()
+    articles = []
+    for position in range(page_size):
+        if position % 4 == 3:
+            title = rng.choice(MACRO)
+        else:
+            company, _ = rng.choice(COMPANIES)
+            # Short topics (tickers, company names) read like a subject; longer queries don't
+            subject = query if query and len(query.split()) <= 3 and position % 2 == 0 else company
+            title = f"{subject} {rng.choice(EVENTS)}"
+        source = rng.choice(SOURCES)
+        published = now - timedelta(minutes=rng.randint(5, 24 * 60))
+        articles.append({
+            "source": {"id": None, "name": source},
+            "author": f"{source} staff",
+            "title": title,
+            "description": f"{title}. Analysts weigh what it means for earnings, guidance and the wider market.",
+            "url": f"https://example.com/{zlib.crc32(title.encode())}/{position}",
+            "urlToImage": None,
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": f"{title}. Investors reacted as the news crossed the wires…",
+        })
+    return {"status": "ok", "totalResults": page_size, "articles": articles}
+
+
+def create_app(entries: Optional[List[Dict[str, Any]]] = None, options: Optional[StandinOptions] = None) -> FastAPI:
+    options = options or StandinOptions()
+    library = ReplayLibrary(entries or [])
+    app = FastAPI(title="Wise Trade upstream stand-in")
+    app.state.library = library
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        fingerprint = request_fingerprint("anthropic", "/v1/messages", {}, body)
+        rng = _rng(options, fingerprint)
+        recorded = library.exact(fingerprint)
+        if recorded is None and options.strict:
+            return JSONResponse(
+                {"type": "error", "error": {"type": "not_found_error", "message": f"No recording for {fingerprint}"}},
+                status_code=404,
+            )
+
+        first_byte = options.first_byte_ms
+        if first_byte is None:
+            first_byte = (recorded or {}).get("first_byte_ms") or 300
+        per_token = 1.0 / options.tokens_per_second
+
+        if recorded is not None:
+            streamed = "text/event-stream" in recorded.get("content_type", "")
+            events = recorded_events(recorded["body"]) if streamed else None
+            message = None if streamed else json.loads(recorded["body"])
+        else:
+            library.stats["synthesized"] += 1
+            message = synthesize_message(body, rng)
+            events = message_events(message)
+
+        if not body.get("stream"):
+            if message is None:
+                return JSONResponse({"type": "error", "error": {"type": "invalid_request_error", "message": "Recording is streamed"}}, status_code=400)
+            generation = message["usage"]["output_tokens"] * per_token
+            await asyncio.sleep(_delay(options, first_byte / 1000 + generation, rng))
+            return JSONResponse(message)
+
+        async def stream():
+            await asyncio.sleep(_delay(options, first_byte / 1000, rng))
+            for raw, tokens in events:
+                if tokens:
+                    await asyncio.sleep(_delay(options, tokens * per_token, rng))
+                yield raw
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def news(endpoint: str, request: Request):
+        params = dict(request.query_params)
+        fingerprint = request_fingerprint("newsapi", f"/v2/{endpoint}", params, None)
+        rng = _rng(options, fingerprint)
+        recorded = library.exact(fingerprint) or library.any_for("newsapi", endpoint)
+        await asyncio.sleep(_delay(options, options.news_latency_ms / 1000, rng))
+        if recorded is not None:
+            return JSONResponse(json.loads(recorded["body"]), status_code=recorded["status"])
+        if options.strict:
+            return JSONResponse({"status": "error", "message": "No recording"}, status_code=404)
+        library.stats["synthesized"] += 1
+        return JSONResponse(synthesize_articles(params, rng))
+
+    @app.get("/v2/top-headlines")
+    async def top_headlines(request: Request):
+        return await news("top-headlines", request)
+
+    @app.get("/v2/everything")
+    async def everything(request: Request):
+        return await news("everything", request)
+
+    @app.get("/stats")
+    async def stats():
+        return library.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cassette", help="JSONL recording made with HTTP_RECORD_PATH")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-byte-ms", type=float, help="Time to first byte (default: as recorded, 300 when synthesized)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--news-latency-ms", type=float, default=150.0)
+    parser.add_argument("--strict", action="store_true", help="Fail unrecorded requests instead of synthesizing them")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    entries = Cassette.load(args.cassette) if args.cassette else []
+    options = StandinOptions(
+        first_byte_ms=args.first_byte_ms,
+        tokens_per_second=args.tokens_per_second,
+        jitter=args.jitter,
+        news_latency_ms=args.news_latency_ms,
+        strict=args.strict,
+        seed=args.seed,
+    )
+    print(f"🎭 Stand-in with {len(entries)} recorded exchanges on http://{args.host}:{args.port}")
+    started = time.monotonic()
+    uvicorn.run(create_app(entries, options), host=args.host, port=args.port, log_level="warning")
+    print(f"🎭 Stand-in stopped after {time.monotonic() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import socket
+from typing import Any, AsyncIterator, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.llm_governor import LLMOverloaded, set_request_context
+from app.LLM.api_agent import agent, analysis_cache_key, ANALYSIS_ERROR_PREFIX
+from app.models.ai_job import AIJob
+from app.repositories.ai_job_repository import AIJobRepository
+from app.schemas.ai_job_schema import AIJobCreate, AIJobRead
+from app.services.market_impact_service import MarketImpactService
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+# Wakes idle workers in this process as soon as a job is queued
+_job_available = asyncio.Event()
+
+
+class AIJobService:
+    """Mongo-backed queue for long-running AI analyses"""
+
+    def __init__(self):
+        self.job_repository = AIJobRepository()
+
+    @staticmethod
+    def to_read(job: AIJob, deduplicated: bool = False) -> AIJobRead:
+        return AIJobRead(
+            job_id=str(job.id),
+            job_type=job.job_type,
+            status=job.status,
+            deduplicated=deduplicated,
+            result=job.result,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+    async def submit(self, request: AIJobCreate, user_id: str) -> AIJobRead:
+        """
+        Queue an analysis, reusing a live job for the same normalized query/limit
+
+        Args:
+            request: Job type and its parameters
+            user_id: ID of the submitting user
+
+        Returns:
+            The queued (or reused) job
+        """
+        if request.job_type == "analyze_news":
+            query = (request.query or "").strip()
+            if not query:
+                raise HTTPException(status_code=400, detail="query is required for analyze_news jobs")
+            dedupe_key, params = analysis_cache_key(query), {"query": query}
+            reuse_seconds = settings.ANALYSIS_CACHE_TTL_SECONDS
+        else:
+            dedupe_key, params = f"market_impact_{request.limit}", {"limit": request.limit}
+            reuse_seconds = settings.MARKET_IMPACT_CACHE_TTL_SECONDS
+
+        # Completed results are reused only as long as the matching in-memory cache would keep them
+        job, created = await self.job_repository.enqueue(request.job_type, dedupe_key, params, user_id, reuse_seconds)
+        if created:
+            _job_available.set()
+        return self.to_read(job, deduplicated=not created)
+
+    async def get_job(self, job_id: str) -> AIJob:
+        if not ObjectId.is_valid(job_id):
+            raise HTTPException(status_code=404, detail="Job not found")
+        job = await self.job_repository.find_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    async def watch_job(self, job_id: str, poll_seconds: float = 1.0) -> AsyncIterator[AIJobRead]:
+        """Yield the job whenever its status changes, until it completes or fails"""
+        last_status = None
+        while True:
+            job = await self.get_job(job_id)
+            if job.status != last_status:
+                last_status = job.status
+                yield self.to_read(job)
+            if job.status in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(poll_seconds)
+
+
+async def _execute(job: AIJob) -> Tuple[str, Any, Optional[str]]:
+    """Run one job, returns (status, result, error)"""
+    # LLM usage of a job is attributed to the user who first requested it
+    requester = job.requested_by[0] if job.requested_by else None
+    set_request_context("background", requester or "system", user_id=requester)
+    if job.job_type == "analyze_news":
+        analysis = await agent.analyze_market_news(job.params.get("query", ""))
+        if analysis.startswith(ANALYSIS_ERROR_PREFIX):
+            return "failed", None, analysis
+        return "completed", analysis, None
+    if job.job_type == "market_impact":
+        result = await MarketImpactService().get_market_impact(int(job.params.get("limit", 10)))
+        if not result.get("success"):
+            return "failed", None, result.get("message", "Market impact analysis failed")
+        return "completed", result, None
+    return "failed", None, f"Unknown job type: {job.job_type}"
+
+
+async def _worker_loop(worker_id: str, poll_seconds: float):
+    job_repository = AIJobRepository()
+    while True:
+        try:
+            # Cleared before claiming so a job queued meanwhile is not missed
+            _job_available.clear()
+            job = await job_repository.claim_next(worker_id, settings.AI_JOB_LEASE_SECONDS, settings.AI_JOB_MAX_ATTEMPTS)
+            if job is None:
+                await job_repository.fail_exhausted(settings.AI_JOB_MAX_ATTEMPTS, settings.AI_JOB_RESULT_TTL_SECONDS)
+                try:
+                    await asyncio.wait_for(_job_available.wait(), timeout=poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                status, result, error = await _execute(job)
+            except LLMOverloaded as e:
+                # LLM capacity is busy with interactive traffic, retry the job later
+                await job_repository.requeue(job.id)
+                print(f"⏳ AI job {job.id} requeued, LLM busy (retry in {e.retry_after}s)")
+                await asyncio.sleep(e.retry_after)
+                continue
+            except Exception as e:
+                status, result, error = "failed", None, str(e)[:500]
+            await job_repository.finish(job.id, status, settings.AI_JOB_RESULT_TTL_SECONDS, result=result, error=error)
+            print(f"🤖 AI job {job.id} ({job.job_type}) {status} on {worker_id}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ AI job worker {worker_id} error: {e}")
+            await asyncio.sleep(poll_seconds)
+
+
+async def run_ai_job_workers(concurrency: int, poll_seconds: float):
+    """Run a pool of job workers; concurrency bounds how many analyses this process runs at once"""
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    await asyncio.gather(*(_worker_loop(f"{prefix}-{index}", poll_seconds) for index in range(concurrency)))
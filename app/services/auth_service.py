@@ -1,6 +1,7 @@
 from fastapi import HTTPException, BackgroundTasks
 from app.repositories.auth_repository import AuthRepository
 from app.schemas.auth_schema import AuthTokenRead, TokenPayload, LoginResponse
+from app.core.auth_user_cache import auth_user_cache
 from app.core.security import security_manager
 from typing import Optional
 from app.repositories.users_repository import UsersRepository
@@ -44,9 +45,12 @@ class AuthService:
         if not user.is_active:
             raise HTTPException(status_code=401, detail="User not active")
             
-        password_match = security_manager.verify_password(password, user.hashed_password)
+        password_match, upgraded_hash = await security_manager.verify_and_update_password_async(password, user.hashed_password)
         if not password_match:
             raise HTTPException(status_code=401, detail="Invalid credentials")
+        if upgraded_hash:
+            # Stored hash used a lower bcrypt cost than the current one
+            await self.users_repository.replace_password_hash(user.id, user.hashed_password, upgraded_hash)
         
         payload = TokenPayload(sub=user.id, first_name=user.first_name, last_name=user.last_name, email=user.email)
         payload_dict = payload.model_dump()
@@ -104,6 +108,7 @@ class AuthService:
             user_doc.is_verified = True
             user_doc.is_active = True
             await user_doc.save()
+            auth_user_cache.invalidate(user_id)
             
             try:
                 await self.auth_repository.delete_token(token)
@@ -178,7 +183,7 @@ class AuthService:
             if not user_doc:
                 return "User not found"
             
-            hashed_password = self.security_manager.get_password_hash(new_password)
+            hashed_password = await self.security_manager.get_password_hash_async(new_password)
             user_doc.hashed_password = hashed_password
             await user_doc.save()
             
@@ -0,0 +1,142 @@
+import asyncio
+from typing import List, Dict, Optional
+from datetime import datetime
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.config import settings
+from app.repositories.feed_repository import FeedRepository
+from app.repositories.news_article_repository import NewsArticleRepository
+from app.repositories.users_repository import UsersRepository
+from app.schemas.feed_schema import FeedItem, FeedPage, FollowsRead, FollowsUpdate
+from app.services.news_index import news_index
+from app.services.news_service import NewsService
+from app.services.ticker_tagger import ticker_tagger
+
+
+class FeedService:
+    """Personalized per-user news feeds, built by fanning out ingested articles on write"""
+
+    def __init__(self):
+        self.feed_repository = FeedRepository()
+        self.news_article_repository = NewsArticleRepository()
+        self.users_repository = UsersRepository()
+
+    async def get_follows(self, user_id: str) -> FollowsRead:
+        user = await self.users_repository.find_by_id(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return FollowsRead(
+            tickers=user.followed_tickers,
+            sectors=user.followed_sectors,
+            available_sectors=sorted(set(ticker_tagger.sectors.values())),
+        )
+
+    async def update_follows(self, user_id: str, follows: FollowsUpdate) -> FollowsRead:
+        tickers = sorted({ticker.strip().upper() for ticker in follows.tickers if ticker.strip()})
+        unknown_tickers = [ticker for ticker in tickers if ticker not in ticker_tagger.symbols]
+        if unknown_tickers:
+            raise HTTPException(status_code=400, detail=f"Unsupported tickers: {', '.join(unknown_tickers)}")
+
+        known_sectors = {sector.lower(): sector for sector in ticker_tagger.sectors.values()}
+        sectors = []
+        for sector in follows.sectors:
+            canonical = known_sectors.get(sector.strip().lower())
+            if not canonical:
+                raise HTTPException(status_code=400, detail=f"Unsupported sector: {sector}")
+            if canonical not in sectors:
+                sectors.append(canonical)
+
+        user = await self.users_repository.update_follows(user_id, tickers, sectors)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return await self.get_follows(user_id)
+
+    async def get_feed(self, user_id: str, cursor: Optional[str] = None, limit: int = 20) -> FeedPage:
+        """Read one page of a user's feed with a single indexed query"""
+        # Cursors are feed entry IDs; anything else is a client error, database errors propagate
+        if cursor is not None and not ObjectId.is_valid(cursor):
+            raise HTTPException(status_code=400, detail="Invalid feed cursor")
+        entries = await self.feed_repository.get_page(user_id, cursor=cursor, limit=limit + 1)
+
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        items = [
+            FeedItem(**entry.model_dump(exclude={"id", "user_id"}), id=str(entry.id))
+            for entry in entries
+        ]
+        next_cursor = items[-1].id if has_more and items else None
+        return FeedPage(items=items, next_cursor=next_cursor)
+
+    async def fan_out(self, articles: List[Dict]) -> int:
+        """
+        Persist newly ingested articles and append them to the feed of every follower
+
+        Args:
+            articles: Tagged articles from the news index
+
+        Returns:
+            Number of feed entries written
+        """
+        new_ids = set(await self.news_article_repository.upsert_many(articles))
+        articles = [art for art in articles if art["id"] in new_ids and (art.get("tickers") or art.get("sectors"))]
+        if not articles:
+            return 0
+
+        tickers = sorted({ticker for art in articles for ticker in art.get("tickers", [])})
+        sectors = sorted({sector for art in articles for sector in art.get("sectors", [])})
+        followers = await self.users_repository.find_followers(tickers, sectors)
+
+        entries = []
+        touched_users = set()
+        now = datetime.now()
+        for follower in followers:
+            user_id = str(follower["_id"])
+            followed_tickers = set(follower.get("followed_tickers") or [])
+            followed_sectors = set(follower.get("followed_sectors") or [])
+            for article in articles:
+                if followed_tickers.intersection(article.get("tickers", [])) or followed_sectors.intersection(article.get("sectors", [])):
+                    entries.append(self._to_entry(user_id, article, now))
+                    touched_users.add(user_id)
+
+        written = await self.feed_repository.append_entries(entries)
+        # Keep every touched feed bounded
+        await asyncio.gather(*(self.feed_repository.trim_feed(user_id, settings.FEED_MAX_ITEMS) for user_id in touched_users))
+        return written
+
+    @staticmethod
+    def _to_entry(user_id: str, article: Dict, created_at: datetime) -> Dict:
+        source = article.get("source")
+        sentiment = article.get("sentiment") or {}
+        return {
+            "user_id": user_id,
+            "article_id": article["id"],
+            "title": article.get("title") or "",
+            "description": article.get("description"),
+            "source": source.get("name") if isinstance(source, dict) else source,
+            "url": article.get("url"),
+            "published_at": article.get("publishedAt"),
+            "tickers": article.get("tickers", []),
+            "sectors": article.get("sectors", []),
+            "sentiment_label": sentiment.get("label"),
+            "sentiment_score": sentiment.get("score"),
+            "created_at": created_at,
+        }
+
+
+async def run_news_ingestion_loop(interval_seconds: int):
+    """Periodically pull headlines and fan newly indexed articles out to user feeds"""
+    news_service = NewsService()
+    feed_service = FeedService()
+    while True:
+        try:
+            # Headline fetches index their articles as a side effect
+            await news_service.fetch_top_headlines_async(category="business", page_size=100)
+            pending = news_index.drain_pending()
+            if pending:
+                written = await feed_service.fan_out(pending)
+                print(f"📰 Ingested {len(pending)} articles, {written} feed entries written")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ News ingestion failed: {e}")
+        await asyncio.sleep(interval_seconds)
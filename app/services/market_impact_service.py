@@ -0,0 +1,89 @@
+import asyncio
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.LLM.api_agent import agent
+from app.repositories.market_impact_snapshot_repository import MarketImpactSnapshotRepository
+
+# limit -> {"result": ..., "generated_at": UTC datetime}, shared by all requests in this process
+_snapshots: Dict[int, Dict] = {}
+
+
+class MarketImpactService:
+    """Serves market-impact rankings from precomputed snapshots, computing on demand only as a fallback"""
+
+    def __init__(self):
+        self.snapshot_repository = MarketImpactSnapshotRepository()
+
+    @staticmethod
+    def _is_fresh(snapshot: Dict) -> bool:
+        age = datetime.utcnow() - snapshot["generated_at"]
+        return age <= timedelta(seconds=settings.MARKET_IMPACT_SNAPSHOT_MAX_AGE_SECONDS)
+
+    @staticmethod
+    def _from_snapshot(snapshot: Dict, limit: int) -> Dict:
+        result = dict(snapshot["result"])
+        # A snapshot for a larger limit also answers smaller ones (items are ranked)
+        result["news_items"] = result.get("news_items", [])[:limit]
+        result["generated_at"] = snapshot["generated_at"].isoformat() + "Z"
+        return result
+
+    def get_snapshot(self, limit: int) -> Optional[Dict]:
+        """Fresh snapshot for the smallest precomputed limit that covers the requested one"""
+        for snapshot_limit in sorted(_snapshots):
+            snapshot = _snapshots[snapshot_limit]
+            if snapshot_limit >= limit and self._is_fresh(snapshot):
+                return self._from_snapshot(snapshot, limit)
+        return None
+
+    async def get_market_impact(self, limit: int = 10) -> Dict:
+        """
+        Market-impact news for a limit
+
+        Args:
+            limit: Number of news items
+
+        Returns:
+            The precomputed snapshot when one exists, otherwise a freshly computed result
+        """
+        snapshot = self.get_snapshot(limit)
+        if snapshot is not None:
+            return snapshot
+        return await agent.find_market_impact_news(limit)
+
+    async def load_snapshots(self) -> int:
+        """Load stored snapshots (e.g. computed by another instance) into memory"""
+        for stored in await self.snapshot_repository.find_all_snapshots():
+            current = _snapshots.get(stored.limit)
+            if current is None or stored.generated_at > current["generated_at"]:
+                _snapshots[stored.limit] = {"result": stored.result, "generated_at": stored.generated_at}
+        return len(_snapshots)
+
+    async def refresh(self, limit: int) -> bool:
+        """Recompute and store the snapshot for one limit, keeps the previous one on failure"""
+        result = await agent.refresh_market_impact_news(limit)
+        if not result.get("success") or not result.get("news_items") or result.get("degraded"):
+            print(f"⚠️ Market impact refresh for limit={limit} failed: {result.get('message', 'no items')}")
+            return False
+        generated_at = datetime.utcnow()
+        _snapshots[limit] = {"result": result, "generated_at": generated_at}
+        await self.snapshot_repository.save_snapshot(limit, result, generated_at)
+        return True
+
+
+async def run_market_impact_scheduler(limit: int, interval_seconds: int):
+    """Recompute the market-impact snapshot on a fixed cadence (one ranking, sliced for smaller limits)"""
+    service = MarketImpactService()
+    while True:
+        try:
+            await service.load_snapshots()
+            snapshot = _snapshots.get(limit)
+            # Skip when another instance refreshed it recently
+            if not snapshot or datetime.utcnow() - snapshot["generated_at"] >= timedelta(seconds=interval_seconds * 0.8):
+                if await service.refresh(limit):
+                    print(f"📈 Market impact snapshot refreshed (limit={limit})")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Market impact scheduler failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List
+from app.core.config import settings
+from app.services.ticker_tagger import ticker_tagger
+from app.services.sentiment_service import sentiment_scorer
+
+
+def article_id_for(article: Dict) -> str:
+    """Stable ID for a News API article (URL based, falls back to title)"""
+    key = article.get("url") or f"{article.get('title', '')}|{article.get('publishedAt', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class NewsIndex:
+    """In-memory store of ingested articles with a ticker -> articles inverted index"""
+
+    def __init__(self, max_articles: int = 5000):
+        self.max_articles = max_articles
+        self._articles: "OrderedDict[str, Dict]" = OrderedDict()
+        self._by_ticker: Dict[str, "OrderedDict[str, None]"] = {}
+        # Newly indexed articles waiting to be persisted and fanned out to feeds
+        self._pending: deque = deque(maxlen=max_articles)
+        self._lock = threading.Lock()
+
+    def ingest(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Tag and score articles and add them to the index
+
+        Articles are updated in place with "id", "tickers", "sectors" and "sentiment" keys;
+        already indexed articles get the stored values copied over.
+
+        Args:
+            articles: List of News API article dictionaries
+
+        Returns:
+            The articles that were not already indexed
+        """
+        new_articles = []
+        for article in articles:
+            if not isinstance(article, dict) or not (article.get("title") or article.get("url")):
+                continue
+            article_id = article.get("id") or article_id_for(article)
+            article["id"] = article_id
+            with self._lock:
+                stored = self._articles.get(article_id)
+            if stored is not None:
+                article.setdefault("tickers", stored.get("tickers", []))
+                article.setdefault("sectors", stored.get("sectors", []))
+                if "sentiment" in stored:
+                    article.setdefault("sentiment", stored["sentiment"])
+                continue
+            if "tickers" not in article:
+                article["tickers"] = ticker_tagger.tag_article(article)
+            article["sectors"] = ticker_tagger.sectors_for(article["tickers"])
+            new_articles.append(article)
+
+        if not new_articles:
+            return []
+        # Score the whole batch at once
+        sentiment_scorer.score_articles([art for art in new_articles if "sentiment" not in art])
+
+        with self._lock:
+            for article in new_articles:
+                self._articles[article["id"]] = article
+                for ticker in article["tickers"]:
+                    self._by_ticker.setdefault(ticker, OrderedDict())[article["id"]] = None
+                self._pending.append(article)
+            self._evict_locked()
+        return new_articles
+
+    def _evict_locked(self) -> None:
+        while len(self._articles) > self.max_articles:
+            article_id, article = self._articles.popitem(last=False)
+            for ticker in article.get("tickers", []):
+                postings = self._by_ticker.get(ticker)
+                if postings is not None:
+                    postings.pop(article_id, None)
+                    if not postings:
+                        del self._by_ticker[ticker]
+
+    def find_by_ticker(self, symbol: str, limit: int = 20) -> List[Dict]:
+        """Most recently published indexed articles mentioning a ticker"""
+        with self._lock:
+            postings = self._by_ticker.get(symbol.upper())
+            if not postings:
+                return []
+            articles = [self._articles[article_id] for article_id in postings]
+        articles.sort(key=lambda art: art.get("publishedAt") or "", reverse=True)
+        return articles[:limit]
+
+    def drain_pending(self) -> List[Dict]:
+        """Take all articles indexed since the last drain"""
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        return pending
+
+    def get(self, article_id: str) -> Dict | None:
+        with self._lock:
+            return self._articles.get(article_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"articles": len(self._articles), "tickers": len(self._by_ticker)}
+
+
+news_index = NewsIndex(max_articles=settings.NEWS_INDEX_MAX_ARTICLES)
@@ -1,11 +1,31 @@
+import asyncio
+import httpx
 import requests
 import urllib3
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from app.core.config import settings
+from app.core.recording import async_recording_transport
+from app.services.news_index import news_index
+from app.services.sentiment_service import sentiment_scorer
 
 # Disable SSL warnings for development environments (WSL/common SSL cert issues)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Shared async HTTP clients, one per (event loop, verify) so connections are pooled across requests
+_async_clients: Dict[Tuple[int, bool], httpx.AsyncClient] = {}
+
+
+def _get_async_client(verify: bool) -> httpx.AsyncClient:
+    key = (id(asyncio.get_running_loop()), verify)
+    client = _async_clients.get(key)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        # Recorded for replay when HTTP_RECORD_PATH is set
+        transport = async_recording_transport("newsapi", verify=verify, limits=limits)
+        client = httpx.AsyncClient(verify=verify, limits=limits, transport=transport)
+        _async_clients[key] = client
+    return client
+
 
 class NewsService:
     """Service to fetch news from News API"""
@@ -16,23 +36,14 @@ class NewsService:
         # Try to verify SSL, but fallback to False if certificates are missing (WSL issue)
         self.verify_ssl = True
     
-    def fetch_top_headlines(self, 
-                           category: Optional[str] = None,
-                           country: str = "us",
-                           query: Optional[str] = None,
-                           page_size: int = 20) -> Dict:
-        """
-        Fetch top headlines from News API
-        
-        Args:
-            category: Category of news (business, technology, general, etc.)
-            country: Country code (default: us)
-            query: Search query/keywords
-            page_size: Number of articles to fetch (max 100)
-        
-        Returns:
-            Dictionary containing articles and metadata
-        """
+    def _ingest(self, result: Dict) -> Dict:
+        """Tag fetched articles with tickers and add them to the local news index"""
+        articles = result.get("articles")
+        if isinstance(articles, list):
+            news_index.ingest(articles)
+        return result
+    
+    def _top_headlines_request(self, category: Optional[str], country: str, query: Optional[str], page_size: int) -> Tuple[str, Dict]:
         url = f"{self.base_url}/top-headlines"
         params = {
             "apiKey": self.api_key,
@@ -45,22 +56,84 @@ class NewsService:
             params["country"] = country
         if query:
             params["q"] = query
+        return url, params
+    
+    def _everything_request(self, query: str, sort_by: str, language: str, page_size: int,
+                            from_date: Optional[str], to_date: Optional[str]) -> Tuple[str, Dict]:
+        url = f"{self.base_url}/everything"
+        params = {
+            "apiKey": self.api_key,
+            "q": query,
+            "sortBy": sort_by,
+            "language": language,
+            "pageSize": min(page_size, 100),
+        }
         
+        if from_date:
+            params["from"] = from_date
+        if to_date:
+            params["to"] = to_date
+        return url, params
+    
+    def _get(self, url: str, params: Dict) -> Dict:
         try:
             # Try with SSL verification first
             try:
                 response = requests.get(url, params=params, timeout=5, verify=self.verify_ssl)
                 response.raise_for_status()
-                return response.json()
+                return self._ingest(response.json())
             except requests.exceptions.SSLError:
                 # If SSL verification fails, retry without verification (WSL/common issue)
                 self.verify_ssl = False
                 response = requests.get(url, params=params, timeout=5, verify=False)
                 response.raise_for_status()
-                return response.json()
+                return self._ingest(response.json())
         except requests.exceptions.RequestException as e:
             return {"error": str(e), "articles": []}
     
+    async def _get_async(self, url: str, params: Dict) -> Dict:
+        try:
+            # Try with SSL verification first
+            try:
+                response = await _get_async_client(self.verify_ssl).get(url, params=params, timeout=5)
+            except httpx.ConnectError as e:
+                if not self.verify_ssl or "certificate" not in str(e).lower():
+                    raise
+                # If SSL verification fails, retry without verification (WSL/common issue)
+                self.verify_ssl = False
+                response = await _get_async_client(False).get(url, params=params, timeout=5)
+            response.raise_for_status()
+            return self._ingest(response.json())
+        except httpx.HTTPError as e:
+            return {"error": str(e), "articles": []}
+    
+    def fetch_top_headlines(self, 
+                           category: Optional[str] = None,
+                           country: str = "us",
+                           query: Optional[str] = None,
+                           page_size: int = 20) -> Dict:
+        """
+        Fetch top headlines from News API
+        
+        Args:
+            category: Category of news (business, technology, general, etc.)
+            country: Country code (default: us)
+            query: Search query/keywords
+            page_size: Number of articles to fetch (max 100)
+        
+        Returns:
+            Dictionary containing articles and metadata
+        """
+        return self._get(*self._top_headlines_request(category, country, query, page_size))
+    
+    async def fetch_top_headlines_async(self,
+                                        category: Optional[str] = None,
+                                        country: str = "us",
+                                        query: Optional[str] = None,
+                                        page_size: int = 20) -> Dict:
+        """Async version of fetch_top_headlines (non-blocking, pooled connections)"""
+        return await self._get_async(*self._top_headlines_request(category, country, query, page_size))
+    
     def fetch_everything(self,
                         query: str,
                         sort_by: str = "publishedAt",
@@ -82,34 +155,17 @@ class NewsService:
         Returns:
             Dictionary containing articles and metadata
         """
-        url = f"{self.base_url}/everything"
-        params = {
-            "apiKey": self.api_key,
-            "q": query,
-            "sortBy": sort_by,
-            "language": language,
-            "pageSize": min(page_size, 100),
-        }
-        
-        if from_date:
-            params["from"] = from_date
-        if to_date:
-            params["to"] = to_date
-        
-        try:
-            # Try with SSL verification first
-            try:
-                response = requests.get(url, params=params, timeout=5, verify=self.verify_ssl)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.SSLError:
-                # If SSL verification fails, retry without verification (WSL/common issue)
-                self.verify_ssl = False
-                response = requests.get(url, params=params, timeout=5, verify=False)
-                response.raise_for_status()
-                return response.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e), "articles": []}
+        return self._get(*self._everything_request(query, sort_by, language, page_size, from_date, to_date))
+    
+    async def fetch_everything_async(self,
+                                     query: str,
+                                     sort_by: str = "publishedAt",
+                                     language: str = "en",
+                                     page_size: int = 20,
+                                     from_date: Optional[str] = None,
+                                     to_date: Optional[str] = None) -> Dict:
+        """Async version of fetch_everything"""
+        return await self._get_async(*self._everything_request(query, sort_by, language, page_size, from_date, to_date))
     
     def fetch_financial_news(self, query: Optional[str] = None, page_size: int = 20) -> Dict:
         """
@@ -134,6 +190,35 @@ class NewsService:
                 page_size=page_size
             )
     
+    async def fetch_financial_news_async(self, query: Optional[str] = None, page_size: int = 20) -> Dict:
+        """Async version of fetch_financial_news"""
+        if query:
+            return await self.fetch_everything_async(
+                query=f"{query} finance OR stock OR market OR trading",
+                sort_by="publishedAt",
+                page_size=page_size
+            )
+        else:
+            return await self.fetch_top_headlines_async(
+                category="business",
+                page_size=page_size
+            )
+    
+    def _local_stock_news(self, symbol: str, page_size: int) -> Optional[Dict]:
+        """Serve from the local ticker index when it already has enough coverage"""
+        local_articles = news_index.find_by_ticker(symbol, limit=page_size)
+        if len(local_articles) >= min(page_size, settings.NEWS_INDEX_MIN_HITS):
+            return {"status": "ok", "totalResults": len(local_articles), "articles": local_articles, "source": "local_index"}
+        return None
+    
+    @staticmethod
+    def _keep_tagged(symbol: str, result: Dict) -> Dict:
+        """Drop search noise: keep only articles actually tagged with the ticker"""
+        tagged = [art for art in result.get("articles", []) if symbol in art.get("tickers", [])]
+        if tagged:
+            result["articles"] = tagged
+        return result
+    
     def fetch_stock_specific_news(self, symbol: str, page_size: int = 20) -> Dict:
         """
         Fetch news specific to a stock symbol
@@ -145,11 +230,31 @@ class NewsService:
         Returns:
             Dictionary containing stock-specific news articles
         """
-        return self.fetch_everything(
+        symbol = symbol.upper()
+        local = self._local_stock_news(symbol, page_size)
+        if local:
+            return local
+        
+        result = self.fetch_everything(
             query=f"{symbol} stock OR company OR earnings",
             sort_by="publishedAt",
             page_size=page_size
         )
+        return self._keep_tagged(symbol, result)
+    
+    async def fetch_stock_specific_news_async(self, symbol: str, page_size: int = 20) -> Dict:
+        """Async version of fetch_stock_specific_news"""
+        symbol = symbol.upper()
+        local = self._local_stock_news(symbol, page_size)
+        if local:
+            return local
+        
+        result = await self.fetch_everything_async(
+            query=f"{symbol} stock OR company OR earnings",
+            sort_by="publishedAt",
+            page_size=page_size
+        )
+        return self._keep_tagged(symbol, result)
     
     def extract_key_info(self, articles: List[Dict]) -> List[Dict]:
         """
@@ -169,6 +274,43 @@ class NewsService:
                 "source": article.get("source", {}).get("name", ""),
                 "publishedAt": article.get("publishedAt", ""),
                 "url": article.get("url", ""),
+                "tickers": article.get("tickers", []),
+                "sentiment": article.get("sentiment"),
             })
         return key_info
-
+    
+    def get_symbol_sentiment(self, symbol: str, page_size: int = 20) -> Dict:
+        """
+        Lexicon sentiment for recent news on a stock symbol
+        
+        Args:
+            symbol: Stock ticker symbol (e.g., AAPL, TSLA)
+            page_size: Number of articles to score
+        
+        Returns:
+            Dictionary with per-article scores and an aggregate summary
+        """
+        symbol = symbol.upper()
+        result = self.fetch_stock_specific_news(symbol, page_size=page_size)
+        if "error" in result:
+            return {"symbol": symbol, "error": result["error"], "articles": []}
+        
+        articles = result.get("articles", [])[:page_size]
+        unscored = [art for art in articles if "sentiment" not in art]
+        if unscored:
+            sentiment_scorer.score_articles(unscored)
+        
+        scores = [art["sentiment"]["score"] for art in articles]
+        labels = [art["sentiment"]["label"] for art in articles]
+        average = round(sum(scores) / len(scores), 4) if scores else 0.0
+        return {
+            "symbol": symbol,
+            "summary": {
+                "average_score": average,
+                "label": sentiment_scorer.label(average),
+                "positive": labels.count("positive"),
+                "negative": labels.count("negative"),
+                "neutral": labels.count("neutral"),
+            },
+            "articles": self.extract_key_info(articles),
+        }
@@ -0,0 +1,157 @@
+import re
+from typing import Dict, List
+import numpy as np
+
+# Finance-oriented sentiment lexicon (word -> polarity weight)
+FINANCE_LEXICON: Dict[str, float] = {
+    # Positive
+    "beat": 2.0, "beats": 2.0, "surge": 2.5, "surges": 2.5, "surged": 2.5, "soar": 2.5, "soars": 2.5,
+    "soared": 2.5, "rally": 2.0, "rallies": 2.0, "rallied": 2.0, "jump": 1.8, "jumps": 1.8, "jumped": 1.8,
+    "gain": 1.5, "gains": 1.5, "gained": 1.5, "rise": 1.2, "rises": 1.2, "rose": 1.2, "climb": 1.3,
+    "climbs": 1.3, "climbed": 1.3, "record": 1.5, "high": 0.8, "highs": 1.0, "upgrade": 2.0,
+    "upgrades": 2.0, "upgraded": 2.0, "outperform": 2.0, "outperforms": 2.0, "bullish": 2.5,
+    "growth": 1.5, "grow": 1.2, "grows": 1.2, "profit": 1.5, "profits": 1.5, "profitable": 1.8,
+    "strong": 1.5, "stronger": 1.5, "robust": 1.5, "boost": 1.5, "boosts": 1.5, "boosted": 1.5,
+    "expand": 1.0, "expands": 1.0, "expansion": 1.0, "optimism": 2.0, "optimistic": 2.0,
+    "recovery": 1.5, "recover": 1.3, "recovers": 1.3, "rebound": 1.8, "rebounds": 1.8,
+    "approval": 1.5, "approved": 1.5, "approves": 1.5, "win": 1.5, "wins": 1.5, "won": 1.3,
+    "exceed": 1.8, "exceeds": 1.8, "exceeded": 1.8, "dividend": 0.8, "buyback": 1.2, "buybacks": 1.2,
+    "raise": 1.0, "raises": 1.0, "raised": 1.0, "positive": 1.5, "improve": 1.3, "improves": 1.3,
+    "improved": 1.3, "breakthrough": 2.0, "momentum": 1.0, "upside": 1.5, "tops": 1.5, "topped": 1.5,
+    # Negative
+    "miss": -2.0, "misses": -2.0, "missed": -2.0, "plunge": -2.8, "plunges": -2.8, "plunged": -2.8,
+    "crash": -3.0, "crashes": -3.0, "crashed": -3.0, "tumble": -2.3, "tumbles": -2.3, "tumbled": -2.3,
+    "slump": -2.2, "slumps": -2.2, "slumped": -2.2, "fall": -1.3, "falls": -1.3, "fell": -1.3,
+    "drop": -1.5, "drops": -1.5, "dropped": -1.5, "decline": -1.5, "declines": -1.5, "declined": -1.5,
+    "slide": -1.5, "slides": -1.5, "sink": -1.8, "sinks": -1.8, "sank": -1.8, "loss": -1.8,
+    "losses": -1.8, "lose": -1.5, "loses": -1.5, "downgrade": -2.0, "downgrades": -2.0,
+    "downgraded": -2.0, "underperform": -2.0, "bearish": -2.5, "weak": -1.5, "weaker": -1.5,
+    "weakness": -1.5, "cut": -1.2, "cuts": -1.2, "layoff": -2.0, "layoffs": -2.0, "fraud": -3.0,
+    "lawsuit": -1.8, "lawsuits": -1.8, "probe": -1.5, "investigation": -1.5, "recall": -1.8,
+    "recalls": -1.8, "bankruptcy": -3.0, "bankrupt": -3.0, "default": -2.5, "defaults": -2.5,
+    "recession": -2.5, "inflation": -1.0, "volatile": -1.0, "volatility": -1.0, "fear": -2.0,
+    "fears": -2.0, "concern": -1.2, "concerns": -1.2, "worry": -1.5, "worries": -1.5,
+    "warning": -1.8, "warns": -1.8, "warned": -1.8, "risk": -0.8, "risks": -0.8, "selloff": -2.3,
+    "sell-off": -2.3, "fined": -1.8, "penalty": -1.8, "delay": -1.2, "delays": -1.2,
+    "delayed": -1.2, "shortage": -1.5, "downturn": -2.0, "slowdown": -1.8, "tariff": -1.2,
+    "tariffs": -1.2, "negative": -1.5, "halt": -1.8, "halts": -1.8, "halted": -1.8, "downside": -1.5,
+    "uncertainty": -1.3, "sanctions": -1.5, "strike": -1.2, "breach": -2.0, "hack": -2.0,
+}
+
+NEGATIONS = {
+    "not", "no", "never", "without", "neither", "nor", "hardly", "barely", "fails", "failed",
+    "don't", "doesn't", "didn't", "isn't", "aren't", "wasn't", "weren't", "won't", "can't",
+    "cannot", "couldn't", "shouldn't", "wouldn't", "hasn't", "haven't", "hadn't",
+}
+
+# Sentiment words within this many tokens after a negation get flipped
+NEGATION_WINDOW = 3
+# Damping applied to flipped words ("not bad" is milder than "good")
+NEGATION_SCALAR = -0.74
+# Normalization constant mapping raw sums into [-1, 1]
+NORMALIZATION_ALPHA = 15.0
+NEUTRAL_THRESHOLD = 0.05
+
+_DOC_SEPARATOR = "\x1e"
+_TOKEN_RE = re.compile(r"[a-z]+(?:['\-][a-z]+)*|\x1e")
+
+
+class SentimentScorer:
+    """Deterministic lexicon-based sentiment scoring for financial headlines, vectorized over batches"""
+
+    def __init__(self, lexicon: Dict[str, float] = FINANCE_LEXICON, negations=NEGATIONS):
+        self.vocabulary = sorted(lexicon)
+        self._token_ids = {token: index for index, token in enumerate(self.vocabulary)}
+        self.weights = np.array([lexicon[token] for token in self.vocabulary], dtype=np.float64)
+        self.vocab_size = len(self.vocabulary)
+        # Special ids: negation markers and document separators (never scored)
+        self._negation_id = self.vocab_size
+        self._separator_id = self.vocab_size + 1
+        for token in negations:
+            self._token_ids[token] = self._negation_id
+        self._token_ids[_DOC_SEPARATOR] = self._separator_id
+
+    def _token_matrix(self, texts: List[str]):
+        """
+        Build (plain, negated) document x vocabulary count matrices for a batch
+
+        The whole batch is tokenized with a single regex pass; token lookup,
+        negation scoping and counting are all numpy array operations.
+        """
+        n_docs = len(texts)
+        shape = (n_docs, self.vocab_size)
+        joined = _DOC_SEPARATOR.join(texts).lower()
+        tokens = _TOKEN_RE.findall(joined)
+        if not tokens:
+            return np.zeros(shape), np.zeros(shape)
+
+        unique_tokens, inverse = np.unique(np.array(tokens, dtype=object), return_inverse=True)
+        unique_ids = np.array([self._token_ids.get(token, -1) for token in unique_tokens], dtype=np.int64)
+        ids = unique_ids[inverse]
+
+        separators = ids == self._separator_id
+        doc_index = np.cumsum(separators)
+
+        # A token is negated when a negation word precedes it in the same document within the window
+        is_negation = ids == self._negation_id
+        negated = np.zeros(len(ids), dtype=bool)
+        for offset in range(1, NEGATION_WINDOW + 1):
+            shifted = np.zeros(len(ids), dtype=bool)
+            shifted[offset:] = is_negation[:-offset] & (doc_index[offset:] == doc_index[:-offset])
+            negated |= shifted
+
+        scored = (ids >= 0) & (ids < self.vocab_size)
+        flat = doc_index[scored] * self.vocab_size + ids[scored]
+        plain = np.bincount(flat[~negated[scored]], minlength=n_docs * self.vocab_size)
+        flipped = np.bincount(flat[negated[scored]], minlength=n_docs * self.vocab_size)
+        return plain.reshape(shape).astype(np.float64), flipped.reshape(shape).astype(np.float64)
+
+    def score_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Score a batch of texts
+
+        Args:
+            texts: Headlines or other short texts
+
+        Returns:
+            Array of compound scores in [-1, 1]
+        """
+        if not texts:
+            return np.zeros(0)
+        plain, flipped = self._token_matrix([text or "" for text in texts])
+        raw = plain @ self.weights + NEGATION_SCALAR * (flipped @ self.weights)
+        return raw / np.sqrt(raw * raw + NORMALIZATION_ALPHA)
+
+    @staticmethod
+    def label(score: float) -> str:
+        if score >= NEUTRAL_THRESHOLD:
+            return "positive"
+        if score <= -NEUTRAL_THRESHOLD:
+            return "negative"
+        return "neutral"
+
+    def score_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Attach a "sentiment" dict to each News API article (in place)"""
+        texts = [f"{art.get('title') or ''}. {art.get('description') or ''}" for art in articles]
+        scores = self.score_texts(texts)
+        for article, score in zip(articles, scores):
+            article["sentiment"] = {"score": round(float(score), 4), "label": self.label(score)}
+        return articles
+
+    def rank_by_impact(self, articles: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Pre-rank articles by sentiment strength so only the strongest candidates reach the LLM
+
+        Articles without scores are scored first. Ties keep the original order.
+        """
+        unscored = [art for art in articles if "sentiment" not in art]
+        if unscored:
+            self.score_articles(unscored)
+        strength = np.array([abs(art["sentiment"]["score"]) for art in articles])
+        mentions = np.array([len(art.get("tickers", [])) for art in articles])
+        # Stable sort on (-strength, -mentions)
+        order = np.lexsort((-mentions, -strength))
+        return [articles[index] for index in order[:top_k]]
+
+
+sentiment_scorer = SentimentScorer()
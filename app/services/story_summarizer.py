@@ -0,0 +1,164 @@
+import re
+from typing import Dict, List, Optional
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+_TRUNCATION_RE = re.compile(r"\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]$")
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with", "at", "by", "from",
+    "as", "is", "are", "was", "were", "be", "been", "it", "its", "this", "that", "these", "those",
+    "after", "before", "over", "into", "about", "amid", "says", "said", "will", "would", "could",
+    "has", "have", "had", "new", "not", "s", "he", "she", "they", "we", "you", "his", "her", "their",
+}
+
+# Articles join an existing story when their cosine similarity to its centroid reaches this
+STORY_SIMILARITY_THRESHOLD = 0.2
+SUMMARY_SENTENCES = 2
+SUMMARY_MAX_CHARS = 320
+
+
+def _tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _clean(text: Optional[str]) -> str:
+    return _TRUNCATION_RE.sub("", (text or "").strip())
+
+
+class StorySummarizer:
+    """Groups articles into stories and writes a short extractive summary for each"""
+
+    def __init__(self, similarity_threshold: float = STORY_SIMILARITY_THRESHOLD, summary_sentences: int = SUMMARY_SENTENCES):
+        self.similarity_threshold = similarity_threshold
+        self.summary_sentences = summary_sentences
+
+    @staticmethod
+    def _tfidf(documents: List[List[str]], vocabulary: Dict[str, int], idf: np.ndarray) -> np.ndarray:
+        """L2-normalized TF-IDF matrix for tokenized documents"""
+        rows, cols = [], []
+        for row, tokens in enumerate(documents):
+            for token in tokens:
+                col = vocabulary.get(token)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        counts = np.zeros((len(documents), len(vocabulary)))
+        if rows:
+            np.add.at(counts, (np.array(rows), np.array(cols)), 1.0)
+        matrix = counts * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _cluster(self, vectors: np.ndarray) -> List[List[int]]:
+        """Single-pass centroid clustering, clusters keep the order of their first article"""
+        clusters: List[List[int]] = []
+        centroids: List[np.ndarray] = []
+        for index, vector in enumerate(vectors):
+            best, best_score = -1, self.similarity_threshold
+            if centroids and vector.any():
+                scores = np.array(centroids) @ vector
+                candidate = int(np.argmax(scores))
+                if scores[candidate] >= best_score:
+                    best = candidate
+            if best < 0:
+                clusters.append([index])
+                centroids.append(vector.copy())
+                continue
+            clusters[best].append(index)
+            centroid = vectors[clusters[best]].mean(axis=0)
+            norm = np.linalg.norm(centroid)
+            centroids[best] = centroid / norm if norm else centroid
+        return clusters
+
+    def _summarize(self, sentences: List[str], vocabulary: Dict[str, int], idf: np.ndarray) -> str:
+        """Pick the most central sentences (degree centrality over TF-IDF cosine similarity)"""
+        if len(sentences) <= self.summary_sentences:
+            chosen = sentences
+        else:
+            vectors = self._tfidf([_tokenize(sentence) for sentence in sentences], vocabulary, idf)
+            similarity = vectors @ vectors.T
+            np.fill_diagonal(similarity, 0.0)
+            centrality = similarity.sum(axis=1)
+            top = sorted(np.argsort(-centrality, kind="stable")[: self.summary_sentences])
+            chosen = [sentences[index] for index in top]
+        summary = " ".join(chosen)
+        if len(summary) > SUMMARY_MAX_CHARS:
+            summary = summary[: SUMMARY_MAX_CHARS - 1].rsplit(" ", 1)[0] + "…"
+        return summary
+
+    def build_stories(self, articles: List[Dict], max_stories: Optional[int] = None) -> List[Dict]:
+        """
+        Cluster News API articles into stories with extractive digests
+
+        Args:
+            articles: News API article dictionaries (optionally tagged/scored)
+            max_stories: Optional cap on the number of stories returned
+
+        Returns:
+            List of story digests, in order of each story's first article
+        """
+        articles = [art for art in articles if isinstance(art, dict) and art.get("title")]
+        if not articles:
+            return []
+
+        documents = [_tokenize(f"{art.get('title', '')} {_clean(art.get('description'))}") for art in articles]
+        vocabulary: Dict[str, int] = {}
+        for tokens in documents:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        if not vocabulary:
+            vocabulary = {"": 0}
+        document_frequency = np.zeros(len(vocabulary))
+        for tokens in documents:
+            for token in set(tokens):
+                document_frequency[vocabulary[token]] += 1
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1.0
+
+        vectors = self._tfidf(documents, vocabulary, idf)
+        stories = []
+        for members in self._cluster(vectors):
+            cluster_articles = [articles[index] for index in members]
+            # The member closest to the rest of the cluster provides the headline
+            if len(members) > 1:
+                similarity = vectors[members] @ vectors[members].T
+                lead = members[int(np.argmax(similarity.sum(axis=1)))]
+            else:
+                lead = members[0]
+            lead_article = articles[lead]
+
+            sentences, seen = [], set()
+            for article in cluster_articles:
+                for sentence in _SENTENCE_SPLIT_RE.split(_clean(article.get("description"))):
+                    sentence = sentence.strip()
+                    key = sentence.lower()
+                    if len(key) > 20 and key not in seen:
+                        seen.add(key)
+                        sentences.append(sentence if sentence[-1] in ".!?" else f"{sentence}.")
+
+            sources = []
+            for article in cluster_articles:
+                source = article.get("source")
+                name = source.get("name") if isinstance(source, dict) else source
+                if name and name not in sources:
+                    sources.append(name)
+
+            scores = [art["sentiment"]["score"] for art in cluster_articles if art.get("sentiment")]
+            stories.append({
+                "headline": lead_article.get("title", ""),
+                "summary": self._summarize(sentences, vocabulary, idf) if sentences else "",
+                "sources": sources,
+                "article_count": len(cluster_articles),
+                "tickers": sorted({ticker for art in cluster_articles for ticker in art.get("tickers", [])}),
+                "sentiment": round(sum(scores) / len(scores), 3) if scores else None,
+                "published_at": max((art.get("publishedAt") or "" for art in cluster_articles), default=""),
+                "url": lead_article.get("url", ""),
+            })
+            if max_stories and len(stories) >= max_stories:
+                break
+        return stories
+
+
+story_summarizer = StorySummarizer()
@@ -0,0 +1,164 @@
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from app.services.yahoo_finance_service import COMPANY_MAPPING
+
+# Legal suffixes stripped from company names to derive extra aliases
+_NAME_SUFFIXES = (
+    " inc.", " inc", " corporation", " corp.", " corp", " co.", " company",
+    " group", " holdings", " & co.", " platforms", " systems", " wholesale",
+)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for matching many patterns in one pass over the text"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._patterns: List[str] = []
+        self._built = False
+
+    def add(self, pattern: str) -> int:
+        """Add a pattern and return its id (call build() afterwards)"""
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        pattern_id = len(self._patterns)
+        self._patterns.append(pattern)
+        self._out[node].append(pattern_id)
+        self._built = False
+        return pattern_id
+
+    def build(self) -> None:
+        """Compute failure links breadth-first"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, pattern_id) for every match, end exclusive"""
+        if not self._built:
+            self.build()
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in out[node]:
+                end = index + 1
+                yield end - len(patterns[pattern_id]), end, pattern_id
+
+
+class TickerTagger:
+    """Tags free text with the ticker symbols it mentions"""
+
+    def __init__(self, mapping: Optional[Dict[str, Dict]] = None):
+        self._automaton = AhoCorasick()
+        # pattern id -> (symbol, rule), rule is one of "alias", "symbol", "cashtag"
+        self._targets: List[Tuple[str, str]] = []
+        self.symbols = set()
+        self.sectors: Dict[str, str] = {}
+        self._seen_patterns = set()
+        for alias, company in (mapping or COMPANY_MAPPING).items():
+            self.add_company(company["symbol"], [alias, company.get("name", "")], sector=company.get("sector"), rebuild=False)
+        self._automaton.build()
+
+    def _add_pattern(self, pattern: str, symbol: str, rule: str) -> None:
+        pattern = pattern.strip().lower()
+        if not pattern or (pattern, symbol, rule) in self._seen_patterns:
+            return
+        self._seen_patterns.add((pattern, symbol, rule))
+        self._automaton.add(pattern)
+        self._targets.append((symbol, rule))
+
+    def add_company(self, symbol: str, aliases: List[str], sector: Optional[str] = None, rebuild: bool = True) -> None:
+        """Register a ticker with its company names/aliases"""
+        symbol = symbol.upper()
+        self.symbols.add(symbol)
+        if sector:
+            self.sectors[symbol] = sector
+        for alias in aliases:
+            alias = alias.strip().lower()
+            if not alias:
+                continue
+            self._add_pattern(alias, symbol, "alias")
+            for suffix in _NAME_SUFFIXES:
+                if alias.endswith(suffix) and len(alias) > len(suffix) + 2:
+                    self._add_pattern(alias[: -len(suffix)], symbol, "alias")
+        self._add_pattern(f"${symbol}", symbol, "cashtag")
+        # Bare tickers are only trusted when long enough to not be ordinary words
+        if len(symbol) >= 3:
+            self._add_pattern(symbol, symbol, "symbol")
+        if rebuild:
+            self._automaton.build()
+
+    def tag(self, text: str) -> List[str]:
+        """
+        Find all tickers mentioned in a text in a single pass
+
+        Args:
+            text: Free text (headline, description, query)
+
+        Returns:
+            Sorted list of ticker symbols
+        """
+        if not text:
+            return []
+        lowered = text.lower()
+        length = len(lowered)
+        if length != len(text):
+            # Case folding changed offsets (rare unicode), fall back to the folded text
+            text = lowered
+        found = set()
+        for start, end, pattern_id in self._automaton.iter_matches(lowered):
+            symbol, rule = self._targets[pattern_id]
+            if symbol in found:
+                continue
+            # Whole-word matches only
+            if start > 0 and lowered[start - 1].isalnum():
+                continue
+            if end < length and lowered[end].isalnum():
+                continue
+            original = text[start:end]
+            if rule == "symbol" and original != original.upper():
+                continue
+            if rule == "alias" and " " not in original and not original[0].isupper():
+                # Single-word aliases ("target", "visa") must look like a proper noun
+                continue
+            found.add(symbol)
+        return sorted(found)
+
+    def sectors_for(self, tickers: List[str]) -> List[str]:
+        """Sectors covered by a list of tickers"""
+        return sorted({self.sectors[ticker] for ticker in tickers if ticker in self.sectors})
+
+    def tag_article(self, article: Dict) -> List[str]:
+        """Tag a News API article using its title, description and content"""
+        text = " \n ".join(
+            part for part in (article.get("title"), article.get("description"), article.get("content")) if part
+        )
+        return self.tag(text)
+
+
+ticker_tagger = TickerTagger()
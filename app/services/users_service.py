@@ -4,6 +4,7 @@ from app.schemas.user_schema import UserCreate, UserRead, UserUpdate
 from app.repositories.users_repository import UsersRepository
 from datetime import datetime
 from fastapi import HTTPException, BackgroundTasks
+from app.core.auth_user_cache import auth_user_cache
 from app.core.security import security_manager
 from app.repositories.auth_repository import AuthRepository
 from app.services.email_service import EmailService
@@ -28,7 +29,7 @@ class UserService():
         if username_exists:
             raise HTTPException(status_code=400, detail="Username already exists")
         
-        hashed_password = security_manager.get_password_hash(user_data.password)
+        hashed_password = await security_manager.get_password_hash_async(user_data.password)
         user_data.is_verified = False
         user_data.is_active = False
         user_data.is_super_Admin = False
@@ -102,7 +103,9 @@ class UserService():
         return await self.users_repository.get_user_by_id(user_id)
     
     async def update_user(self, user_id: str, user_data: UserUpdate)-> UserRead:
-        return await self.users_repository.update_user(user_id, user_data)
+        user = await self.users_repository.update_user(user_id, user_data)
+        auth_user_cache.invalidate(user_id)
+        return user
     
     async def delete_user(self, user_id: str) -> UserRead:
         # Try to get user data before deletion
@@ -132,6 +135,7 @@ class UserService():
         except Exception as e:
             # Even if delete fails, return the user data we found
             pass
+        auth_user_cache.invalidate(user_id)
         
         # Return the user data that was deleted
         return user
\ No newline at end of file
@@ -7,6 +7,75 @@ from app.core.config import settings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+# Popular company name to symbol mapping
+COMPANY_MAPPING = {
+    # Tech Giants
+    "apple": {"symbol": "AAPL", "name": "Apple Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "microsoft": {"symbol": "MSFT", "name": "Microsoft Corporation", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "google": {"symbol": "GOOGL", "name": "Alphabet Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "alphabet": {"symbol": "GOOGL", "name": "Alphabet Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "amazon": {"symbol": "AMZN", "name": "Amazon.com Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "meta": {"symbol": "META", "name": "Meta Platforms Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "facebook": {"symbol": "META", "name": "Meta Platforms Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "netflix": {"symbol": "NFLX", "name": "Netflix Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Communication Services"},
+    "tesla": {"symbol": "TSLA", "name": "Tesla Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "nvidia": {"symbol": "NVDA", "name": "NVIDIA Corporation", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "intel": {"symbol": "INTC", "name": "Intel Corporation", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "amd": {"symbol": "AMD", "name": "Advanced Micro Devices Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "oracle": {"symbol": "ORCL", "name": "Oracle Corporation", "type": "EQUITY", "exchange": "NYSE", "sector": "Technology"},
+    "salesforce": {"symbol": "CRM", "name": "Salesforce Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Technology"},
+    "adobe": {"symbol": "ADBE", "name": "Adobe Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "ibm": {"symbol": "IBM", "name": "IBM Corporation", "type": "EQUITY", "exchange": "NYSE", "sector": "Technology"},
+    "cisco": {"symbol": "CSCO", "name": "Cisco Systems Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "qualcomm": {"symbol": "QCOM", "name": "QUALCOMM Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    "broadcom": {"symbol": "AVGO", "name": "Broadcom Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Technology"},
+    
+    # Finance
+    "jpmorgan": {"symbol": "JPM", "name": "JPMorgan Chase & Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "jp morgan": {"symbol": "JPM", "name": "JPMorgan Chase & Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "bank of america": {"symbol": "BAC", "name": "Bank of America Corp.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "boa": {"symbol": "BAC", "name": "Bank of America Corp.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "wells fargo": {"symbol": "WFC", "name": "Wells Fargo & Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "goldman": {"symbol": "GS", "name": "Goldman Sachs Group Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "goldman sachs": {"symbol": "GS", "name": "Goldman Sachs Group Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "morgan stanley": {"symbol": "MS", "name": "Morgan Stanley", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "citigroup": {"symbol": "C", "name": "Citigroup Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "visa": {"symbol": "V", "name": "Visa Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "mastercard": {"symbol": "MA", "name": "Mastercard Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "paypal": {"symbol": "PYPL", "name": "PayPal Holdings Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Financials"},
+    "square": {"symbol": "SQ", "name": "Block Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "american express": {"symbol": "AXP", "name": "American Express Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    "amex": {"symbol": "AXP", "name": "American Express Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Financials"},
+    
+    # Retail & Consumer
+    "walmart": {"symbol": "WMT", "name": "Walmart Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "target": {"symbol": "TGT", "name": "Target Corporation", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "costco": {"symbol": "COST", "name": "Costco Wholesale Corp.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Consumer"},
+    "home depot": {"symbol": "HD", "name": "Home Depot Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "mcdonalds": {"symbol": "MCD", "name": "McDonald's Corporation", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "mcdonald": {"symbol": "MCD", "name": "McDonald's Corporation", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "starbucks": {"symbol": "SBUX", "name": "Starbucks Corporation", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Consumer"},
+    "nike": {"symbol": "NKE", "name": "NIKE Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "coca cola": {"symbol": "KO", "name": "Coca-Cola Company", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "pepsi": {"symbol": "PEP", "name": "PepsiCo Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Consumer"},
+    "pepsico": {"symbol": "PEP", "name": "PepsiCo Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Consumer"},
+    "procter": {"symbol": "PG", "name": "Procter & Gamble Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "p&g": {"symbol": "PG", "name": "Procter & Gamble Co.", "type": "EQUITY", "exchange": "NYSE", "sector": "Consumer"},
+    "johnson": {"symbol": "JNJ", "name": "Johnson & Johnson", "type": "EQUITY", "exchange": "NYSE", "sector": "Healthcare"},
+    "pfizer": {"symbol": "PFE", "name": "Pfizer Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Healthcare"},
+    "disney": {"symbol": "DIS", "name": "Walt Disney Company", "type": "EQUITY", "exchange": "NYSE", "sector": "Communication Services"},
+    
+    # Automotive
+    "ford": {"symbol": "F", "name": "Ford Motor Company", "type": "EQUITY", "exchange": "NYSE", "sector": "Automotive"},
+    "gm": {"symbol": "GM", "name": "General Motors Company", "type": "EQUITY", "exchange": "NYSE", "sector": "Automotive"},
+    "general motors": {"symbol": "GM", "name": "General Motors Company", "type": "EQUITY", "exchange": "NYSE", "sector": "Automotive"},
+    "toyota": {"symbol": "TM", "name": "Toyota Motor Corp.", "type": "EQUITY", "exchange": "NYSE", "sector": "Automotive"},
+    "lucid": {"symbol": "LCID", "name": "Lucid Group Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Automotive"},
+    "rivian": {"symbol": "RIVN", "name": "Rivian Automotive Inc.", "type": "EQUITY", "exchange": "NASDAQ", "sector": "Automotive"},
+    "nio": {"symbol": "NIO", "name": "NIO Inc.", "type": "EQUITY", "exchange": "NYSE", "sector": "Automotive"},
+}
+
+
 class YahooFinanceService:
     """Service to fetch stock market data from Yahoo Finance via RapidAPI"""
     
@@ -126,74 +195,7 @@ class YahooFinanceService:
     
     def search_symbol(self, query: str) -> Dict:
         """Search for stock symbols by company name or symbol"""
-        # Popular company name to symbol mapping
-        company_mapping = {
-            # Tech Giants
-            "apple": {"symbol": "AAPL", "name": "Apple Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "microsoft": {"symbol": "MSFT", "name": "Microsoft Corporation", "type": "EQUITY", "exchange": "NASDAQ"},
-            "google": {"symbol": "GOOGL", "name": "Alphabet Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "alphabet": {"symbol": "GOOGL", "name": "Alphabet Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "amazon": {"symbol": "AMZN", "name": "Amazon.com Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "meta": {"symbol": "META", "name": "Meta Platforms Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "facebook": {"symbol": "META", "name": "Meta Platforms Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "netflix": {"symbol": "NFLX", "name": "Netflix Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "tesla": {"symbol": "TSLA", "name": "Tesla Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "nvidia": {"symbol": "NVDA", "name": "NVIDIA Corporation", "type": "EQUITY", "exchange": "NASDAQ"},
-            "intel": {"symbol": "INTC", "name": "Intel Corporation", "type": "EQUITY", "exchange": "NASDAQ"},
-            "amd": {"symbol": "AMD", "name": "Advanced Micro Devices Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "oracle": {"symbol": "ORCL", "name": "Oracle Corporation", "type": "EQUITY", "exchange": "NYSE"},
-            "salesforce": {"symbol": "CRM", "name": "Salesforce Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "adobe": {"symbol": "ADBE", "name": "Adobe Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "ibm": {"symbol": "IBM", "name": "IBM Corporation", "type": "EQUITY", "exchange": "NYSE"},
-            "cisco": {"symbol": "CSCO", "name": "Cisco Systems Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "qualcomm": {"symbol": "QCOM", "name": "QUALCOMM Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "broadcom": {"symbol": "AVGO", "name": "Broadcom Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            
-            # Finance
-            "jpmorgan": {"symbol": "JPM", "name": "JPMorgan Chase & Co.", "type": "EQUITY", "exchange": "NYSE"},
-            "jp morgan": {"symbol": "JPM", "name": "JPMorgan Chase & Co.", "type": "EQUITY", "exchange": "NYSE"},
-            "bank of america": {"symbol": "BAC", "name": "Bank of America Corp.", "type": "EQUITY", "exchange": "NYSE"},
-            "boa": {"symbol": "BAC", "name": "Bank of America Corp.", "type": "EQUITY", "exchange": "NYSE"},
-            "wells fargo": {"symbol": "WFC", "name": "Wells Fargo & Co.", "type": "EQUITY", "exchange": "NYSE"},
-            "goldman": {"symbol": "GS", "name": "Goldman Sachs Group Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "goldman sachs": {"symbol": "GS", "name": "Goldman Sachs Group Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "morgan stanley": {"symbol": "MS", "name": "Morgan Stanley", "type": "EQUITY", "exchange": "NYSE"},
-            "citigroup": {"symbol": "C", "name": "Citigroup Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "visa": {"symbol": "V", "name": "Visa Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "mastercard": {"symbol": "MA", "name": "Mastercard Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "paypal": {"symbol": "PYPL", "name": "PayPal Holdings Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "square": {"symbol": "SQ", "name": "Block Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "american express": {"symbol": "AXP", "name": "American Express Co.", "type": "EQUITY", "exchange": "NYSE"},
-            "amex": {"symbol": "AXP", "name": "American Express Co.", "type": "EQUITY", "exchange": "NYSE"},
-            
-            # Retail & Consumer
-            "walmart": {"symbol": "WMT", "name": "Walmart Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "target": {"symbol": "TGT", "name": "Target Corporation", "type": "EQUITY", "exchange": "NYSE"},
-            "costco": {"symbol": "COST", "name": "Costco Wholesale Corp.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "home depot": {"symbol": "HD", "name": "Home Depot Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "mcdonalds": {"symbol": "MCD", "name": "McDonald's Corporation", "type": "EQUITY", "exchange": "NYSE"},
-            "mcdonald": {"symbol": "MCD", "name": "McDonald's Corporation", "type": "EQUITY", "exchange": "NYSE"},
-            "starbucks": {"symbol": "SBUX", "name": "Starbucks Corporation", "type": "EQUITY", "exchange": "NASDAQ"},
-            "nike": {"symbol": "NKE", "name": "NIKE Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "coca cola": {"symbol": "KO", "name": "Coca-Cola Company", "type": "EQUITY", "exchange": "NYSE"},
-            "pepsi": {"symbol": "PEP", "name": "PepsiCo Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "pepsico": {"symbol": "PEP", "name": "PepsiCo Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "procter": {"symbol": "PG", "name": "Procter & Gamble Co.", "type": "EQUITY", "exchange": "NYSE"},
-            "p&g": {"symbol": "PG", "name": "Procter & Gamble Co.", "type": "EQUITY", "exchange": "NYSE"},
-            "johnson": {"symbol": "JNJ", "name": "Johnson & Johnson", "type": "EQUITY", "exchange": "NYSE"},
-            "pfizer": {"symbol": "PFE", "name": "Pfizer Inc.", "type": "EQUITY", "exchange": "NYSE"},
-            "disney": {"symbol": "DIS", "name": "Walt Disney Company", "type": "EQUITY", "exchange": "NYSE"},
-            
-            # Automotive
-            "ford": {"symbol": "F", "name": "Ford Motor Company", "type": "EQUITY", "exchange": "NYSE"},
-            "gm": {"symbol": "GM", "name": "General Motors Company", "type": "EQUITY", "exchange": "NYSE"},
-            "general motors": {"symbol": "GM", "name": "General Motors Company", "type": "EQUITY", "exchange": "NYSE"},
-            "toyota": {"symbol": "TM", "name": "Toyota Motor Corp.", "type": "EQUITY", "exchange": "NYSE"},
-            "lucid": {"symbol": "LCID", "name": "Lucid Group Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "rivian": {"symbol": "RIVN", "name": "Rivian Automotive Inc.", "type": "EQUITY", "exchange": "NASDAQ"},
-            "nio": {"symbol": "NIO", "name": "NIO Inc.", "type": "EQUITY", "exchange": "NYSE"},
-        }
-        
+        company_mapping = COMPANY_MAPPING
         query_lower = query.lower().strip()
         results = []
         
@@ -0,0 +1,68 @@
+import json
+import re
+from typing import Any, List
+
+
+class JSONArrayItemParser:
+    """
+    Incrementally extracts the elements of one array from a JSON document that arrives in chunks
+
+    Feed it text as it streams in (e.g. tool-use input_json deltas); each complete
+    object or array element of the array under `key` is returned as soon as its
+    closing bracket arrives, without waiting for the rest of the document.
+    """
+
+    def __init__(self, key: str):
+        self._key_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Add a chunk of JSON text, returns the array elements completed by it"""
+        if self.done:
+            return []
+        self._buffer += chunk
+        if not self._started:
+            match = self._key_re.search(self._buffer)
+            if not match:
+                return []
+            self._started = True
+            self._pos = match.end()
+
+        items = []
+        buffer = self._buffer
+        for index in range(self._pos, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = index
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the array itself
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads(buffer[self._item_start:index + 1]))
+                    except ValueError:
+                        pass
+        self._pos = len(buffer)
+        return items
@@ -0,0 +1,15 @@
+import os
+import sys
+
+# The app package is imported from the repository root; settings only need placeholder values
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for name, value in {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "MONGO_DATABASE": "wise_trade_test",
+    "SECRET_KEY": "test-secret",
+    "REFRESH_SECRET_KEY": "test-refresh-secret",
+}.items():
+    os.environ.setdefault(name, value)
+
+# Manual script against a running server, not a test module
+collect_ignore = ["test_api.py"]
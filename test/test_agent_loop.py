@@ -0,0 +1,201 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from anthropic import APITimeoutError
+
+from app.core.claudeAI import TOOL_LIMIT_REACHED, ClaudeAI
+from app.core.config import settings
+from app.core.deadline import Deadline
+
+TOOLS = [{"name": "fetch_stock_news", "description": "News for a ticker", "input_schema": {"type": "object"}}]
+
+
+def _response(blocks):
+    return SimpleNamespace(
+        content=blocks,
+        model="test-model",
+        stop_reason="tool_use" if any(block.type == "tool_use" for block in blocks) else "end_turn",
+        usage=SimpleNamespace(input_tokens=10, output_tokens=5, cache_creation_input_tokens=0, cache_read_input_tokens=0),
+    )
+
+
+def text(value):
+    return [SimpleNamespace(type="text", text=value)]
+
+
+def tools(*names):
+    return [SimpleNamespace(type="tool_use", id=f"call-{i}", name=name, input={"symbol": "AAPL"}) for i, name in enumerate(names)]
+
+
+TIMEOUT = "timeout"
+
+
+class FakeStream:
+    def __init__(self, step):
+        self.step = step
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _events(self):
+        if self.step == TIMEOUT:
+            yield SimpleNamespace(type="text", text="Half an ans")
+            raise APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+        for block in self.step:
+            if block.type == "text":
+                yield SimpleNamespace(type="text", text=block.text)
+            else:
+                yield SimpleNamespace(type="content_block_stop", content_block=block)
+
+    def __aiter__(self):
+        return self._events()
+
+    async def get_final_message(self):
+        return _response(self.step)
+
+
+class FakeMessages:
+    """Plays back one scripted step per model call and records the request parameters"""
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.requests = []
+
+    def _next(self, params):
+        self.requests.append(params)
+        return self.steps.pop(0)
+
+    async def create(self, **params):
+        step = self._next(params)
+        if step == TIMEOUT:
+            raise APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+        return _response(step)
+
+    def stream(self, **params):
+        return FakeStream(self._next(params))
+
+
+def _agent(steps):
+    claude_ai = ClaudeAI()
+    messages = FakeMessages(steps)
+    claude_ai.async_client = SimpleNamespace(messages=messages)
+    return claude_ai, messages
+
+
+def _tool_executor(calls, delay=0.0):
+    async def execute(name, tool_input):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return '{"stories":[]}'
+    return execute
+
+
+def _forced(params):
+    return params.get("tool_choice") == {"type": "none"}
+
+
+def test_answer_on_the_only_allowed_turn_is_not_partial():
+    claude_ai, messages = _agent([text("Apple looks fine.")])
+    result = asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor([]), max_iterations=1))
+    assert result.text == "Apple looks fine."
+    assert not result.partial
+    assert not _forced(messages.requests[0])
+
+
+def test_natural_finish_on_the_last_allowed_turn_is_not_partial():
+    calls = []
+    claude_ai, _ = _agent([tools("fetch_stock_news"), text("Done.")])
+    result = asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor(calls), max_iterations=2))
+    assert (result.text, result.partial, result.iterations) == ("Done.", False, 2)
+    assert calls == ["fetch_stock_news"]
+
+
+def test_tools_refused_past_the_iteration_limit_make_the_result_partial():
+    calls = []
+    claude_ai, messages = _agent([tools("fetch_stock_news"), tools("fetch_stock_news"), text("Best effort.")])
+    result = asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor(calls), max_iterations=2))
+    assert (result.text, result.partial, result.iterations) == ("Best effort.", True, 3)
+    # The second request was refused, not run, and the answer turn could not ask again
+    assert calls == ["fetch_stock_news"]
+    refused = messages.requests[2]["messages"][-1]["content"]
+    assert refused[0]["content"] == TOOL_LIMIT_REACHED
+    assert _forced(messages.requests[2])
+
+
+def test_turn_timeout_forces_a_tool_free_partial_answer():
+    claude_ai, messages = _agent([TIMEOUT, text("What I have so far.")])
+    result = asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor([]), deadline=Deadline(60)))
+    assert (result.text, result.partial, result.iterations) == ("What I have so far.", True, 1)
+    assert not _forced(messages.requests[0])
+    assert _forced(messages.requests[1])
+
+
+def test_tool_timeout_makes_the_result_partial(monkeypatch):
+    monkeypatch.setattr(settings, "AGENT_TOOL_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "AGENT_FINAL_ANSWER_RESERVE_SECONDS", 0.0)
+    calls = []
+    claude_ai, _ = _agent([tools("fetch_stock_news"), text("Without the news.")])
+    result = asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor(calls, delay=1.0), deadline=Deadline(30)))
+    assert result.partial
+    assert calls == ["fetch_stock_news"]
+
+
+def test_near_deadline_answers_without_tools(monkeypatch):
+    monkeypatch.setattr(settings, "AGENT_FINAL_ANSWER_RESERVE_SECONDS", 12)
+    claude_ai, messages = _agent([text("Quick answer.")])
+    result = asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor([]), deadline=Deadline(5)))
+    assert result.text == "Quick answer."
+    assert _forced(messages.requests[0])
+    assert not result.partial
+
+
+def test_timed_out_final_turn_fails_the_run():
+    claude_ai, _ = _agent([TIMEOUT, TIMEOUT])
+    with pytest.raises(Exception, match="deadline exceeded"):
+        asyncio.run(claude_ai.run_agent_async("q", TOOLS, _tool_executor([]), deadline=Deadline(60)))
+
+
+def test_stream_resets_text_of_a_timed_out_turn():
+    claude_ai, _ = _agent([TIMEOUT, text("Final.")])
+
+    async def collect():
+        return [event async for event in claude_ai.stream_agent_async("q", TOOLS, _tool_executor([]), deadline=Deadline(60))]
+
+    events = asyncio.run(collect())
+    assert [event["event"] for event in events] == ["text", "reset", "text", "done"]
+    assert events[-1]["data"]["text"] == "Final."
+    assert events[-1]["data"]["partial"]
+
+
+def test_stream_reports_refused_tools():
+    calls = []
+    claude_ai, _ = _agent([tools("fetch_stock_news"), tools("fetch_stock_news"), text("Best effort.")])
+
+    async def collect():
+        return [event async for event in claude_ai.stream_agent_async("q", TOOLS, _tool_executor(calls), max_iterations=2)]
+
+    events = asyncio.run(collect())
+    statuses = [event["data"]["status"] for event in events if event["event"] == "tool_result"]
+    assert statuses == ["ok", "refused"]
+    assert events[-1]["data"]["partial"]
+    assert calls == ["fetch_stock_news"]
+
+
+def test_sync_loop_refuses_tools_past_the_iteration_limit():
+    calls = []
+    steps = FakeMessages([tools("fetch_stock_news"), tools("fetch_stock_news"), text("Best effort.")])
+    claude_ai = ClaudeAI()
+    claude_ai.client = SimpleNamespace(messages=SimpleNamespace(create=lambda **params: _response(steps._next(params))))
+
+    def execute(name, tool_input):
+        calls.append(name)
+        return '{"stories":[]}'
+
+    result = claude_ai.run_agent("q", TOOLS, execute, max_iterations=2)
+    assert (result.text, result.partial, result.iterations) == ("Best effort.", True, 3)
+    assert calls == ["fetch_stock_news"]
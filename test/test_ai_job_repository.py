@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+from beanie import init_beanie
+
+from app.models.ai_job import AIJob
+from app.repositories.ai_job_repository import AIJobRepository
+
+
+def run(test):
+    async def with_database():
+        client = mongomock_motor.AsyncMongoMockClient()
+        await init_beanie(database=client["wise_trade_test"], document_models=[AIJob])
+        await test(AIJobRepository())
+    asyncio.run(with_database())
+
+
+def test_enqueue_reuses_live_jobs():
+    async def check(repository):
+        job, created = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        again, created_again = await repository.enqueue("analyze_news", "aapl", {}, "user-2", reuse_seconds=60)
+        assert created and not created_again
+        assert again.id == job.id
+        assert (await AIJob.get(job.id)).requested_by == ["user-1", "user-2"]
+    run(check)
+
+
+def test_completed_jobs_are_reused_only_within_the_window():
+    async def check(repository):
+        job, _ = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        await repository.finish(job.id, "completed", ttl_seconds=3600, result={"text": "ok"})
+        reused, created = await repository.enqueue("analyze_news", "aapl", {}, "user-2", reuse_seconds=60)
+        assert not created and reused.id == job.id
+
+        # Past the window a new job is queued and the old result stays readable by ID
+        await AIJob.get_motor_collection().update_one(
+            {"_id": job.id}, {"$set": {"finished_at": datetime.utcnow() - timedelta(seconds=120)}}
+        )
+        fresh, created = await repository.enqueue("analyze_news", "aapl", {}, "user-2", reuse_seconds=60)
+        assert created and fresh.id != job.id
+        assert (await AIJob.get(job.id)).dedupe_key == f"aapl:{job.id}"
+    run(check)
+
+
+def test_failed_jobs_are_retried_on_the_next_submission():
+    async def check(repository):
+        job, _ = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        await repository.finish(job.id, "failed", ttl_seconds=3600, error="boom")
+        retry, created = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        assert created and retry.id != job.id
+        assert await AIJob.get(job.id) is None
+    run(check)
+
+
+def test_expired_leases_are_claimed_again():
+    async def check(repository):
+        job, _ = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        claimed = await repository.claim_next("worker-a", lease_seconds=60, max_attempts=3)
+        assert (claimed.id, claimed.status, claimed.attempts) == (job.id, "running", 1)
+        # Still leased to worker-a
+        assert await repository.claim_next("worker-b", lease_seconds=60, max_attempts=3) is None
+
+        await AIJob.get_motor_collection().update_one(
+            {"_id": job.id}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        reclaimed = await repository.claim_next("worker-b", lease_seconds=60, max_attempts=3)
+        assert (reclaimed.id, reclaimed.worker_id, reclaimed.attempts) == (job.id, "worker-b", 2)
+    run(check)
+
+
+def test_requeue_gives_the_attempt_back():
+    async def check(repository):
+        job, _ = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        await repository.claim_next("worker-a", lease_seconds=60, max_attempts=1)
+        await repository.requeue(job.id)
+        requeued = await AIJob.get(job.id)
+        assert (requeued.status, requeued.attempts, requeued.worker_id) == ("queued", 0, None)
+        assert (await repository.claim_next("worker-b", lease_seconds=60, max_attempts=1)).id == job.id
+    run(check)
+
+
+def test_jobs_out_of_attempts_fail_once_their_lease_expires():
+    async def check(repository):
+        job, _ = await repository.enqueue("analyze_news", "aapl", {}, "user-1", reuse_seconds=60)
+        await repository.claim_next("worker-a", lease_seconds=60, max_attempts=1)
+        assert await repository.fail_exhausted(max_attempts=1, ttl_seconds=3600) == 0
+
+        await AIJob.get_motor_collection().update_one(
+            {"_id": job.id}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        assert await repository.claim_next("worker-b", lease_seconds=60, max_attempts=1) is None
+        assert await repository.fail_exhausted(max_attempts=1, ttl_seconds=3600) == 1
+        assert (await AIJob.get(job.id)).status == "failed"
+    run(check)
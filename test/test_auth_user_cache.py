@@ -0,0 +1,72 @@
+import asyncio
+
+from app.core.auth_user_cache import AuthUserCache
+
+
+class FakeUsersRepository:
+    """Serves auth fields from a dict; a read can be held open to race it with an invalidation"""
+
+    def __init__(self, users):
+        self.users = users
+        self.reads = 0
+        self.during_read = None
+
+    async def find_auth_fields(self, user_id):
+        self.reads += 1
+        fields = dict(self.users[user_id]) if user_id in self.users else None
+        await asyncio.sleep(0.01)
+        if self.during_read:
+            self.during_read()
+        return fields
+
+
+def _repository():
+    return FakeUsersRepository({"u1": {"_id": "u1", "is_active": True, "ai_access_blocked": False, "is_super_Admin": None}})
+
+
+def test_users_are_loaded_once_and_then_served_from_memory():
+    async def check():
+        cache, repository = AuthUserCache(max_entries=10, ttl_seconds=60), _repository()
+        users = await asyncio.gather(*(cache.get("u1", repository) for _ in range(5)))
+        assert repository.reads == 1
+        assert all(user.is_active and not user.is_super_Admin for user in users)
+        await cache.get("u1", repository)
+        assert repository.reads == 1
+    asyncio.run(check())
+
+
+def test_unknown_users_are_not_cached():
+    async def check():
+        cache, repository = AuthUserCache(max_entries=10, ttl_seconds=60), _repository()
+        assert await cache.get("u2", repository) is None
+        repository.users["u2"] = {"_id": "u2", "is_active": True}
+        assert (await cache.get("u2", repository)).is_active
+    asyncio.run(check())
+
+
+def test_invalidate_drops_the_entry():
+    async def check():
+        cache, repository = AuthUserCache(max_entries=10, ttl_seconds=60), _repository()
+        await cache.get("u1", repository)
+        repository.users["u1"]["ai_access_blocked"] = True
+        cache.invalidate("u1")
+        assert (await cache.get("u1", repository)).ai_access_blocked
+    asyncio.run(check())
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    async def check():
+        cache, repository = AuthUserCache(max_entries=10, ttl_seconds=60), _repository()
+
+        def block_during_read():
+            # The admin blocks the user after the old fields were read
+            repository.users["u1"]["ai_access_blocked"] = True
+            cache.invalidate("u1")
+
+        repository.during_read = block_during_read
+        stale = await cache.get("u1", repository)
+        assert not stale.ai_access_blocked
+        repository.during_read = None
+        assert (await cache.get("u1", repository)).ai_access_blocked
+        assert repository.reads == 2
+    asyncio.run(check())
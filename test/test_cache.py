@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache, estimate_size
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("default", 2)
+    clock[0] += 5
+    assert cache.get("short") is None and "short" not in cache
+    assert cache.get("default") == 2
+    clock[0] += 5
+    assert cache.get("default", "gone") == "gone"
+    assert cache.stats()["expirations"] == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_dropped_before_live_ones(clock):
+    cache = TTLCache(max_entries=2)
+    cache.set("old", 1, ttl=1)
+    cache.set("live", 2, ttl=60)
+    clock[0] += 2
+    cache.set("new", 3)
+    assert len(cache) == 2
+    assert cache.get("live") == 2 and cache.get("new") == 3
+    assert cache.stats()["evictions"] == 0
+
+
+def test_byte_bound(clock):
+    cache = TTLCache(max_entries=100, max_bytes=10)
+    assert not cache.set("huge", "x" * 11)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    cache.set("c", "1234")
+    assert "a" not in cache and len(cache) == 2
+    assert cache.stats()["bytes"] == 9
+    # Replacing a key releases the size of the old value
+    cache.set("b", "1")
+    assert cache.stats()["bytes"] == 5
+
+
+def test_purge_delete_and_stats(clock):
+    cache = TTLCache()
+    cache.set("a", 1, ttl=1)
+    cache.set("b", 2, ttl=60)
+    clock[0] += 2
+    assert cache.purge_expired() == 1
+    assert cache.delete("b") and not cache.delete("b")
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["misses"]) == (0, 0, 1)
+
+
+def test_estimate_size():
+    assert estimate_size(b"abc") == 3
+    assert estimate_size("é") == 2
+    assert estimate_size({"a": [1, 2]}) == len('{"a": [1, 2]}')
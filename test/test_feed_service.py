@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+from beanie import init_beanie
+
+from app.core.config import settings
+from app.models.feed import FeedEntry
+from app.models.news_article import NewsArticle
+from app.models.users import User
+from app.services.feed_service import FeedService
+
+
+def run(test):
+    async def with_database():
+        client = mongomock_motor.AsyncMongoMockClient()
+        await init_beanie(database=client["wise_trade_test"], document_models=[User, FeedEntry, NewsArticle])
+        await test(FeedService())
+    asyncio.run(with_database())
+
+
+async def _user(name, tickers=(), sectors=()):
+    user = User(
+        username=name, first_name=name, last_name="Test", email=f"{name}@example.com",
+        followed_tickers=list(tickers), followed_sectors=list(sectors),
+    )
+    await user.insert()
+    return str(user.id)
+
+
+def _article(article_id, tickers=(), sectors=()):
+    return {
+        "id": article_id,
+        "title": f"Headline {article_id}",
+        "source": {"name": "Reuters"},
+        "tickers": list(tickers),
+        "sectors": list(sectors),
+        "sentiment": {"score": 0.5, "label": "positive"},
+    }
+
+
+async def _feed_titles(service, user_id):
+    return [item.title for item in (await service.get_feed(user_id, limit=50)).items]
+
+
+def test_articles_fan_out_to_ticker_and_sector_followers():
+    async def check(service):
+        apple_fan = await _user("apple", tickers=["AAPL"])
+        tech_fan = await _user("tech", sectors=["Technology"])
+        bystander = await _user("bystander", tickers=["F"])
+        written = await service.fan_out([
+            _article("a1", tickers=["AAPL"], sectors=["Technology"]),
+            _article("a2", tickers=["MSFT"], sectors=["Technology"]),
+            _article("a3"),
+        ])
+        assert written == 3
+        assert await _feed_titles(service, apple_fan) == ["Headline a1"]
+        assert await _feed_titles(service, tech_fan) == ["Headline a2", "Headline a1"]
+        assert await _feed_titles(service, bystander) == []
+        assert await NewsArticle.count() == 3
+    run(check)
+
+
+def test_reingested_articles_are_not_fanned_out_again():
+    async def check(service):
+        user_id = await _user("apple", tickers=["AAPL"])
+        assert await service.fan_out([_article("a1", tickers=["AAPL"])]) == 1
+        assert await service.fan_out([_article("a1", tickers=["AAPL"])]) == 0
+        assert await service.fan_out([_article("a2", tickers=["AAPL"])]) == 1
+        assert await _feed_titles(service, user_id) == ["Headline a2", "Headline a1"]
+    run(check)
+
+
+def test_feeds_are_trimmed_to_the_newest_items(monkeypatch):
+    async def check(service):
+        monkeypatch.setattr(settings, "FEED_MAX_ITEMS", 3)
+        user_id = await _user("apple", tickers=["AAPL"])
+        for batch in range(3):
+            await service.fan_out([_article(f"a{batch}-{i}", tickers=["AAPL"]) for i in range(2)])
+        assert await _feed_titles(service, user_id) == ["Headline a2-1", "Headline a2-0", "Headline a1-1"]
+    run(check)
+
+
+def test_cursor_pagination():
+    async def check(service):
+        user_id = await _user("apple", tickers=["AAPL"])
+        for i in range(5):
+            await service.fan_out([_article(f"a{i}", tickers=["AAPL"])])
+        first = await service.get_feed(user_id, limit=2)
+        second = await service.get_feed(user_id, cursor=first.next_cursor, limit=2)
+        last = await service.get_feed(user_id, cursor=second.next_cursor, limit=2)
+        assert [item.title for page in (first, second, last) for item in page.items] == [f"Headline a{i}" for i in range(4, -1, -1)]
+        assert last.next_cursor is None
+    run(check)
+
+
+def test_invalid_cursor_is_a_client_error():
+    async def check(service):
+        user_id = await _user("apple", tickers=["AAPL"])
+        for cursor in ("not-an-id", "123", ""):
+            with pytest.raises(HTTPException) as error:
+                await service.get_feed(user_id, cursor=cursor)
+            assert error.value.status_code == 400
+    run(check)
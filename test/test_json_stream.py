@@ -0,0 +1,58 @@
+import json
+
+from app.utils.json_stream import JSONArrayItemParser
+
+ITEMS = [
+    {"story": 1, "why_it_matters": "Rates \"higher for longer\" {not a bracket} [nor this]", "affected_companies": ["AAPL", "MSFT"]},
+    {"story": 2, "why_it_matters": "Back\\slash and unicode é—", "nested": {"deep": [[1, 2], {"x": "]"}]}},
+    {"story": 3, "why_it_matters": "", "affected_companies": []},
+]
+DOCUMENT = json.dumps({"summary": "ignored [array]", "news_items": ITEMS, "after": [9]})
+
+
+def _feed_in_chunks(document: str, size: int):
+    # Returns (items, chunk index at which each item was emitted)
+    parser = JSONArrayItemParser("news_items")
+    items, emitted_at = [], []
+    for index in range(0, len(document), size):
+        for item in parser.feed(document[index:index + size]):
+            items.append(item)
+            emitted_at.append(index // size)
+    return parser, items, emitted_at
+
+
+def test_chunk_sizes():
+    for size in (1, 3, 7, len(DOCUMENT)):
+        parser, items, _ = _feed_in_chunks(DOCUMENT, size)
+        assert items == ITEMS, (size, items)
+        assert parser.done
+
+
+def test_items_are_emitted_before_the_document_ends():
+    parser, items, emitted_at = _feed_in_chunks(DOCUMENT, 1)
+    # The first item arrives as soon as its closing brace does
+    first_end = DOCUMENT.index(json.dumps(ITEMS[0])) + len(json.dumps(ITEMS[0])) - 1
+    assert emitted_at[0] == first_end
+    assert emitted_at == sorted(emitted_at)
+
+
+def test_ignores_text_after_the_array():
+    parser = JSONArrayItemParser("news_items")
+    assert parser.feed('{"news_items": [{"a": 1}], "other": [{"b": 2}]}') == [{"a": 1}]
+    assert parser.done
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_key_split_across_chunks_and_whitespace():
+    parser = JSONArrayItemParser("news_items")
+    items = []
+    for chunk in ('{"news_', 'items"', ' :\n [ ', '{"a":', ' 1} ,', ' [2, 3] ]}'):
+        items += parser.feed(chunk)
+    assert items == [{"a": 1}, [2, 3]]
+
+
+def test_missing_key_yields_nothing():
+    parser = JSONArrayItemParser("news_items")
+    assert parser.feed(json.dumps({"items": ITEMS})) == []
+    assert not parser.done
+
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import Deadline
+from app.core.llm_governor import LLMGovernor, LLMOverloaded, set_request_context
+
+
+def _governor(max_concurrency=1, tokens_per_minute=600_000, max_wait_seconds=30):
+    return LLMGovernor(max_concurrency=max_concurrency, tokens_per_minute=tokens_per_minute, max_wait_seconds=max_wait_seconds)
+
+
+async def _grant_order(governor, callers):
+    """Queue callers behind a held slot in the given order, return the order they were granted in"""
+    granted, release = [], asyncio.Event()
+
+    async def call(priority, key):
+        set_request_context(priority, key)
+        async with governor.limit(10):
+            granted.append(key)
+            await asyncio.sleep(0)
+
+    async def hold():
+        set_request_context("background", "holder")
+        async with governor.limit(10):
+            await release.wait()
+
+    holder = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    tasks = []
+    for priority, key in callers:
+        tasks.append(asyncio.ensure_future(call(priority, key)))
+        await asyncio.sleep(0)
+    assert governor.stats()["waiting"] == len(callers)
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    return granted
+
+
+def test_callers_of_one_priority_take_turns():
+    callers = [("api", "key-a")] * 3 + [("api", "key-b")]
+    order = asyncio.run(_grant_order(_governor(max_wait_seconds=600), callers))
+    # key-b queued last but does not wait behind all of key-a's calls
+    assert order == ["key-a", "key-b", "key-a", "key-a"]
+
+
+def test_interactive_traffic_is_weighted_without_starving_background():
+    callers = [("background", "batch")] * 2 + [("interactive", "user")] * 6
+    order = asyncio.run(_grant_order(_governor(max_wait_seconds=600), callers))
+    # Four interactive calls per background call, the background job still gets its share
+    assert order == ["user"] * 3 + ["batch"] + ["user"] * 3 + ["batch"]
+
+
+def test_overloaded_governor_rejects_with_retry_after():
+    async def check():
+        governor = _governor()
+        release = asyncio.Event()
+
+        async def hold():
+            async with governor.limit(10):
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        # One call in flight with the default 5s average: a 1s deadline cannot be met
+        with pytest.raises(LLMOverloaded) as error:
+            governor.admit(Deadline(1))
+        assert error.value.status_code == 429
+        assert error.value.headers["Retry-After"] == "5"
+        governor.admit(Deadline(10))
+        release.set()
+        await holder
+        assert governor.stats()["rejected"] == 1
+    asyncio.run(check())
+
+
+def test_token_bucket_debt_delays_and_rejects_calls():
+    governor = _governor(max_concurrency=4, tokens_per_minute=6000)
+    with governor.limit_sync(100) as permit:
+        permit.used(6100)
+    # 100 tokens in debt at 100 tokens per second
+    assert governor.expected_wait() == pytest.approx(1.0, abs=0.05)
+    with pytest.raises(LLMOverloaded) as error:
+        with governor.limit_sync(50, deadline=Deadline(0.5)):
+            pass
+    assert error.value.retry_after == 1
+    # Admitted, but its own reservation would push the wait past the deadline
+    with pytest.raises(LLMOverloaded) as error:
+        with governor.limit_sync(100, deadline=Deadline(1.5)):
+            pass
+    assert error.value.retry_after == 2
+    # The rejected call's reservation was refunded
+    assert governor.expected_wait() == pytest.approx(1.0, abs=0.05)
+
+
+def test_reported_usage_corrects_the_reservation():
+    governor = _governor(max_concurrency=4, tokens_per_minute=6000)
+    with governor.limit_sync(5000) as permit:
+        permit.used(1000)
+    assert governor.stats()["tokens_available"] >= 4999
+
+
+def test_retry_after_is_rounded_up_to_whole_seconds():
+    assert LLMOverloaded(0.2).retry_after == 1
+    assert LLMOverloaded(2.1).headers == {"Retry-After": "3"}
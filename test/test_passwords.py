@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.core.executors import NamedExecutor
+from app.core.passwords import (
+    DEFAULT_BCRYPT_ROUNDS, PasswordHasher, _context, hash_password, hash_rounds, verify_and_update,
+)
+
+
+@pytest.fixture
+def executor():
+    # Threads instead of the crypto process pool, the hashing functions are the same
+    executor = NamedExecutor("crypto-test", "thread", 2)
+    yield executor
+    executor.shutdown()
+
+
+def _hasher(executor, **kwargs):
+    options = {"target_ms": 250, "min_rounds": DEFAULT_BCRYPT_ROUNDS, "max_rounds": 15, **kwargs}
+    return PasswordHasher(executor, **options)
+
+
+def test_cost_never_goes_below_the_floor(executor):
+    weak = _hasher(executor, min_rounds=4, max_rounds=6, fixed_rounds=4)
+    assert weak.rounds == DEFAULT_BCRYPT_ROUNDS
+    assert weak.min_rounds == weak.max_rounds == DEFAULT_BCRYPT_ROUNDS
+    assert _hasher(executor, fixed_rounds=13).rounds == 13
+
+
+def test_rounds_for_measured_speed(executor):
+    hasher = _hasher(executor, target_ms=250)
+    # Each extra round doubles the time of a hash
+    assert hasher.rounds_for(0.06) == DEFAULT_BCRYPT_ROUNDS + 2
+    assert hasher.rounds_for(0.4) == DEFAULT_BCRYPT_ROUNDS
+    assert hasher.rounds_for(0.0001) == 15
+
+
+def test_weaker_hashes_are_upgraded_on_login(executor):
+    async def check():
+        hasher = _hasher(executor, fixed_rounds=DEFAULT_BCRYPT_ROUNDS)
+        legacy = _context(4).hash("hunter22")
+        matches, upgraded = await hasher.verify_and_update("hunter22", legacy)
+        assert matches and hash_rounds(upgraded) == DEFAULT_BCRYPT_ROUNDS
+        assert await hasher.verify("hunter22", upgraded)
+        assert await hasher.verify_and_update("wrong", legacy) == (False, None)
+        assert hasher.stats()["rehashed"] == 1
+    asyncio.run(check())
+
+
+def test_stronger_or_equal_hashes_are_kept():
+    stronger = hash_password("hunter22", DEFAULT_BCRYPT_ROUNDS + 1)
+    assert verify_and_update("hunter22", stronger, DEFAULT_BCRYPT_ROUNDS) == (True, None)
+    current = hash_password("hunter22", DEFAULT_BCRYPT_ROUNDS)
+    assert verify_and_update("hunter22", current, DEFAULT_BCRYPT_ROUNDS) == (True, None)
+
+
+def test_hash_rounds():
+    assert hash_rounds("$2b$12$abcdefghijklmnopqrstuu") == 12
+    assert hash_rounds("not-a-hash") is None
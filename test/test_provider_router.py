@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.LLM.providers import LLMProvider, ProviderRouter
+
+
+class FakeProvider(LLMProvider):
+    """Streams its own name, or fails / stalls before the first chunk"""
+
+    def __init__(self, provider: str, model: str, tier: str, behavior: str = "ok", delay: float = 0.0):
+        self.provider = provider
+        super().__init__(model, tier)
+        self.behavior = behavior
+        self.delay = delay
+        self.calls = 0
+
+    def available(self) -> bool:
+        return self.behavior != "unavailable"
+
+    async def stream(self, prompt, system, tool, max_tokens, temperature, timeout):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.behavior == "fail":
+            raise RuntimeError(f"{self.name} is down")
+        if self.behavior == "stall":
+            await asyncio.sleep(3600)
+        yield self.name
+        yield "."
+
+
+def _names(providers):
+    return [provider.name for provider in providers]
+
+
+def test_candidates_follow_the_configured_order():
+    providers = [
+        FakeProvider("gemini", "flash", "fast"),
+        FakeProvider("claude", "haiku", "fast"),
+        FakeProvider("claude", "sonnet", "strong"),
+        FakeProvider("other", "x", "fast", behavior="unavailable"),
+    ]
+    router = ProviderRouter(providers, provider_order=["claude", "gemini"])
+    assert _names(router.candidates("rank_headlines")) == ["claude:haiku", "gemini:flash", "claude:sonnet"]
+    assert _names(router.candidates("analysis")) == ["claude:sonnet", "claude:haiku", "gemini:flash"]
+
+
+def test_slow_models_are_demoted():
+    fast, slow = FakeProvider("gemini", "flash", "fast"), FakeProvider("claude", "haiku", "fast")
+    for _ in range(slow.latency.MIN_SAMPLES):
+        slow.latency.record(60.0)
+        fast.latency.record(0.5)
+    router = ProviderRouter([slow, fast], provider_order=["claude", "gemini"])
+    assert _names(router.candidates("rank_headlines")) == ["gemini:flash", "claude:haiku"]
+
+
+def test_failover_on_error():
+    primary, backup = FakeProvider("claude", "haiku", "fast", behavior="fail"), FakeProvider("gemini", "flash", "fast")
+    router = ProviderRouter([primary, backup], hedging=False, provider_order=["claude", "gemini"])
+    assert asyncio.run(router.complete("rank_headlines", "rank")) == "gemini:flash."
+    assert router.stats()["failovers"] == 1
+    assert primary.latency.failures == 1
+
+
+def test_failover_on_stalled_attempt_without_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ATTEMPT_TIMEOUT_SECONDS", 0.2)
+    primary, backup = FakeProvider("claude", "haiku", "fast", behavior="stall"), FakeProvider("gemini", "flash", "fast")
+    router = ProviderRouter([primary, backup], hedging=False, provider_order=["claude", "gemini"])
+    assert asyncio.run(router.complete("rank_headlines", "rank")) == "gemini:flash."
+    assert router.stats()["failovers"] == 1
+
+
+def test_all_candidates_fail():
+    router = ProviderRouter(
+        [FakeProvider("claude", "haiku", "fast", behavior="fail"), FakeProvider("gemini", "flash", "fast", behavior="fail")],
+        hedging=False,
+    )
+    with pytest.raises(RuntimeError, match="is down"):
+        asyncio.run(router.complete("rank_headlines", "rank"))
+
+
+def test_deadline_is_enforced():
+    router = ProviderRouter([FakeProvider("claude", "haiku", "fast", behavior="stall")], hedging=False)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(router.complete("rank_headlines", "rank", deadline=Deadline(0.2)))
+
+
+def test_hedge_goes_to_another_provider_and_wins(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_DEFAULT_DELAY_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.05)
+    primary = FakeProvider("claude", "haiku", "fast", delay=1.0)
+    same_provider = FakeProvider("claude", "sonnet", "strong")
+    other_provider = FakeProvider("gemini", "flash", "fast")
+    router = ProviderRouter([primary, same_provider, other_provider], provider_order=["claude", "gemini"])
+    assert asyncio.run(router.complete("rank_headlines", "rank")) == "gemini:flash."
+    stats = router.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    assert same_provider.calls == 0
+
@@ -0,0 +1,65 @@
+from app.core.semantic_cache import HashingVectorizer, SemanticCache
+from app.services.ticker_tagger import TickerTagger
+
+TAGGER = TickerTagger({
+    "tesla": {"symbol": "TSLA", "name": "Tesla Inc.", "sector": "Automotive"},
+    "ford": {"symbol": "F", "name": "Ford Motor Company", "sector": "Automotive"},
+})
+
+
+def _cache(threshold=0.85, **kwargs):
+    return SemanticCache(threshold=threshold, entity_fn=TAGGER.tag, **kwargs)
+
+
+def test_rephrased_queries_reuse_the_key():
+    cache = _cache()
+    cache.add("latest Tesla news", "analysis:tesla")
+    assert cache.lookup("What's the latest news on Tesla?") == "analysis:tesla"
+    assert cache.lookup("Tesla battery recall lawsuit details") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_threshold():
+    vectorizer = HashingVectorizer()
+    similarity = float(vectorizer.embed("Tesla earnings outlook") @ vectorizer.embed("Tesla earnings guidance outlook"))
+    assert 0 < similarity < 1
+    below, above = _cache(threshold=similarity + 0.01), _cache(threshold=similarity - 0.01)
+    for cache in (below, above):
+        cache.add("Tesla earnings outlook", "key")
+    assert below.lookup("Tesla earnings guidance outlook") is None
+    assert above.lookup("Tesla earnings guidance outlook") == "key"
+
+
+def test_different_tickers_never_match():
+    cache = _cache(threshold=0.1)
+    cache.add("Tesla news today", "analysis:tesla")
+    assert cache.lookup("Ford news today") is None
+    # A query without the entity does not reuse a ticker-specific analysis either
+    assert cache.lookup("EV news today") is None
+    assert cache.lookup("Tesla news today") == "analysis:tesla"
+
+
+def test_stale_keys_are_dropped():
+    cache = _cache()
+    cache.add("Tesla news", "old")
+    assert cache.lookup("Tesla news", is_fresh=lambda key: False) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.lookup("Tesla news") is None
+
+
+def test_ring_buffer_overwrites_the_oldest_query():
+    cache = _cache(max_entries=2)
+    cache.add("Tesla deliveries", "a")
+    cache.add("Ford recall", "b")
+    cache.add("Tesla factory expansion", "c")
+    assert cache.lookup("Tesla deliveries") is None
+    assert cache.lookup("Ford recall") == "b"
+    assert cache.lookup("Tesla factory expansion") == "c"
+    assert cache.stats()["entries"] == 2
+
+
+def test_filler_only_queries_are_not_indexed():
+    cache = _cache()
+    cache.add("what is the", "key")
+    assert cache.stats()["entries"] == 0
+    assert cache.lookup("what is the") is None
@@ -0,0 +1,56 @@
+import numpy as np
+
+from app.services.sentiment_service import SentimentScorer, sentiment_scorer
+
+
+def test_polarity_and_labels():
+    scores = sentiment_scorer.score_texts([
+        "Apple beats estimates as shares surge to a record",
+        "Bank shares plunge on fraud probe and bankruptcy fears",
+        "Company schedules its annual meeting",
+    ])
+    assert scores[0] > 0.5 and scores[1] < -0.5 and scores[2] == 0
+    assert [SentimentScorer.label(score) for score in scores] == ["positive", "negative", "neutral"]
+    assert np.all(np.abs(scores) < 1)
+
+
+def test_negation_flips_and_dampens():
+    plain, negated, far = sentiment_scorer.score_texts([
+        "Earnings growth",
+        "Earnings show no growth",
+        "No change in the quarterly plan while growth",
+    ])
+    assert negated < 0 and abs(negated) < plain
+    # Outside the negation window the word keeps its polarity
+    assert far == plain
+
+
+def test_negation_does_not_cross_documents():
+    # The batch is tokenized as one string, a negation ending one text must not reach the next
+    batch = sentiment_scorer.score_texts(["Shares did not", "Gains ahead"])
+    alone = sentiment_scorer.score_texts(["Gains ahead"])
+    assert batch[1] == alone[0]
+    assert batch[0] == 0
+
+
+def test_batch_scores_match_single_scores():
+    texts = ["Stocks rally on strong jobs data", "", None, "Oil prices tumble, sell-off deepens"]
+    batch = sentiment_scorer.score_texts(texts)
+    singles = [sentiment_scorer.score_texts([text])[0] for text in texts]
+    assert np.allclose(batch, singles)
+    assert len(sentiment_scorer.score_texts([])) == 0
+
+
+def test_rank_by_impact_orders_by_strength_then_mentions():
+    articles = [
+        {"title": "Company schedules its annual meeting"},
+        {"title": "Shares crash after fraud charges", "tickers": ["XYZ"]},
+        {"title": "Chipmaker shares jump", "tickers": ["NVDA"]},
+        {"title": "Chipmaker shares jump", "tickers": ["NVDA", "AMD"]},
+    ]
+    ranked = sentiment_scorer.rank_by_impact(articles, top_k=3)
+    assert [article["title"] for article in ranked] == [
+        "Shares crash after fraud charges", "Chipmaker shares jump", "Chipmaker shares jump",
+    ]
+    assert ranked[1]["tickers"] == ["NVDA", "AMD"]
+    assert articles[0]["sentiment"] == {"score": 0.0, "label": "neutral"}
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    async def check():
+        flight, runs = SingleFlight(), []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        assert results == ["result"] * 5 and len(runs) == 1
+        assert flight.stats() == {"in_flight": 0, "calls": 5, "shared": 4}
+        # Finished calls are forgotten, the next call runs again
+        await flight.do("key", work)
+        assert len(runs) == 2
+    asyncio.run(check())
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    async def check():
+        flight, runs = SingleFlight(), []
+
+        async def failing():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results) and len(runs) == 1
+        assert not flight.in_flight("key")
+        with pytest.raises(ValueError):
+            await flight.do("key", failing)
+        assert len(runs) == 2
+    asyncio.run(check())
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_work():
+    async def check():
+        flight, release = SingleFlight(), asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == "done"
+        assert first.cancelled()
+    asyncio.run(check())
+
+
+def test_join_only_awaits_running_calls():
+    async def check():
+        flight = SingleFlight()
+        assert flight.join("key") is None
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return 42
+
+        running = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        assert flight.in_flight("key")
+        assert await flight.join("key") == 42
+        assert await running == 42
+    asyncio.run(check())
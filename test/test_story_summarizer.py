@@ -0,0 +1,63 @@
+from app.services.story_summarizer import SUMMARY_MAX_CHARS, StorySummarizer, story_summarizer
+
+
+def _article(title, description="", source="Reuters", tickers=(), score=None, published_at="2025-01-02T10:00:00Z"):
+    article = {
+        "title": title,
+        "description": description,
+        "source": {"name": source},
+        "tickers": list(tickers),
+        "publishedAt": published_at,
+        "url": f"https://news.example/{abs(hash(title))}",
+    }
+    if score is not None:
+        article["sentiment"] = {"score": score, "label": "positive" if score > 0 else "negative"}
+    return article
+
+
+ARTICLES = [
+    _article("Fed holds interest rates steady, signals cuts later this year",
+             "The Federal Reserve kept interest rates unchanged on Wednesday. Officials signalled two rate cuts later this year.",
+             source="Reuters", score=0.2, published_at="2025-01-02T10:00:00Z"),
+    _article("Apple unveils new iPhone with AI features", "Apple showed its new iPhone lineup at the Cupertino event.",
+             source="CNBC", tickers=["AAPL"], score=0.6),
+    _article("Fed keeps interest rates steady as inflation cools",
+             "The Federal Reserve kept interest rates unchanged as inflation cooled. Markets rallied after the decision.",
+             source="Bloomberg", score=0.4, published_at="2025-01-02T12:00:00Z"),
+    _article("Fed leaves interest rates steady, sees cuts ahead",
+             "Officials signalled two rate cuts later this year. [+1200 chars]",
+             source="Reuters", score=0.3, published_at="2025-01-02T11:00:00Z"),
+]
+
+
+def test_duplicate_coverage_becomes_one_story():
+    stories = story_summarizer.build_stories(ARTICLES)
+    assert [story["article_count"] for story in stories] == [3, 1]
+    fed, apple = stories
+    assert "Fed" in fed["headline"]
+    assert fed["sources"] == ["Reuters", "Bloomberg"]
+    assert fed["sentiment"] == 0.3
+    assert fed["published_at"] == "2025-01-02T12:00:00Z"
+    assert apple["tickers"] == ["AAPL"]
+
+
+def test_summary_is_extractive_and_deduplicated():
+    fed = story_summarizer.build_stories(ARTICLES)[0]
+    sentences = [sentence for sentence in fed["summary"].split(". ") if sentence]
+    assert len(sentences) == 2
+    assert fed["summary"].count("Officials signalled two rate cuts") <= 1
+    assert "[+1200 chars]" not in fed["summary"]
+    assert len(fed["summary"]) <= SUMMARY_MAX_CHARS
+
+
+def test_threshold_controls_merging():
+    assert len(StorySummarizer(similarity_threshold=1.01).build_stories(ARTICLES)) == len(ARTICLES)
+    assert len(StorySummarizer(similarity_threshold=0.0).build_stories(ARTICLES)) == 1
+
+
+def test_max_stories_and_invalid_articles():
+    assert len(story_summarizer.build_stories(ARTICLES, max_stories=1)) == 1
+    assert story_summarizer.build_stories([]) == []
+    assert story_summarizer.build_stories([None, {"title": ""}, "text"]) == []
+    only = story_summarizer.build_stories([{"title": "The and of"}])
+    assert only[0]["headline"] == "The and of" and only[0]["summary"] == ""
@@ -0,0 +1,61 @@
+from app.services.ticker_tagger import AhoCorasick, TickerTagger
+
+MAPPING = {
+    "apple": {"symbol": "AAPL", "name": "Apple Inc.", "sector": "Technology"},
+    "target": {"symbol": "TGT", "name": "Target Corporation", "sector": "Consumer"},
+    "meta": {"symbol": "META", "name": "Meta Platforms", "sector": "Technology"},
+    "ford": {"symbol": "F", "name": "Ford Motor Company", "sector": "Automotive"},
+}
+
+
+def test_automaton_overlapping_matches():
+    automaton = AhoCorasick()
+    ids = {pattern: automaton.add(pattern) for pattern in ("he", "she", "his", "hers")}
+    matches = {(start, end, pattern_id) for start, end, pattern_id in automaton.iter_matches("ushers")}
+    assert matches == {(1, 4, ids["she"]), (2, 4, ids["he"]), (2, 6, ids["hers"])}, matches
+
+
+def test_aliases_symbols_and_cashtags():
+    tagger = TickerTagger(MAPPING)
+    assert tagger.tag("Apple and Meta Platforms rally") == ["AAPL", "META"]
+    # Legal suffixes are stripped to derive aliases
+    assert tagger.tag("Shares of Target rose") == ["TGT"]
+    assert tagger.tag("Ford Motor earnings beat") == ["F"]
+    # Cashtags work for short symbols, bare symbols only from 3 letters and in capitals
+    assert tagger.tag("$F is up") == ["F"]
+    assert tagger.tag("F is up") == []
+    assert tagger.tag("TGT and AAPL") == ["AAPL", "TGT"]
+    assert tagger.tag("tgt and aapl") == []
+
+
+def test_whole_words_and_proper_nouns():
+    tagger = TickerTagger(MAPPING)
+    # Inside other words
+    assert tagger.tag("Pineapple prices and metadata") == []
+    # Single-word aliases must look like a proper noun
+    assert tagger.tag("the sales target was missed") == []
+    assert tagger.tag("Target misses its sales target") == ["TGT"]
+    assert tagger.tag("") == []
+
+
+def test_sectors_and_articles():
+    tagger = TickerTagger(MAPPING)
+    assert tagger.sectors_for(["AAPL", "META", "XYZ"]) == ["Technology"]
+    article = {"title": "Apple unveils a new phone", "description": None, "content": "Analysts compare it with $META."}
+    assert tagger.tag_article(article) == ["AAPL", "META"]
+
+
+def test_lower_case_queries_do_not_invent_companies():
+    from app.LLM.api_agent import query_tickers
+    assert query_tickers("johnson earnings") == []
+    assert query_tickers("target news") == []
+    assert query_tickers("should I hold my shares or sell") == []
+    assert query_tickers("How is Target doing vs $AAPL") == ["AAPL", "TGT"]
+
+
+def test_add_company_rebuilds():
+    tagger = TickerTagger(MAPPING)
+    tagger.add_company("NVDA", ["Nvidia Corporation"], sector="Technology")
+    assert tagger.tag("Nvidia and Apple lead gains") == ["AAPL", "NVDA"]
+    assert "NVDA" in tagger.symbols
+
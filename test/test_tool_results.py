@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from app.LLM import api_agent
+from app.LLM.tool_results import ToolResultBudget, encode_stories, estimate_tokens
+
+
+def _stories(count, summary_chars=600):
+    return [
+        {
+            "headline": f"Company {i} reports quarterly results",
+            "summary": ("Revenue grew while margins narrowed. " * 40)[:summary_chars],
+            "sources": ["Reuters", "Bloomberg", "CNBC", "WSJ"],
+            "article_count": 1 + i % 3,
+            "tickers": ["AAPL"],
+            "sentiment": 0.1 * (i % 5),
+            "published_at": "2025-01-02T10:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def test_encode_stories_fits_the_per_result_cap():
+    for max_tokens in (2000, 600, 150):
+        encoded = encode_stories({"status": "success"}, _stories(20), max_tokens)
+        assert estimate_tokens(encoded) <= max_tokens
+        assert json.loads(encoded)["status"] == "success"
+
+
+def test_encode_stories_shortens_summaries_before_dropping_stories():
+    payload = json.loads(encode_stories({}, _stories(5), 400))
+    assert len(payload["stories"]) == 5
+    assert "omitted" not in payload
+
+    payload = json.loads(encode_stories({}, _stories(40), 150))
+    assert payload["omitted"] == 40 - len(payload["stories"])
+    # The most covered stories are kept
+    assert all("articles" in story for story in payload["stories"])
+
+
+def test_budget_caps_each_result_and_the_conversation():
+    budget = ToolResultBudget(per_result_tokens=500, total_tokens=1200)
+    assert budget.allowance() == 500
+    reserved = budget.reserve()
+    budget.release(reserved, "x" * 4 * 299)
+    assert budget.remaining_tokens == 900
+    # Never more than what is left of the conversation total
+    budget.remaining_tokens = 120
+    assert budget.allowance() == 120
+    assert not budget.exhausted
+
+
+def test_budget_exhausted_threshold():
+    budget = ToolResultBudget(per_result_tokens=500, total_tokens=100)
+    assert not budget.exhausted
+    budget.release(budget.reserve(), "x")
+    assert budget.exhausted
+    assert budget.allowance() == 99
+
+
+def test_concurrent_tool_calls_share_one_budget(monkeypatch):
+    async def slow_tool_data(tool_name, tool_input):
+        await asyncio.sleep(0.01)
+        return {"meta": {"status": "success"}, "stories": _stories(30)}
+
+    monkeypatch.setattr(api_agent, "_cached_tool_data", slow_tool_data)
+    budget = ToolResultBudget(per_result_tokens=800, total_tokens=2000)
+
+    async def run_turn():
+        calls = [api_agent.execute_tool("fetch_stock_news", {"symbol": "AAPL"}, budget=budget) for _ in range(6)]
+        return await asyncio.gather(*calls)
+
+    results = [json.loads(result) for result in asyncio.run(run_turn())]
+    with_stories = [result for result in results if "stories" in result]
+    # Without reservations every call would get the full 800 tokens (4800 in total)
+    assert sum(estimate_tokens(json.dumps(result, separators=(",", ":"))) for result in with_stories) <= 2000
+    assert budget.remaining_tokens >= 0
+    # Calls that found the budget used up are told so instead of getting stories
+    assert len(with_stories) < len(results)
+    assert all("budget" in result["error"] for result in results if "stories" not in result)
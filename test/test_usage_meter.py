@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.llm_governor import set_request_context
+from app.core.usage_meter import UsageMeter, metered_tokens
+
+CALL = {"input_tokens": 100, "output_tokens": 20, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 500}
+
+
+class FakeUsageRepository:
+    """Sums flushed rows per API key; the write and the read can be held open to interleave them"""
+
+    def __init__(self):
+        self.flushed = {}
+        self.fail = False
+        self.writes = 0
+        self.hold_read = None
+        self.hold_write = None
+        self.reads = 0
+
+    async def bulk_increment(self, rows):
+        if self.fail:
+            raise RuntimeError("mongo is down")
+        if self.hold_write:
+            await self.hold_write.wait()
+        self.writes += 1
+        for row in rows:
+            self.flushed[row["api_key_id"]] = self.flushed.get(row["api_key_id"], 0) + metered_tokens(row)
+
+    async def metered_tokens_since(self, api_key_id, since):
+        self.reads += 1
+        total = self.flushed.get(api_key_id, 0)
+        if self.hold_read:
+            await self.hold_read()
+        return total
+
+
+def _meter(refresh_seconds=60):
+    meter = UsageMeter(refresh_seconds=refresh_seconds)
+    meter._repository = FakeUsageRepository()
+    return meter
+
+
+def _call(meter):
+    set_request_context("api", "key-1", user_id="user-1", api_key_id="key-1")
+    meter.record_call("claude", CALL, latency_seconds=0.5)
+
+
+def test_cache_reads_are_not_metered():
+    assert metered_tokens(CALL) == 120
+
+
+def test_failed_flush_puts_the_counters_back():
+    async def check():
+        meter = _meter()
+        _call(meter)
+        meter.repository.fail = True
+        with pytest.raises(RuntimeError):
+            await meter.flush()
+        _call(meter)
+        meter.repository.fail = False
+        assert await meter.flush() == 1
+        assert meter.repository.flushed == {"key-1": 240}
+        assert await meter.flush() == 0
+    asyncio.run(check())
+
+
+def test_month_to_date_adds_local_calls_until_the_next_refresh():
+    async def check():
+        meter = _meter(refresh_seconds=60)
+        meter.repository.flushed["key-1"] = 1000
+        assert await meter.month_to_date_tokens("key-1") == 1000
+        _call(meter)
+        # Local calls are added without a query, other processes' usage is not seen yet
+        meter.repository.flushed["key-1"] += 5000
+        assert await meter.month_to_date_tokens("key-1") == 1120
+        assert meter.repository.reads == 1
+
+        meter.refresh_seconds = 0
+        assert await meter.month_to_date_tokens("key-1") == 6120
+        assert meter.repository.reads == 2
+    asyncio.run(check())
+
+
+def test_quota_is_enforced():
+    async def check():
+        meter = _meter()
+        meter.repository.flushed["key-1"] = 999
+        await meter.enforce_quota("key-1", 1000)
+        await meter.enforce_quota("key-1", None)
+        _call(meter)
+        with pytest.raises(HTTPException) as error:
+            await meter.enforce_quota("key-1", 1000)
+        assert error.value.status_code == 429
+    asyncio.run(check())
+
+
+def test_reload_retries_when_a_flush_overlaps_the_read():
+    async def check():
+        meter = _meter()
+        _call(meter)
+
+        async def flush_during_first_read():
+            # The counters leave the buffer and land in Mongo after the total was read
+            if meter.repository.reads == 1:
+                await meter.flush()
+                _call(meter)
+
+        meter.repository.hold_read = flush_during_first_read
+        assert await meter.month_to_date_tokens("key-1") == 240
+        assert meter.repository.reads == 2
+    asyncio.run(check())
+
+
+def test_reload_does_not_trust_a_read_taken_while_a_flush_is_writing():
+    async def check():
+        meter = _meter()
+        _call(meter)
+        meter.repository.hold_write = asyncio.Event()
+        flush = asyncio.create_task(meter.flush())
+        await asyncio.sleep(0)
+
+        async def finish_the_write():
+            if meter.repository.reads == 1:
+                meter.repository.hold_write.set()
+                await flush
+
+        meter.repository.hold_read = finish_the_write
+        assert await meter.month_to_date_tokens("key-1") == 120
+        assert meter.repository.reads == 2
+    asyncio.run(check())